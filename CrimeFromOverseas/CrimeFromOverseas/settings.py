@@ -29,6 +29,12 @@ SCAM_ENDPOINT = os.getenv("SCAM_ENDPOINT")
 VOICE_BASE_URL = os.getenv("VOICE_BASE_URL")
 VOICE_ENDPOINT = os.getenv("VOICE_ENDPOINT")
 
+# 공공데이터 API 호출 설정 (connect, read timeout 초 / 재시도 횟수 / backoff 계수)
+API_TIMEOUT = (3.05, float(os.getenv("API_READ_TIMEOUT", "15")))
+API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "3"))
+API_BACKOFF = float(os.getenv("API_BACKOFF", "0.5"))
+API_CONCURRENCY = int(os.getenv("API_CONCURRENCY", "1"))  # 2 이상이면 httpx로 페이지 동시 조회
+
 def csv_path(name):
     value = os.getenv(name)
     if value:
@@ -41,6 +47,21 @@ AFRICA_CSV = csv_path("AFRICA_CSV")
 AMERICA_CSV = csv_path("AMERICA_CSV")
 OCEANIA_CSV = csv_path("OCEANIA_CSV")
 
+# 파싱된 출국 CSV 캐시 (DIR이 없으면 메모리 캐시만 사용)
+DEPARTURE_CACHE_DIR = csv_path("DEPARTURE_CACHE_DIR")
+DEPARTURE_CACHE_FORMAT = os.getenv("DEPARTURE_CACHE_FORMAT", "parquet")  # parquet / feather
+DEPARTURE_CACHE_SIZE = int(os.getenv("DEPARTURE_CACHE_SIZE", "16"))
+
+# 출국 데이터 Parquet 저장소 (manage.py build_departure_store로 생성, 없으면 CSV 직접 파싱)
+DEPARTURE_STORE_DIR = csv_path("DEPARTURE_STORE_DIR")
+
+# sync/* 백그라운드 작업 (스레드 수 / 이 시간(초)이 지나도 안 끝나면 실패 처리)
+SYNC_JOB_WORKERS = int(os.getenv("SYNC_JOB_WORKERS", "2"))
+SYNC_JOB_TIMEOUT = int(os.getenv("SYNC_JOB_TIMEOUT", "1800"))
+
+# 지역 CSV 동시 로드 프로세스 수 (1이면 순차 로드)
+DEPARTURE_LOAD_WORKERS = int(os.getenv("DEPARTURE_LOAD_WORKERS", "1"))
+
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -78,8 +99,32 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'main.middleware.RequestMetricsMiddleware',
 ]
 
+# 요청/파이프라인 구조화 로그 (JSON 한 줄, main.metrics 로거)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json_line': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'metrics_console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'json_line',
+        },
+    },
+    'loggers': {
+        'main.metrics': {
+            'handlers': ['metrics_console'],
+            # 기본은 WARNING (지표는 /metrics로 확인), 요청/단계별 JSON 로그가 필요하면 METRICS_LOG_LEVEL=INFO
+            'level': os.getenv("METRICS_LOG_LEVEL", "WARNING"),
+            'propagate': False,
+        },
+    },
+}
+
 ROOT_URLCONF = 'CrimeFromOverseas.urls'
 
 TEMPLATES = [
@@ -111,6 +156,27 @@ DATABASES = {
 }
 
 
+# Cache
+# 분석 JSON/디버그 응답 본문 캐시 (RESPONSE_CACHE_DIR가 있으면 파일 캐시 → 워커 프로세스끼리 공유)
+RESPONSE_CACHE_DIR = csv_path("RESPONSE_CACHE_DIR")
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': (
+            'django.core.cache.backends.filebased.FileBasedCache' if RESPONSE_CACHE_DIR
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': str(RESPONSE_CACHE_DIR) if RESPONSE_CACHE_DIR else 'responses',
+        'TIMEOUT': int(os.getenv("RESPONSE_CACHE_TIMEOUT", "3600")),
+    },
+}
+RESPONSE_CACHE_ALIAS = 'responses'
+RESPONSE_CACHE_MAX_AGE = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "0"))   # 0이면 매번 ETag로 재검증
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,305 @@
+"""
+KTO 지역별 출국 CSV + 공공데이터 API 응답(JSON)을 처음부터 만들어내는 합성 데이터 생성기
+
+    python benchmarks/generate_kto.py /tmp/kto                                   # 2004~2025년, 지역당 50개국
+    python benchmarks/generate_kto.py /tmp/kto --years 1950-2025 --countries 500 --noise 0.05
+    python benchmarks/generate_kto.py /tmp/kto --serve 8765                      # 생성 후 스텁 API 실행
+
+출력 (out_dir):
+  - Asia.csv / Europe.csv / Africa.csv / America.csv / Oceania.csv
+      0행 제목, 1행 국가명 한글/영문 페어, 2행 명수/전년대비, "YYYY년"·"M월" 표시,
+      월 블록 뒤에 "YYYY년,누계" 행과 각주 행 (번들 main/data/*.csv와 같은 배치)
+  - cyber_scam.json       사이버사기 API (연도 × 발생건수/검거건수)
+  - voice_phishing.json   보이스피싱 API (년 × 월, 일부 행은 문자열로 한 번 더 감싼 JSON)
+  - expected.json         노이즈를 반영한 정답 합계 (파싱/동기화 결과 검증용)
+
+노이즈 비율(--noise)만큼 명수 칸을 "-", 빈칸, 쉼표 없는 숫자, 앞 공백 숫자로 바꿈 ("-"/빈칸은 0으로 집계).
+--serve로 띄운 스텁은 odcloud와 같은 page/perPage 봉투로 응답하므로
+SCAM_BASE_URL / VOICE_BASE_URL 환경변수를 http://127.0.0.1:<port> 로,
+SCAM_ENDPOINT=/cyber, VOICE_ENDPOINT=/voice 로 두고 sync 명령을 그대로 돌리면 된다.
+"""
+import argparse
+import csv
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+# 파일명, 제목, 지역별 실제 국가 (한글, 영문) — 나머지는 "아시아국가11" 식으로 채움
+REGIONS = {
+    "asia": ("Asia.csv", "국민 해외관광객(아시아)", [
+        ("일본", "Japan"), ("중국", "China"), ("베트남", "Vietnam"), ("태국", "Thailand"),
+        ("필리핀", "Philippines"), ("캄보디아", "Cambodia"), ("인도", "India"),
+        ("이스라엘", "Israel"), ("몰디브", "Maldives"), ("미얀마", "Myanmar"),
+    ]),
+    "europe": ("Europe.csv", "국민 해외관광객(유럽)", [
+        ("영국", "United Kingdom"), ("독일", "Germany"), ("프랑스", "France"), ("이탈리아", "Italy"),
+    ]),
+    "africa": ("Africa.csv", "국민 해외관광객(아프리카)", [
+        ("이집트", "Egypt"), ("남아프리카공화국", "South Africa"), ("모로코", "Morocco"),
+    ]),
+    "america": ("America.csv", "국민 해외관광객(미주)", [
+        ("미국", "USA"), ("캐나다", "Canada"), ("멕시코", "Mexico"), ("브라질", "Brazil"),
+    ]),
+    "oceania": ("Oceania.csv", "국민 해외관광객(오세아니아)", [
+        ("호주", "Australia"), ("괌(미국령)", "Guam"), ("뉴질랜드", "New Zealand"),
+    ]),
+}
+
+# 월별 계절성 (1~12월, 평균 1)
+SEASONALITY = np.array([1.15, 0.95, 0.85, 0.9, 0.9, 0.95, 1.1, 1.25, 0.95, 1.0, 0.9, 1.1])
+
+CYBER_FIELDS = ("직거래", "쇼핑몰", "게임", "이메일 무역", "연예빙자", "사이버투자", "사이버사기_기타")
+
+
+def parse_years(text):
+    """"2004-2025" 또는 "2020" → range"""
+    start, _, end = text.partition("-")
+    return range(int(start), int(end or start) + 1)
+
+
+def region_countries(region, count):
+    """지역의 (한글, 영문) 국가 count개 (실제 국가 먼저, 모자라면 합성 이름)"""
+    _, title, real = REGIONS[region]
+    label = title[title.index("(") + 1:-1]   # "국민 해외관광객(아시아)" → "아시아"
+    names = list(real[:count])
+    for n in range(len(names) + 1, count + 1):
+        names.append((f"{label}국가{n}", f"{region.capitalize()} Country {n}"))
+    return names
+
+
+# -----------------------------
+# ✔ 셀 서식 (원본처럼 "793,478 " / "4.1%" / 빈칸)
+# -----------------------------
+def format_count(value):
+    return f"{value:,} "
+
+
+def format_ratio(value, previous):
+    if not previous:
+        return ""
+    return f"{(value / previous - 1) * 100:.1f}%"
+
+
+def noisy_count(value, kind):
+    """노이즈 종류별 명수 칸과 파서가 읽어야 할 값"""
+    if kind == 1:
+        return "-", 0
+    if kind == 2:
+        return "", 0
+    if kind == 3:
+        return str(value), value            # 쉼표 없음
+    if kind == 4:
+        return f" {value:,} ", value        # 앞 공백
+    return format_count(value), value
+
+
+def simulate_departures(rng, years, n_countries):
+    """(연도, 월, 국가) 출국자 수 배열 — 국가별 규모 × 연 성장 × 계절성 × 로그정규 잡음"""
+    base = rng.lognormal(mean=8, sigma=1.5, size=n_countries)
+    growth = rng.normal(1.05, 0.05, size=n_countries)
+    year_index = np.arange(len(years))[:, None, None]
+
+    values = (
+        base[None, None, :]
+        * growth[None, None, :] ** year_index
+        * SEASONALITY[None, :, None]
+        * rng.lognormal(0, 0.1, size=(len(years), 12, n_countries))
+    )
+    return values.round().astype("int64")
+
+
+# -----------------------------
+# ✔ 지역 CSV
+# -----------------------------
+def generate_region_csv(path, region, years, countries=50, noise=0.0, seed=0):
+    """
+    KTO 레이아웃의 지역 CSV 한 개를 생성.
+    반환: 노이즈 반영 후 월별 값 배열 (연도, 월, 국가)과 국가명(한글) 목록
+    """
+    rng = np.random.default_rng(seed)
+    years = list(years)
+    names = region_countries(region, countries)
+    true_values = simulate_departures(rng, years, len(names))
+
+    # 0: 정상, 1: "-", 2: 빈칸, 3: 쉼표 없음, 4: 앞 공백
+    kinds = np.where(rng.random(true_values.shape) < noise, rng.integers(1, 5, size=true_values.shape), 0)
+
+    _, title, _ = REGIONS[region]
+    width = 4 + 2 * len(names)
+    observed = np.zeros_like(true_values)
+
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow([title] + [""] * (width - 1))
+        writer.writerow(["", "", "법무부・KTO", ""] + [name for pair in names for name in pair])
+        writer.writerow(["", "", "명수", "전년대비"] + ["명수", "전년대비"] * len(names))
+
+        for yi, year in enumerate(years):
+            for mi in range(12):
+                row = [f"{year}년" if mi == 0 else "", f"{mi + 1}월", "", ""]
+                for ci in range(len(names)):
+                    cell, value = noisy_count(int(true_values[yi, mi, ci]), kinds[yi, mi, ci])
+                    observed[yi, mi, ci] = value
+                    previous = observed[yi - 1, mi, ci] if yi else 0
+                    row += [cell, format_ratio(value, previous) if value else ""]
+
+                total = int(observed[yi, mi].sum())
+                previous_total = int(observed[yi - 1, mi].sum()) if yi else 0
+                row[2:4] = [format_count(total), format_ratio(total, previous_total)]
+                writer.writerow(row)
+
+        # 누계 행 (파서는 월 행만 쓰므로 건너뜀)
+        yearly = observed.sum(axis=1)
+        for yi, year in enumerate(years):
+            row = [f"{year}년", "누계"]
+            for value, previous in [(yearly[yi].sum(), yearly[yi - 1].sum() if yi else 0)] + [
+                (yearly[yi, ci], yearly[yi - 1, ci] if yi else 0) for ci in range(len(names))
+            ]:
+                row += [format_count(int(value)), format_ratio(int(value), int(previous))]
+            writer.writerow(row)
+
+        writer.writerow(["", "", "", "", "", "", "* 합성 데이터 (benchmarks/generate_kto.py)"] + [""] * (width - 7))
+
+    return observed, [ko for ko, _ in names]
+
+
+# -----------------------------
+# ✔ 공공데이터 API 응답 (odcloud 봉투)
+# -----------------------------
+def cyber_scam_rows(rng, years, noise=0.0):
+    rows = []
+    for year in years:
+        for category in ("발생건수", "검거건수"):
+            row = {"연도": str(year), "구분": category}
+            for field in CYBER_FIELDS:
+                value = int(rng.integers(0, 50000))
+                row[field] = "-" if rng.random() < noise else f"{value:,}"
+            rows.append(row)
+    return rows
+
+
+def voice_phishing_rows(rng, years, noise=0.0):
+    """월별 행. 실제 API처럼 일부 행은 JSON 문자열로, 노이즈 비율만큼 건수가 빈칸."""
+    rows = []
+    for year in years:
+        for month in range(1, 13):
+            row = {"년": str(year), "월": str(month), "전화금융사기 발생건수": str(int(rng.integers(500, 5000)))}
+            if rng.random() < noise:
+                row["전화금융사기 발생건수"] = ""
+            rows.append(json.dumps(row, ensure_ascii=False) if rng.random() < 0.3 else row)
+    return rows
+
+
+def page_envelope(rows, page=1, per_page=None):
+    """odcloud 응답 형식 {page, perPage, totalCount, matchCount, currentCount, data}"""
+    per_page = per_page or max(len(rows), 1)
+    chunk = rows[(page - 1) * per_page: page * per_page]
+    return {
+        "page": page,
+        "perPage": per_page,
+        "totalCount": len(rows),
+        "matchCount": len(rows),
+        "currentCount": len(chunk),
+        "data": chunk,
+    }
+
+
+def generate(out_dir, years, countries=50, noise=0.0, seed=0):
+    """5개 지역 CSV + API JSON + expected.json 생성. 반환: expected dict"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    years = list(years)
+
+    expected = {"years": [years[0], years[-1]], "regions": {}}
+    for i, region in enumerate(REGIONS):
+        filename = REGIONS[region][0]
+        observed, names = generate_region_csv(
+            out_dir / filename, region, years, countries=countries, noise=noise, seed=seed + i,
+        )
+        expected["regions"][region] = {
+            "file": filename,
+            "countries": len(names),
+            "monthly_rows": int(observed.size),
+            "departures": int(observed.sum()),
+        }
+
+    rng = np.random.default_rng(seed + len(REGIONS))
+    cyber = cyber_scam_rows(rng, years, noise)
+    voice = voice_phishing_rows(rng, years, noise)
+    for filename, rows in (("cyber_scam.json", cyber), ("voice_phishing.json", voice)):
+        (out_dir / filename).write_text(json.dumps(page_envelope(rows), ensure_ascii=False), encoding="utf-8")
+
+    expected["cyber_scam_rows"] = len(cyber)
+    expected["voice_phishing_rows"] = sum(
+        1 for r in voice if (json.loads(r) if isinstance(r, str) else r)["전화금융사기 발생건수"]
+    )
+    (out_dir / "expected.json").write_text(json.dumps(expected, ensure_ascii=False, indent=2), encoding="utf-8")
+    return expected
+
+
+# -----------------------------
+# ✔ 스텁 API 서버 (/cyber, /voice)
+# -----------------------------
+def stub_server(out_dir, port=0):
+    """생성된 JSON을 page/perPage 파라미터대로 잘라서 응답하는 HTTP 서버 (serve_forever는 호출 측에서)"""
+    out_dir = Path(out_dir)
+    datasets = {
+        "/cyber": json.loads((out_dir / "cyber_scam.json").read_text(encoding="utf-8"))["data"],
+        "/voice": json.loads((out_dir / "voice_phishing.json").read_text(encoding="utf-8"))["data"],
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path not in datasets:
+                self.send_error(404)
+                return
+            query = parse_qs(url.query)
+            page = int(query.get("page", ["1"])[0])
+            per_page = int(query.get("perPage", ["10"])[0])
+
+            body = json.dumps(page_envelope(datasets[url.path], page, per_page), ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(body)
+
+    return ThreadingHTTPServer(("127.0.0.1", port), Handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="KTO 레이아웃 합성 데이터 생성")
+    parser.add_argument("out_dir")
+    parser.add_argument("--years", default="2004-2025", help="연도 범위 (예: 1950-2025)")
+    parser.add_argument("--countries", type=int, default=50, help="지역별 국가 수")
+    parser.add_argument("--noise", type=float, default=0.02, help="명수 칸 노이즈 비율 (0~1)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--serve", type=int, metavar="PORT", help="생성 후 스텁 API 실행")
+    args = parser.parse_args(argv)
+
+    expected = generate(args.out_dir, parse_years(args.years), args.countries, args.noise, args.seed)
+    for region, info in expected["regions"].items():
+        print(f"✔ {info['file']:<12} 국가 {info['countries']:>5}  월별 행 {info['monthly_rows']:>9,}")
+    print(f"✔ API JSON: 사이버 {expected['cyber_scam_rows']}행, 보이스피싱 {expected['voice_phishing_rows']}행 (유효)")
+
+    if args.serve is not None:
+        server = stub_server(args.out_dir, args.serve)
+        print(f"스텁 API: http://127.0.0.1:{server.server_port} (/cyber, /voice) — Ctrl+C로 종료")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+워커 콜드 스타트 import 시간 측정 + 예산 검사
+
+    python benchmarks/import_time.py            # 기본 예산 1000ms
+    IMPORT_BUDGET_MS=600 python benchmarks/import_time.py
+
+django.setup() + 전체 URL 해석(뷰 모듈 import) + main.api_client import까지의 시간을 새 프로세스에서 측정하고,
+예산을 넘거나 무거운 분석용 모듈(pandas 등)이 로드되면 종료 코드 1로 끝난다.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+# 가벼운 경로에서 로드되면 안 되는 모듈
+HEAVY_MODULES = ("pandas", "numpy", "pyarrow", "httpx", "requests")
+
+# 새 인터프리터에서 실행할 측정 코드
+PROBE = """
+import json, os, sys, time
+start = time.perf_counter()
+
+import django
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "CrimeFromOverseas.settings")
+django.setup()
+setup_done = time.perf_counter()
+
+from django.urls import get_resolver, resolve
+resolver = get_resolver()
+resolver.url_patterns           # main.urls → main.views import
+for path in ("/", "/test/keys/", "/analysis/data/"):
+    resolve(path)
+import main.api_client          # sync 작업 모듈도 import만으로는 requests 등을 불러오지 않아야 함
+urls_done = time.perf_counter()
+
+print(json.dumps({
+    "setup_ms": (setup_done - start) * 1000,
+    "urls_ms": (urls_done - setup_done) * 1000,
+    "total_ms": (urls_done - start) * 1000,
+    "heavy_loaded": [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def measure(runs=5):
+    """새 프로세스를 runs번 띄워 측정하고, 가장 빠른 결과(노이즈 최소)를 반환"""
+    results = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE % (HEAVY_MODULES,)],
+            cwd=PROJECT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return min(results, key=lambda r: r["total_ms"])
+
+
+def main():
+    budget_ms = float(os.getenv("IMPORT_BUDGET_MS", "1000"))
+    result = measure()
+
+    print(
+        f"django.setup(): {result['setup_ms']:.1f}ms / "
+        f"URL 해석: {result['urls_ms']:.1f}ms / "
+        f"합계: {result['total_ms']:.1f}ms (예산 {budget_ms:.0f}ms)"
+    )
+
+    failed = False
+    if result["heavy_loaded"]:
+        print(f"❌ 가벼운 경로에서 무거운 모듈이 로드됨: {', '.join(result['heavy_loaded'])}")
+        failed = True
+    if result["total_ms"] > budget_ms:
+        print("❌ import 시간 예산 초과")
+        failed = True
+
+    if not failed:
+        print("✔ 예산 통과")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
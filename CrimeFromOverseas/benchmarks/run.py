@@ -0,0 +1,257 @@
+"""
+수집/집계/분석 엔드포인트 벤치마크 (독립 실행)
+
+    python benchmarks/run.py                          # 1x1, 10x1, 10x10, 100x1, 1x100 규모, baseline.json과 비교
+    python benchmarks/run.py --scales 1x1,10x1 --repeat 3
+    python benchmarks/run.py --save-baseline          # 현재 결과를 baseline.json으로 저장
+
+규모 "RxC": 번들 지역 CSV를 행(연도 블록) R배, 국가 C배로 키운 합성 데이터 (benchmarks/synthetic.py)
+측정 항목:
+  - load_and_aggregate_csv      5개 지역 CSV 파싱 + 연도 집계 (메모리 캐시 비움)
+  - compute_yearly_totals       월별 long-form → 연도/범죄국 합계
+  - save_yearly_to_db (insert)  빈 TravelStat에 연도별 행 upsert
+  - save_yearly_to_db (resave)  같은 데이터 재저장 (변경 없음 판정 경로)
+  - get_voice_phishing_yearly   VoicePhishingStat 연도별 합계 (SQL)
+  - /analysis/data/             테스트 클라이언트, 스냅샷 / 조건 조회 (응답 캐시 비움)
+
+baseline.json에는 측정한 머신 정보(python / CPU / 플랫폼)를 함께 저장한다.
+현재 머신이 다르면 비교 결과는 경고로만 출력하고 (종료 코드 0), 같은 머신에서만
+중앙값이 (1 + tolerance)배를 넘고 절대 차이도 --min-delta(초)보다 크면 회귀로 보고 종료 코드 1.
+--repeat 3 미만은 잡음이 커서 비교/저장하지 않는다.
+DB는 테스트 DB(SQLite)를 새로 만들어 쓰므로 db.sqlite3는 건드리지 않는다.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+REGIONS = ("asia", "europe", "africa", "america", "oceania")
+MIN_COMPARE_REPEAT = 3
+
+
+def cpu_model():
+    """CPU 모델명 (/proc/cpuinfo가 없으면 platform.processor / machine)"""
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def machine_fingerprint():
+    """baseline을 측정한 환경 (값이 다르면 비교는 경고만)"""
+    return {
+        "python": platform.python_version(),
+        "cpu": cpu_model(),
+        "cpu_count": os.cpu_count(),
+        "platform": platform.platform(),
+    }
+
+
+def setup_django():
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.chdir(PROJECT_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "CrimeFromOverseas.settings")
+
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0)
+    return connection, old_name
+
+
+def measure(fn, repeat, setup=None):
+    """setup() → fn() 을 repeat번 실행, fn 구간만 측정. 반환: {median, min, runs}"""
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        with contextlib.redirect_stdout(io.StringIO()):   # 파서의 print 숨김
+            start = time.perf_counter()
+            fn()
+            runs.append(time.perf_counter() - start)
+    return {"median": statistics.median(runs), "min": min(runs), "runs": len(runs)}
+
+
+def parse_scales(text):
+    scales = []
+    for item in text.split(","):
+        rows, _, countries = item.strip().lower().partition("x")
+        scales.append((int(rows), int(countries or 1)))
+    return scales
+
+
+def make_region_files(tmp_dir, rows, countries):
+    """번들 CSV → 규모에 맞춘 합성 CSV. 반환: {region: 경로}"""
+    from django.conf import settings
+    from benchmarks.synthetic import scale_departure_csv
+
+    files = {}
+    for region in REGIONS:
+        src = getattr(settings, f"{region.upper()}_CSV")
+        dst = Path(tmp_dir) / f"{region}_{rows}x{countries}.csv"
+        scale_departure_csv(src, dst, rows=rows, countries=countries)
+        files[region] = dst
+    return files
+
+
+def bench_scale(rows, countries, repeat):
+    import pandas as pd
+    from django.test import Client, override_settings
+
+    from main.api_client import get_voice_phishing_yearly
+    from main.models import AnalysisSnapshot, TravelStat, VoicePhishingStat
+    from main.utils_csv_cache import departure_cache
+    from main.utils_csv_import import compute_yearly_totals, load_and_aggregate_csv, load_monthly_csv, save_yearly_to_db
+    from main.utils_response_cache import response_cache
+
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        files = make_region_files(tmp_dir, rows, countries)
+        csv_settings = {f"{region.upper()}_CSV": path for region, path in files.items()}
+
+        with override_settings(DEPARTURE_STORE_DIR=None, **csv_settings):
+            # 1) CSV 파싱 + 연도 집계
+            results["load_and_aggregate_csv"] = measure(
+                lambda: [load_and_aggregate_csv(path, region) for region, path in files.items()],
+                repeat,
+                setup=departure_cache.clear,
+            )
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                monthly = pd.concat([load_monthly_csv(p, r) for r, p in files.items()], ignore_index=True)
+                yearly = pd.concat([load_and_aggregate_csv(p, r) for r, p in files.items()], ignore_index=True)
+
+            # 2) 연도/범죄국 합계
+            results["compute_yearly_totals"] = measure(lambda: compute_yearly_totals(monthly), repeat)
+
+            # 3) TravelStat 저장 (신규 / 변경 없음)
+            results["save_yearly_to_db.insert"] = measure(
+                lambda: save_yearly_to_db(yearly), repeat,
+                setup=lambda: TravelStat.objects.all().delete(),
+            )
+            results["save_yearly_to_db.resave"] = measure(lambda: save_yearly_to_db(yearly), repeat)
+
+            # 4) 보이스피싱 연도별 합계 (월 수도 행 규모만큼)
+            VoicePhishingStat.objects.all().delete()
+            VoicePhishingStat.objects.bulk_create([
+                VoicePhishingStat(year=2025 - i // 12, month=i % 12 + 1, cases=1000 + i)
+                for i in range(240 * rows)
+            ])
+            results["get_voice_phishing_yearly"] = measure(get_voice_phishing_yearly, repeat)
+
+            # 5) /analysis/data/ (스냅샷 / 조건 조회)
+            client = Client()
+            AnalysisSnapshot.objects.all().delete()
+            AnalysisSnapshot.objects.bulk_create([
+                AnalysisSnapshot(year=y, crime_ratio=1.0, cyber_scam_cases=1, voice_phishing_cases=1)
+                for y in range(2018, 2026)
+            ])
+            results["analysis_data.snapshot"] = measure(
+                lambda: client.get("/analysis/data/"), repeat, setup=response_cache().clear,
+            )
+            results["analysis_data.filtered"] = measure(
+                lambda: client.get("/analysis/data/?start=2018&end=2024&countries=중국,미국&granularity=month"),
+                repeat,
+                setup=lambda: (response_cache().clear(), departure_cache.clear()),
+            )
+
+    return results
+
+
+def compare(results, baseline, tolerance, min_delta):
+    """회귀 목록 [(키, 기준, 현재)]"""
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if current["median"] > base["median"] * (1 + tolerance) and current["median"] - base["median"] > min_delta:
+            regressions.append((key, base["median"], current["median"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CrimeFromOverseas 벤치마크")
+    parser.add_argument("--scales", default="1x1,10x1,10x10,100x1,1x100", help="RxC 목록 (행 배수 x 국가 배수)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 baseline 파일로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="허용 증가율 (0.5 = 50%%)")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="무시할 절대 차이(초)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args(argv)
+
+    connection, old_name = setup_django()
+    results = {}
+    try:
+        for rows, countries in parse_scales(args.scales):
+            label = f"{rows}x{countries}"
+            for name, value in bench_scale(rows, countries, args.repeat).items():
+                results[f"{name}@{label}"] = value
+                print(f"{name + '@' + label:<42} median {value['median'] * 1000:9.2f}ms  min {value['min'] * 1000:9.2f}ms")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if args.repeat < MIN_COMPARE_REPEAT:
+        print(f"--repeat {args.repeat}: {MIN_COMPARE_REPEAT}회 미만은 baseline과 비교/저장하지 않습니다.")
+        return 0
+
+    baseline_path = Path(args.baseline)
+    machine = machine_fingerprint()
+    stored = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+
+    if args.save_baseline:
+        # 다른 머신에서 저장하면 기존 값은 버림 (한 파일 = 한 머신 기준)
+        baseline = stored.get("results", {}) if stored.get("machine") == machine else {}
+        baseline.update({k: {"median": round(v["median"], 6)} for k, v in results.items()})
+        baseline_path.write_text(
+            json.dumps({"machine": machine, "results": baseline}, indent=2, sort_keys=True, ensure_ascii=False) + "\n",
+            encoding="utf-8",
+        )
+        print(f"✔ baseline 저장 → {baseline_path}")
+        return 0
+
+    if not stored:
+        print("baseline 파일이 없어 비교를 건너뜁니다 (--save-baseline으로 생성).")
+        return 0
+
+    same_machine = stored.get("machine") == machine
+    if not same_machine:
+        print("⚠ baseline을 측정한 머신과 환경이 달라 결과는 참고용입니다 (--save-baseline으로 다시 생성):")
+        for name, value in machine.items():
+            if stored.get("machine", {}).get(name) != value:
+                print(f"   {name}: {stored.get('machine', {}).get(name)} → {value}")
+
+    regressions = compare(results, stored.get("results", {}), args.tolerance, args.min_delta)
+    for key, base, current in regressions:
+        mark = "❌ 회귀" if same_machine else "⚠ 느려짐"
+        print(f"{mark}: {key} {base * 1000:.2f}ms → {current * 1000:.2f}ms ({current / base:.2f}배)")
+    if not regressions:
+        print("✔ baseline 대비 회귀 없음")
+    return 1 if regressions and same_machine else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
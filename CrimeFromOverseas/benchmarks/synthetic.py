@@ -0,0 +1,69 @@
+"""
+벤치마크용 합성 데이터 (번들 CSV를 행/국가 방향으로 복제해서 키움)
+
+    scale_departure_csv("main/data/Asia.csv", "/tmp/Asia_10x10.csv", rows=10, countries=10)
+
+- rows=k: 연도 블록 전체를 k번 이어 붙임 (앞쪽 복사본은 연도를 과거로 이동 → 키 중복 없음)
+- countries=k: 국가(명수/전년대비) 열 쌍을 k번 복사, 국가명 뒤에 "#번호"를 붙임
+헤더 3행 / "YYYY년"·"M월" 표시 / 숫자 형식은 원본 그대로 유지
+"""
+import re
+
+import pandas as pd
+
+HEADER_ROWS = 3
+FIRST_COUNTRY_COL = 4   # 0~1: 연도/월, 2~3: 전체 합계(명수/전년대비)
+
+YEAR_CELL = re.compile(r"(\d+)(\s*년)")
+
+
+def read_raw(path):
+    return pd.read_csv(path, header=None, dtype=str, encoding="utf-8-sig", keep_default_na=False)
+
+
+def scale_countries(raw, factor):
+    """국가 열 쌍을 factor배로 (복사본은 "국가#2", "국가#3" ...)"""
+    if factor <= 1:
+        return raw
+
+    header_type = raw.iloc[2]
+    pairs = [
+        col for col in range(FIRST_COUNTRY_COL, raw.shape[1] - 1)
+        if header_type[col].strip() == "명수" and raw.iloc[1, col].strip()
+    ]
+
+    copies = []
+    for k in range(2, factor + 1):
+        for col in pairs:
+            block = raw[[col, col + 1]].copy()
+            block.iloc[1, 0] = f"{raw.iloc[1, col].strip()}#{k}"
+            copies.append(block)
+
+    return pd.concat([raw, *copies], axis=1, ignore_index=True)
+
+
+def scale_rows(raw, factor):
+    """데이터 행(연도 블록)을 factor배로. 복사본 k는 전체 기간만큼 과거로 이동."""
+    if factor <= 1:
+        return raw
+
+    header, body = raw.iloc[:HEADER_ROWS], raw.iloc[HEADER_ROWS:]
+    years = [int(m.group(1)) for m in body[0].map(YEAR_CELL.search) if m]
+    span = max(years) - min(years) + 1 if years else 1
+
+    blocks = []
+    for k in range(factor - 1, 0, -1):
+        shifted = body.copy()
+        shifted[0] = shifted[0].str.replace(
+            YEAR_CELL, lambda m: f"{int(m.group(1)) - k * span}{m.group(2)}", regex=True,
+        )
+        blocks.append(shifted)
+
+    return pd.concat([header, *blocks, body], ignore_index=True)
+
+
+def scale_departure_csv(src, dst, rows=1, countries=1):
+    """src CSV를 rows × countries배로 키워서 dst에 저장. 반환: (행 수, 열 수)"""
+    raw = scale_rows(scale_countries(read_raw(src), countries), rows)
+    raw.to_csv(dst, header=False, index=False, encoding="utf-8-sig")
+    return raw.shape
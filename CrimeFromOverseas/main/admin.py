@@ -1,3 +1,9 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import CountrySet
+
+
+@admin.register(CountrySet)
+class CountrySetAdmin(admin.ModelAdmin):
+    list_display = ("name", "version", "description", "created_at")
+    list_filter = ("name",)
@@ -1,40 +1,67 @@
-import requests
 import json
 from django.conf import settings
+from django.db import transaction
 
 from .models import (
     CyberScamStat,
     VoicePhishingStat,
     TravelStat,
+    CYBER_TYPE_FIELDS,
 )
+from .utils_db_sync import bulk_sync, sync_with_ledger
+from .utils_http import PublicDataClient, iter_pages_concurrent
+
+
+def api_concurrency(concurrency=None):
+    """동시 페이지 요청 수 (기본값: settings.API_CONCURRENCY)"""
+    if concurrency is None:
+        concurrency = getattr(settings, "API_CONCURRENCY", 1)
+    return max(1, int(concurrency))
+
+
+def sync_pages(model, pages, to_records, key_fields, value_fields, source=None, force=False):
+    """
+    페이지가 도착할 때마다 bulk_sync로 저장 (전체를 하나의 트랜잭션으로, 페이지를 모아 두지 않음)
+    - source가 있으면 저장하면서 내용 해시를 누적해 SyncState와 비교하고,
+      내용이 그대로면 트랜잭션을 롤백 (force=True면 항상 저장)
+    """
+    if source is not None:
+        records = (to_records(page_rows) for page_rows in pages)
+        return sync_with_ledger(source, model, records, key_fields, value_fields, force=force)
+
+    result = {"inserted": 0, "updated": 0, "unchanged": 0}
+
+    with transaction.atomic():
+        for page_rows in pages:
+            page_result = bulk_sync(model, to_records(page_rows), key_fields, value_fields)
+            for k in result:
+                result[k] += page_result[k]
+
+    return result
 
 
 # =========================
 # 1. 사이버 사기 (JSON 깨끗함)
 # =========================
-def fetch_cyber_scam(page=1, per_page=100):
-    """경찰청 사이버사기 범죄 API에서 원본 JSON 가져오기"""
+def cyber_scam_client(per_page=100):
+    return PublicDataClient(settings.SCAM_BASE_URL, settings.SCAM_ENDPOINT, per_page=per_page)
 
-    url = f"{settings.SCAM_BASE_URL}{settings.SCAM_ENDPOINT}"
-
-    params = {
-        "page": page,
-        "perPage": per_page,
-        "serviceKey": settings.API_KEY,  # 공통 키
-        "returnType": "JSON",
-    }
 
-    res = requests.get(url, params=params)
-    res.raise_for_status()
-
-    data = res.json()
-    return data.get("data", [])
+def fetch_cyber_scam(page=None, per_page=100):
+    """
+    경찰청 사이버사기 범죄 API에서 원본 JSON 가져오기
+    - page를 주면 해당 페이지만, 없으면 모든 페이지
+    """
+    client = cyber_scam_client(per_page)
 
+    if page is not None:
+        return client.page_rows(client.fetch_page(page))
+    return client.fetch_all()
 
-def sync_cyber_scam():
-    """사이버 사기 데이터를 DB에 저장"""
-    rows = fetch_cyber_scam(page=1, per_page=100)
 
+def cyber_records(rows):
+    """사이버 사기 API 행 → CyberScamStat 저장용 dict 리스트"""
+    records = []
     for row in rows:
         try:
             year = clean_int(row.get("연도"))
@@ -42,49 +69,49 @@ def sync_cyber_scam():
         except Exception:
             continue  # 연도나 구분 이상하면 스킵
 
-        CyberScamStat.objects.update_or_create(
-            year=year,
-            category=category,
-            defaults={
-                "direct_trade":  clean_int(row.get("직거래")),
-                "shopping_mall": clean_int(row.get("쇼핑몰")),
-                "game":          clean_int(row.get("게임")),
-                "email_trade":   clean_int(row.get("이메일 무역")),
-                "romance":       clean_int(row.get("연예빙자")),
-                "investment":    clean_int(row.get("사이버투자")),
-                "etc":           clean_int(row.get("사이버사기_기타")),
-            },
-        )
+        records.append({
+            "year": year,
+            "category": category,
+            "direct_trade":  clean_int(row.get("직거래")),
+            "shopping_mall": clean_int(row.get("쇼핑몰")),
+            "game":          clean_int(row.get("게임")),
+            "email_trade":   clean_int(row.get("이메일 무역")),
+            "romance":       clean_int(row.get("연예빙자")),
+            "investment":    clean_int(row.get("사이버투자")),
+            "etc":           clean_int(row.get("사이버사기_기타")),
+        })
+    return records
+
+
+def sync_cyber_scam(concurrency=None, force=False):
+    """
+    사이버 사기 데이터를 DB에 저장. 반환: bulk_sync 결과 (+ skipped)
+    - concurrency가 2 이상이면 페이지를 동시에 조회
+    - 직전 동기화와 내용이 같으면 DB 쓰기 생략 (force=True면 항상 저장)
+    """
+    pages = iter_pages_concurrent(cyber_scam_client(per_page=100), api_concurrency(concurrency))
+
+    return sync_pages(
+        CyberScamStat,
+        pages,
+        cyber_records,
+        key_fields=("year", "category"),
+        value_fields=CYBER_TYPE_FIELDS,
+        source="cyber_scam",
+        force=force,
+    )
 
 
 
 # =========================
 # 2. 보이스피싱 월별 (문자열 JSON 방어 포함)
 # =========================
-def fetch_voice_phishing(page=1, per_page=200):
-    """보이스피싱 월별 현황 API에서 데이터 가져오기"""
-
-    url = f"{settings.VOICE_BASE_URL}{settings.VOICE_ENDPOINT}"
-
-    params = {
-        "page": page,
-        "perPage": per_page,
-        "serviceKey": settings.API_KEY,
-        "returnType": "JSON",
-    }
-
-    res = requests.get(url, params=params)
-    res.raise_for_status()
-
-    # 1차 파싱: 최상위 JSON
-    try:
-        raw = res.json()
-    except ValueError:
-        raw = json.loads(res.text)
+def voice_phishing_client(per_page=200):
+    return PublicDataClient(settings.VOICE_BASE_URL, settings.VOICE_ENDPOINT, per_page=per_page)
 
-    # 경우에 따라 {"data": [...]} 이거나 그냥 [...] 일 수 있음
-    rows = raw.get("data", raw)
 
+def clean_voice_rows(rows):
+    """문자열로 한 번 더 감싸진 행까지 dict로 정리"""
     clean_rows = []
 
     for r in rows:
@@ -107,12 +134,26 @@ def fetch_voice_phishing(page=1, per_page=200):
     return clean_rows
 
 
-def sync_voice_phishing():
-    """보이스피싱 월별 데이터를 DB에 저장"""
+def fetch_voice_phishing(page=None, per_page=200):
+    """
+    보이스피싱 월별 현황 API에서 데이터 가져오기
+    - page를 주면 해당 페이지만, 없으면 모든 페이지
+    """
+    client = voice_phishing_client(per_page)
 
-    rows = fetch_voice_phishing(page=1, per_page=500)
+    # 경우에 따라 {"data": [...]} 이거나 그냥 [...] 일 수 있음
+    if page is not None:
+        rows = client.page_rows(client.fetch_page(page))
+    else:
+        rows = client.fetch_all()
 
-    for row in rows:
+    return clean_voice_rows(rows)
+
+
+def voice_records(rows):
+    """보이스피싱 API 행 → VoicePhishingStat 저장용 dict 리스트"""
+    records = []
+    for row in clean_voice_rows(rows):
         # 안전하게 get + 검증
         year_raw = row.get("년")
         month_raw = row.get("월")
@@ -130,45 +171,67 @@ def sync_voice_phishing():
             # 숫자로 안 바뀌면 그냥 버리기
             continue
 
-        VoicePhishingStat.objects.update_or_create(
-            year=year,
-            month=month,
-            defaults={"cases": cases},
-        )
-    
-    yearly = get_voice_phishing_yearly()
-    return yearly
-
-def get_voice_phishing_yearly():
-    qs = VoicePhishingStat.objects.all().values("year", "month", "cases")
-    if not qs:
-        return None
+        records.append({"year": year, "month": month, "cases": cases})
+    return records
 
-    df = pd.DataFrame(qs)
 
-    yearly = (
-        df.groupby("year")["cases"]
-        .sum()
-        .reset_index()
-        .rename(columns={"cases": "voice_year_total"})
+def sync_voice_phishing(concurrency=None, force=False):
+    """
+    보이스피싱 월별 데이터를 DB에 저장. 반환: bulk_sync 결과 (+ skipped)
+    - concurrency가 2 이상이면 페이지를 동시에 조회
+    - 직전 동기화와 내용이 같으면 DB 쓰기 생략 (force=True면 항상 저장)
+    """
+    pages = iter_pages_concurrent(voice_phishing_client(per_page=500), api_concurrency(concurrency))
+
+    return sync_pages(
+        VoicePhishingStat,
+        pages,
+        voice_records,
+        key_fields=("year", "month"),
+        value_fields=("cases",),
+        source="voice_phishing",
+        force=force,
     )
 
+def get_voice_phishing_yearly(as_frame=False):
+    """
+    보이스피싱 연도별 합계 [{"year", "voice_year_total"}] (DB에서 집계)
+    - 데이터가 없으면 None
+    - as_frame=True면 pandas DataFrame으로 반환
+    """
+    yearly = list(VoicePhishingStat.objects.yearly_totals())
+    if not yearly:
+        return None
+
+    if as_frame:
+        import pandas as pd
+        return pd.DataFrame(yearly, columns=["year", "voice_year_total"])
+
     return yearly
 
 
+def get_voice_phishing_rollup():
+    """연도별 / 분기별 / 최근 12개월 누적 합계를 한 번에 (dict of lists)"""
+    qs = VoicePhishingStat.objects
+    return {
+        "yearly": list(qs.yearly_totals()),
+        "quarterly": list(qs.quarterly_totals()),
+        "rolling_12m": list(qs.rolling_12m()),
+    }
+
+
 
 # =========================
 # 3. 출입국 통계 – CSV 파일 기반으로 변경
 # =========================
-import pandas as pd
-
-
 def load_csv(path, region_name):
     """CSV 파일을 로드하고 기본 전처리를 수행."""
     if path is None:
         print(f"[WARN] {region_name} CSV 경로가 없습니다.")
         return None
 
+    import pandas as pd
+
     try:
         df = pd.read_csv(path)
         df["region"] = region_name   # 지역(Asia/Europe 등) 태그 추가
@@ -187,6 +250,8 @@ def normalize_travel_dataframe(df):
     - 각 셀 값: 월별 출국자 수
     """
 
+    import pandas as pd
+
     records = []
 
     # 첫 번째 컬럼이 '연도' 또는 유사한 패턴이라고 가정
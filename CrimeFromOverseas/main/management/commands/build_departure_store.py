@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.utils_csv_import import departure_files, load_monthly_csv
+from main.utils_departure_store import DepartureStore, departure_store
+
+
+class Command(BaseCommand):
+    help = "지역별 출국 CSV를 한 번 파싱해서 지역/연도 파티션 Parquet 저장소로 변환"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            help="저장소 디렉터리 (기본: settings.DEPARTURE_STORE_DIR)",
+        )
+        parser.add_argument("--force", action="store_true", help="원본이 그대로여도 다시 빌드")
+
+    def handle(self, *args, **options):
+        files = departure_files()
+
+        if options["output"]:
+            store = DepartureStore(options["output"])
+        else:
+            store = departure_store()
+            if store is None:
+                raise CommandError("--output 또는 DEPARTURE_STORE_DIR 설정이 필요합니다.")
+
+        if not options["force"] and store.is_current(files):
+            self.stdout.write(f"변경 없음 → {store.root} (schema v{store.meta()['schema_version']})")
+            return
+
+        start = time.perf_counter()
+        meta = store.build(files, load_monthly_csv)
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✔ {meta['rows']}행 / {len(meta['sources'])}개 지역 → {store.root} "
+            f"(schema v{meta['schema_version']}) / {elapsed:.2f}초"
+        ))
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from main.models import CountrySet
+from main.utils_csv_import import compare_country_sets, load_departure_cube
+
+
+class Command(BaseCommand):
+    help = "DB에 저장된 국가 세트(CountrySet)들의 연도별 출국자 비율을 한 번에 비교"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--set",
+            action="append",
+            dest="names",
+            help="비교할 세트 이름 (여러 번 지정 가능, 기본: 전체 / 버전은 모두 포함)",
+        )
+        parser.add_argument("--start-year", type=int, default=2018)
+        parser.add_argument("--end-year", type=int, default=2025)
+
+    def handle(self, *args, **options):
+        rows = CountrySet.objects.all()
+        if options["names"]:
+            rows = rows.filter(name__in=options["names"])
+
+        country_sets = {row.label: row.countries for row in rows}
+        if not country_sets:
+            raise CommandError("비교할 국가 세트가 없습니다.")
+
+        cube = load_departure_cube()
+        if cube is None:
+            raise CommandError("출국 CSV 데이터가 없습니다.")
+
+        result = compare_country_sets(cube, country_sets)
+        result = result[result["year"].between(options["start_year"], options["end_year"])]
+
+        table = result.pivot(index="year", columns="set", values="ratio_percent")
+        self.stdout.write("범죄국 세트별 출국자 비율(%)")
+        self.stdout.write(table.to_string())
@@ -0,0 +1,103 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from main.utils_csv_import import departure_files, iter_departure_chunks
+from main.utils_db_sync import sync_travel_stats
+from main.utils_response_cache import bump_data_version
+from main.utils_trends import TRENDS_SOURCE, monthly_frame_from_db, rebuild_travel_trends_if_changed
+
+
+class Command(BaseCommand):
+    help = "지역별 출국 CSV를 청크 단위로 스트리밍해서 TravelStat(월별)에 upsert"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--region",
+            action="append",
+            choices=sorted(departure_files()),
+            help="처리할 지역 (여러 번 지정 가능, 기본: 전체)",
+        )
+        parser.add_argument(
+            "--csv",
+            help="지역 CSV 대신 읽을 파일 경로 (--region 하나와 함께 사용)",
+        )
+        parser.add_argument("--start-year", type=int, help="이 연도부터 저장")
+        parser.add_argument("--end-year", type=int, help="이 연도까지 저장")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="한 번에 읽을 CSV 행 수")
+        parser.add_argument("--dry-run", action="store_true", help="파싱만 하고 DB에는 저장하지 않음")
+        parser.add_argument(
+            "--trends",
+            action="store_true",
+            help="저장 후 추세 지표(TravelTrend)를 지역별로 다시 계산 (월별 내용이 바뀐 지역만)",
+        )
+
+    def handle(self, *args, **options):
+        files = departure_files()
+        regions = options["region"] or list(files)
+
+        if options["csv"]:
+            if len(regions) != 1:
+                raise CommandError("--csv는 --region 하나와 함께 지정해야 합니다.")
+            files = {regions[0]: options["csv"]}
+
+        totals = {"rows": 0, "inserted": 0, "updated": 0, "unchanged": 0}
+        start = time.perf_counter()
+
+        for region in regions:
+            path = files.get(region)
+            if not path:
+                self.stderr.write(f"⚠ {region} CSV 경로가 없습니다.")
+                continue
+
+            region_rows = 0
+            region_start = time.perf_counter()
+
+            for chunk in iter_departure_chunks(path, region, chunksize=options["chunk_size"]):
+                if options["start_year"] is not None:
+                    chunk = chunk[chunk["year"] >= options["start_year"]]
+                if options["end_year"] is not None:
+                    chunk = chunk[chunk["year"] <= options["end_year"]]
+                if chunk.empty:
+                    continue
+
+                region_rows += len(chunk)
+                if not options["dry_run"]:
+                    result = sync_travel_stats(chunk)
+                    for k in ("inserted", "updated", "unchanged"):
+                        totals[k] += result[k]
+
+            elapsed = time.perf_counter() - region_start
+            totals["rows"] += region_rows
+            self.stdout.write(
+                f"[{region}] {region_rows}행 / {elapsed:.2f}초 "
+                f"({region_rows / elapsed if elapsed else 0:,.0f} rows/sec)"
+            )
+
+        elapsed = time.perf_counter() - start
+        rate = totals["rows"] / elapsed if elapsed else 0
+
+        trend_rows = 0
+        if options["trends"] and not options["dry_run"]:
+            # 저장된 월별 행으로 추세 지표(YoY / 누적 / 계절 지수) 다시 계산
+            # 한 번에 메모리에 올리는 양을 지역 하나로 제한, 내용 해시가 같은 지역은 건너뜀
+            for region in regions:
+                trends = rebuild_travel_trends_if_changed(
+                    monthly_frame_from_db([region]), source=f"{TRENDS_SOURCE}:{region}",
+                )
+                trend_rows += trends["rows"]
+                if not trends["skipped"]:
+                    self.stdout.write(f"[{region}] 추세 지표 {trends['rows']}행 갱신")
+
+        if totals["inserted"] or totals["updated"] or trend_rows:
+            bump_data_version()   # /debug/travel/ 등 캐시된 응답 무효화
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(
+                f"✔ dry-run: {totals['rows']}행 파싱 / {elapsed:.2f}초 ({rate:,.0f} rows/sec)"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"✔ {totals['rows']}행 처리 (신규 {totals['inserted']} / 갱신 {totals['updated']} / "
+                f"변경없음 {totals['unchanged']}) / {elapsed:.2f}초 ({rate:,.0f} rows/sec)"
+            ))
@@ -0,0 +1,33 @@
+import time
+
+from django.db import connection
+
+from .utils_metrics import observe_request
+
+
+class RequestMetricsMiddleware:
+    """
+    요청별 응답 시간 / DB 쿼리 수를 기록 (/metrics + 구조화 로그)
+    - DEBUG와 관계없이 execute_wrapper로 쿼리 수를 셈
+    - 스트리밍 응답은 첫 바이트까지의 시간만 측정
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = [0]
+
+        def count_query(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with connection.execute_wrapper(count_query):
+            response = self.get_response(request)
+        seconds = time.perf_counter() - start
+
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+        observe_request(view, request.method, response.status_code, seconds, queries[0])
+        return response
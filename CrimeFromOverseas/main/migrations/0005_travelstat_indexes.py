@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_syncjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='travelstat',
+            name='month',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='travelstat',
+            index=models.Index(fields=['-year', '-month', 'region', 'country'], name='travelstat_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='travelstat',
+            index=models.Index(fields=['country', 'year'], name='travelstat_country_year_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_travelstat_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cyberscamstat',
+            name='total',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('direct_trade'), '+', models.F('shopping_mall')), '+', models.F('game')), '+', models.F('email_trade')), '+', models.F('romance')), '+', models.F('investment')), '+', models.F('etc')), output_field=models.IntegerField()),
+        ),
+    ]
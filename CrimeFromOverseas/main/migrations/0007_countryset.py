@@ -0,0 +1,42 @@
+from django.db import migrations, models
+
+# utils_csv_import.CRIME_COUNTRIES (마이그레이션 시점 값 고정)
+CRIME_COUNTRIES = [
+    "중국", "미국", "영국", "인도", "독일",
+    "캄보디아", "이스라엘", "몰디브", "미얀마", "필리핀"
+]
+
+
+def seed_crime_set(apps, schema_editor):
+    CountrySet = apps.get_model("main", "CountrySet")
+    CountrySet.objects.get_or_create(
+        name="crime",
+        version=1,
+        defaults={"countries": CRIME_COUNTRIES, "description": "주요 범죄국 (초기 목록)"},
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_cyberscamstat_total'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CountrySet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('countries', models.JSONField(default=list)),
+                ('description', models.CharField(blank=True, max_length=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['name', '-version'],
+                'unique_together': {('name', 'version')},
+            },
+        ),
+        migrations.RunPython(seed_crime_set, migrations.RunPython.noop),
+    ]
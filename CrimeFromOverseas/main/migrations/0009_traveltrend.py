@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_dataversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TravelTrend',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('region', models.CharField(max_length=50)),
+                ('country', models.CharField(max_length=100)),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField(default=0)),
+                ('departures', models.IntegerField(help_text='출국자 수')),
+                ('yoy_ratio', models.FloatField(blank=True, help_text='전년 대비 증감률(%)', null=True)),
+                ('rolling_3m', models.BigIntegerField(blank=True, help_text='해당 월 포함 직전 3개월 합계', null=True)),
+                ('rolling_12m', models.BigIntegerField(blank=True, help_text='해당 월 포함 직전 12개월 합계', null=True)),
+                ('seasonal_index', models.FloatField(blank=True, help_text='같은 달 평균 / 월 평균 (1.0 = 평균)', null=True)),
+            ],
+            options={
+                'ordering': ['region', 'country', 'year', 'month'],
+                'indexes': [models.Index(fields=['country', 'year'], name='traveltrend_country_year_idx')],
+                'unique_together': {('region', 'country', 'year', 'month')},
+            },
+        ),
+    ]
@@ -1,24 +1,32 @@
 from django.db import models
+from django.db.models import ExpressionWrapper, F, OuterRef, Subquery, Sum, ValueRange, Window
 
 class TravelStat(models.Model):
     """
     해외 출국 통계 (월별 OR 연도별)
-    - month가 NULL이면 연도별 합계 데이터
+    - month가 0이면 연도별 합계 데이터
     - month가 숫자(1~12)면 월별 데이터
     """
     region = models.CharField(max_length=50)
     country = models.CharField(max_length=100)
 
     year = models.IntegerField()
-    month = models.IntegerField(null=True, blank=True)   # ⭐ 연도별 합계는 None
+    month = models.IntegerField(default=0)   # ⭐ 연도별 합계는 0 (NULL은 유니크 키에서 중복 허용되므로 사용 안 함)
 
     departures = models.IntegerField(help_text="출국자 수")
-    ratio = models.FloatField(blank=True, null=True)
+    ratio = models.FloatField(blank=True, null=True, help_text="전년 대비 증감률(%)")
 
     class Meta:
-        # 이제 month를 unique에서 제거!
-        unique_together = ("region", "country", "year")
+        # 월별/연도별 행이 함께 들어가므로 month까지 포함해야 유일
+        unique_together = ("region", "country", "year", "month")
         ordering = ["year", "month", "region", "country"]
+        indexes = [
+            # 최신순 목록 (debug/travel: -year, -month, region, country) + 연도/월 필터
+            models.Index(fields=["-year", "-month", "region", "country"], name="travelstat_recent_idx"),
+            # 국가별 연도 조회 (분석: country + year 필터)
+            models.Index(fields=["country", "year"], name="travelstat_country_year_idx"),
+        ]
+        # 지역별 집계(GROUP BY region)는 유니크 키 (region, country, year, month) 인덱스가 담당
 
     def __str__(self):
         if self.month:
@@ -26,12 +34,118 @@ class TravelStat(models.Model):
         return f"{self.year} 연도합계 {self.region}/{self.country}: {self.departures}명"
 
 
+# TravelTrend 조회/계산 결과 컬럼 (utils_trends.compute_trends 출력, /analysis/trends/ 응답)
+TREND_FIELDS = (
+    "region", "country", "year", "month", "departures",
+    "yoy_ratio", "rolling_3m", "rolling_12m", "seasonal_index",
+)
+
+
+class TravelTrendQuerySet(models.QuerySet):
+    """사전 계산된 추세 지표 조회 (뷰에서는 계산 없이 필터만)"""
+
+    def monthly(self):
+        return self.filter(month__gte=1)
+
+    def yearly(self):
+        return self.filter(month=0)
+
+    def series(self, countries=None, regions=None, start=None, end=None):
+        """
+        국가/지역/연도 구간으로 거른 시리즈 (연도, 월 순)
+        countries가 없으면 지역 합계 시리즈(country="전체")
+        """
+        qs = self.filter(country__in=countries or [TravelTrend.REGION_TOTAL])
+        if regions:
+            qs = qs.filter(region__in=regions)
+        if start is not None:
+            qs = qs.filter(year__gte=start)
+        if end is not None:
+            qs = qs.filter(year__lte=end)
+        return qs.order_by("region", "country", "year", "month")
+
+
+class TravelTrend(models.Model):
+    """
+    TravelStat 옆에 두는 추세 지표 (수집 후 지역/국가 시리즈별로 한 번에 계산해서 저장)
+    - month 1~12: 월별 행 / month 0: 연도 합계 행
+    - country가 "전체"면 해당 지역 전체 합계 시리즈
+    """
+    REGION_TOTAL = "전체"
+
+    region = models.CharField(max_length=50)
+    country = models.CharField(max_length=100)
+    year = models.IntegerField()
+    month = models.IntegerField(default=0)
+
+    departures = models.IntegerField(help_text="출국자 수")
+    # 월별: 전년 같은 달 대비 / 연도: 올해 있는 달들만 전년 같은 달들과 비교 (누계 기준)
+    yoy_ratio = models.FloatField(blank=True, null=True, help_text="전년 대비 증감률(%)")
+    rolling_3m = models.BigIntegerField(blank=True, null=True, help_text="해당 월 포함 직전 3개월 합계")
+    rolling_12m = models.BigIntegerField(blank=True, null=True, help_text="해당 월 포함 직전 12개월 합계")
+    seasonal_index = models.FloatField(blank=True, null=True, help_text="같은 달 평균 / 월 평균 (1.0 = 평균)")
+
+    objects = TravelTrendQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ("region", "country", "year", "month")
+        ordering = ["region", "country", "year", "month"]
+        indexes = [
+            models.Index(fields=["country", "year"], name="traveltrend_country_year_idx"),
+        ]
+
+    def __str__(self):
+        period = f"{self.year}-{self.month:02d}" if self.month else f"{self.year} 연도합계"
+        return f"{period} {self.region}/{self.country}: 전년대비 {self.yoy_ratio}%"
+
+
+class VoicePhishingQuerySet(models.QuerySet):
+    """연도별/분기별/최근 12개월 합계를 SQL로 집계 (pandas 없이)"""
+
+    def yearly_totals(self):
+        """[{"year", "voice_year_total"}]"""
+        return (
+            self.values("year")
+            .annotate(voice_year_total=Sum("cases"))
+            .order_by("year")
+        )
+
+    def quarterly_totals(self):
+        """[{"year", "quarter", "cases"}] (1~3월 = 1분기)"""
+        return (
+            self.annotate(quarter=ExpressionWrapper(
+                (F("month") - 1) / 3 + 1, output_field=models.IntegerField()
+            ))
+            .values("year", "quarter")
+            .annotate(cases=Sum("cases"))
+            .order_by("year", "quarter")
+        )
+
+    def rolling_12m(self):
+        """
+        [{"year", "month", "cases", "rolling_12m"}]
+        해당 월 포함 직전 12개월 합계 (윈도우 함수, 누락된 달은 달력 기준으로 건너뜀)
+        """
+        month_index = F("year") * 12 + F("month")
+        return (
+            self.annotate(rolling_12m=Window(
+                expression=Sum("cases"),
+                order_by=month_index.asc(),
+                frame=ValueRange(start=-11, end=0),
+            ))
+            .values("year", "month", "cases", "rolling_12m")
+            .order_by("year", "month")
+        )
+
+
 class VoicePhishingStat(models.Model):
     """월별 보이스피싱 발생 건수"""
     year = models.IntegerField()
     month = models.IntegerField()
     cases = models.IntegerField()  # 발생 건수
 
+    objects = VoicePhishingQuerySet.as_manager()
+
     class Meta:
         unique_together = ("year", "month")
 
@@ -39,6 +153,54 @@ class VoicePhishingStat(models.Model):
         return f"{self.year}-{self.month:02d}: {self.cases}건"
 
 
+# 사이버 사기 유형별 필드 (직거래 ~ 사이버사기_기타)
+CYBER_TYPE_FIELDS = (
+    "direct_trade",
+    "shopping_mall",
+    "game",
+    "email_trade",
+    "romance",
+    "investment",
+    "etc",
+)
+
+# 분석에 쓰는 구분 값 (발생건수 / 검거건수 중 발생건수)
+CYBER_OCCURRENCE = "발생건수"
+
+
+class CyberScamQuerySet(models.QuerySet):
+    """연도별/구분별 합계를 DB에서 바로 집계 (모델 인스턴스를 만들지 않음)"""
+
+    def occurrences(self):
+        return self.filter(category=CYBER_OCCURRENCE)
+
+    def yearly_totals(self, category=None):
+        """[{"year", "total_cases"}] (category 지정 시 해당 구분만)"""
+        qs = self.filter(category=category) if category else self
+        return qs.values("year").annotate(total_cases=Sum("total")).order_by("year")
+
+    def category_totals(self):
+        """[{"year", "category", "total_cases"}]"""
+        return (
+            self.values("year", "category")
+            .annotate(total_cases=Sum("total"))
+            .order_by("year", "category")
+        )
+
+    def type_breakdown(self, category=None):
+        """[{"year", "direct_trade_total", ..., "etc_total"}] 유형별 연도 합계 (필드명과 겹치지 않도록 _total)"""
+        qs = self.filter(category=category) if category else self
+        return (
+            qs.values("year")
+            .annotate(**{f"{name}_total": Sum(name) for name in CYBER_TYPE_FIELDS})
+            .order_by("year")
+        )
+
+    def yearly_totals_dict(self, category=None):
+        """{year: total_cases}"""
+        return dict(self.yearly_totals(category).values_list("year", "total_cases"))
+
+
 class CyberScamStat(models.Model):
     """
     연도별 사이버 사기 범죄 (유형별 분리 저장)
@@ -64,20 +226,168 @@ class CyberScamStat(models.Model):
     investment = models.IntegerField()          # 사이버투자
     etc = models.IntegerField()                 # 사이버사기_기타
 
+    # 유형별 합계 (DB가 계산해서 저장하는 generated column)
+    total = models.GeneratedField(
+        expression=(
+            F("direct_trade") + F("shopping_mall") + F("game") + F("email_trade") +
+            F("romance") + F("investment") + F("etc")
+        ),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
+
+    objects = CyberScamQuerySet.as_manager()
+
     class Meta:
         unique_together = ("year", "category")
 
     @property
     def total_cases(self):
-        return (
-            self.direct_trade +
-            self.shopping_mall +
-            self.game +
-            self.email_trade +
-            self.romance +
-            self.investment +
-            self.etc
-        )
+        """저장 전 인스턴스에서도 쓸 수 있도록 필드 값으로 직접 계산"""
+        return sum(getattr(self, name) for name in CYBER_TYPE_FIELDS)
 
     def __str__(self):
         return f"{self.year} {self.category}: 총 {self.total_cases}건"
+
+
+class AnalysisSnapshot(models.Model):
+    """
+    /analysis/data/ 응답용 연도별 사전 계산 결과
+    - sync 작업으로 원본 데이터가 바뀌었을 때만 다시 생성
+    """
+    year = models.IntegerField(unique=True)
+
+    crime_ratio = models.FloatField(blank=True, null=True)   # 범죄국 출국자 비율(%)
+    cyber_scam_cases = models.IntegerField(default=0)        # 사이버사기 연도별 합계
+    voice_phishing_cases = models.IntegerField(default=0)    # 보이스피싱 연도별 합계
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["year"]
+
+    def __str__(self):
+        return f"{self.year} 분석 스냅샷: 비율 {self.crime_ratio}%"
+
+
+class DataVersion(models.Model):
+    """
+    분석 데이터 버전 카운터 (HTTP 캐시 ETag / 응답 캐시 키에 사용)
+    - sync 작업으로 데이터가 바뀌면 version을 1 올림
+    """
+    name = models.CharField(max_length=50, unique=True)   # 기본 "analysis"
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+
+class CountrySetQuerySet(models.QuerySet):
+    """이름별 최신 버전 조회"""
+
+    def current(self):
+        """이름마다 가장 높은 version 행만"""
+        newest = (
+            CountrySet.objects
+            .filter(name=OuterRef("name"))
+            .order_by("-version")
+            .values("version")[:1]
+        )
+        return self.filter(version=Subquery(newest))
+
+    def resolve(self, name, default=None):
+        """name의 최신 버전 국가 목록 (없으면 default)"""
+        row = self.filter(name=name).order_by("-version").first()
+        return list(row.countries) if row else list(default or [])
+
+
+class CountrySet(models.Model):
+    """
+    분석에 쓰는 국가 묶음 (기본: 주요 범죄국 "crime")
+    - 같은 name으로 version을 올려 추가하면 최신 버전이 분석에 사용됨
+    - 이전 버전은 그대로 남겨서 다른 목록과 비교할 때 사용
+    """
+    DEFAULT_NAME = "crime"
+
+    name = models.CharField(max_length=50)
+    version = models.PositiveIntegerField(default=1)
+    countries = models.JSONField(default=list)   # ["중국", "미국", ...]
+    description = models.CharField(max_length=200, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = CountrySetQuerySet.as_manager()
+
+    class Meta:
+        unique_together = ("name", "version")
+        ordering = ["name", "-version"]
+
+    @property
+    def label(self):
+        return f"{self.name}@v{self.version}"
+
+    def __str__(self):
+        return f"{self.label} ({len(self.countries)}개국)"
+
+
+class SyncState(models.Model):
+    """
+    외부 API 동기화 기록 (소스별)
+    - 마지막 조회 시각 / 행 수 / 내용 해시
+    - 해시가 같으면 다음 동기화 때 DB 쓰기를 건너뜀
+    """
+    source = models.CharField(max_length=50, unique=True)   # cyber_scam / voice_phishing
+
+    last_fetched_at = models.DateTimeField(blank=True, null=True)
+    last_changed_at = models.DateTimeField(blank=True, null=True)
+    row_count = models.IntegerField(default=0)
+    content_hash = models.CharField(max_length=64, blank=True)
+
+    def __str__(self):
+        return f"{self.source}: {self.row_count}행 ({self.last_fetched_at})"
+
+
+class SyncJob(models.Model):
+    """
+    sync/* 요청을 백그라운드에서 처리하는 작업 기록
+    - 같은 source의 대기/실행 중 작업은 하나만 존재 (중복 요청은 기존 작업 반환)
+    """
+    STATUS_QUEUED = "queued"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+    ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, "대기"),
+        (STATUS_RUNNING, "실행 중"),
+        (STATUS_DONE, "완료"),
+        (STATUS_FAILED, "실패"),
+    ]
+
+    source = models.CharField(max_length=50)   # travel / cyber / voice / voice_yearly
+    params = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    progress = models.FloatField(default=0)          # 0 ~ 1
+    message = models.CharField(max_length=200, blank=True)
+
+    result = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True)
+    timings = models.JSONField(default=dict, blank=True)   # 단계별 소요 시간(초)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["source"],
+                condition=models.Q(status__in=["queued", "running"]),
+                name="unique_active_sync_job_per_source",
+            ),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.source} ({self.status})"
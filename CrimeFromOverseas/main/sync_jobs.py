@@ -0,0 +1,247 @@
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.utils import timezone
+
+from .models import SyncJob
+from .utils_analysis import rebuild_analysis_snapshot_if_changed
+from .utils_metrics import log_event, span
+from .utils_response_cache import bump_data_version
+
+# 작업 함수에서 쓰는 pandas / API 클라이언트는 작업이 실행될 때 import
+# (뷰에서 submit_sync_job만 쓸 때는 불러오지 않음)
+
+
+# -----------------------------
+# ✔ 작업 함수 (report(progress, step)로 진행 상황 보고)
+# -----------------------------
+def run_travel_sync(report, **params):
+    """5개 지역 CSV → TravelStat 저장 → 추세 지표(TravelTrend) 갱신 (/sync/travel/)"""
+    import pandas as pd
+    from .utils_csv_import import (
+        compute_yearly_totals, crime_countries, load_departure_regions, load_departures, save_yearly_to_db,
+    )
+    from .utils_trends import rebuild_travel_trends_if_changed
+
+    loaded = load_departure_regions()
+    report(0.5, "csv_load")
+
+    if not loaded["frames"]:
+        return {
+            "status": "no_csv_data",
+            "region_errors": loaded["errors"],
+        }
+
+    with span("aggregate", source="csv"):
+        df = pd.concat(loaded["frames"].values(), ignore_index=True)
+        totals = compute_yearly_totals(df, crime_countries())
+    report(0.6, "aggregate")
+
+    result = save_yearly_to_db(df)
+    report(0.8, "db_write")
+
+    # 월별 원본 내용이 바뀌었을 때만 추세 지표 재계산 (연도 합계가 같아도 달별 값이 바뀌면 감지)
+    # 연도 행이 새로 들어왔으면 ratio를 채우도록 항상 재계산
+    trends = rebuild_travel_trends_if_changed(
+        load_departures(regions=list(loaded["frames"])),
+        force=bool(result["inserted"] or result["updated"]),
+    )
+    report(0.9, "trends")
+
+    if not rebuild_analysis_snapshot_if_changed(result) and not trends["skipped"]:
+        bump_data_version()   # 추세 표만 새로 계산한 경우에도 캐시된 응답 무효화
+    report(1.0, "snapshot")
+
+    return {
+        "status": "ok",
+        "saved_rows": result["inserted"] + result["updated"],
+        "inserted": result["inserted"],
+        "updated": result["updated"],
+        "unchanged": result["unchanged"],
+        "total_rows": len(df),
+        "trend_rows": trends["rows"],                              # TravelTrend 행 수
+        "ratio_updated": trends["ratios"],                         # ratio를 채운 TravelStat 연도 행
+        "year_totals": totals["total_by_year"].to_dict(),          # 연도별 출국자 합계
+        "crime_totals": totals["crime_total_by_year"].to_dict(),   # 범죄국 연도별 합계
+        "crime_ratio": totals["crime_ratio_by_year"].to_dict(orient="records"),
+        "total_all_years": int(totals["total_2018_2024"]),        # 전체 합계
+        "region_timings": loaded["timings"],                       # 지역별 파싱 시간(초)
+        "region_errors": loaded["errors"],                         # 실패한 지역
+    }
+
+
+def run_cyber_sync(report, force=False, **params):
+    """사이버사기 API → CyberScamStat 저장 (/sync/cyber/)"""
+    from .api_client import sync_cyber_scam
+
+    result = sync_cyber_scam(force=force)
+    report(0.9, "fetch_and_write")
+
+    rebuild_analysis_snapshot_if_changed(result)
+    report(1.0, "snapshot")
+    return {"status": "cyber_scam_sync_ok", **result}
+
+
+def run_voice_sync(report, force=False, **params):
+    """보이스피싱 API → VoicePhishingStat 저장 (/sync/voice/)"""
+    from .api_client import sync_voice_phishing
+
+    result = sync_voice_phishing(force=force)
+    report(0.9, "fetch_and_write")
+
+    rebuild_analysis_snapshot_if_changed(result)
+    report(1.0, "snapshot")
+    return {"status": "voice_phishing_sync_ok", **result}
+
+
+def run_voice_yearly_sync(report, force=False, **params):
+    """보이스피싱 월별 저장 후 연도별 합계 반환 (/sync/voiceall/)"""
+    from .api_client import sync_voice_phishing, get_voice_phishing_yearly
+
+    result = sync_voice_phishing(force=force)
+    report(0.8, "fetch_and_write")
+
+    rebuild_analysis_snapshot_if_changed(result)
+    report(0.9, "snapshot")
+
+    yearly = get_voice_phishing_yearly()
+    report(1.0, "yearly")
+
+    if yearly is None:
+        return {"status": "no_voice_data"}
+
+    return {
+        "status": "ok",
+        "yearly_voice_stats": yearly,
+    }
+
+
+JOB_RUNNERS = {
+    "travel": run_travel_sync,
+    "cyber": run_cyber_sync,
+    "voice": run_voice_sync,
+    "voice_yearly": run_voice_yearly_sync,
+}
+
+
+# -----------------------------
+# ✔ 작업 큐 (스레드 풀 + SyncJob 테이블)
+# -----------------------------
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "SYNC_JOB_WORKERS", 2),
+                    thread_name_prefix="sync-job",
+                )
+    return _executor
+
+
+def expire_stale_jobs():
+    """프로세스가 죽어서 끝나지 못한 작업은 실패 처리 (중복 방지 잠금 해제)"""
+    limit = timezone.now() - timedelta(seconds=getattr(settings, "SYNC_JOB_TIMEOUT", 1800))
+    SyncJob.objects.filter(
+        status__in=SyncJob.ACTIVE_STATUSES,
+        created_at__lt=limit,
+    ).update(
+        status=SyncJob.STATUS_FAILED,
+        error="timeout: 작업이 제한 시간 안에 끝나지 않았습니다.",
+        finished_at=timezone.now(),
+    )
+
+
+def submit_sync_job(source, **params):
+    """
+    sync 작업을 큐에 넣고 (job, created) 반환.
+    같은 source의 작업이 대기/실행 중이면 새로 만들지 않고 그 작업을 반환.
+    """
+    if source not in JOB_RUNNERS:
+        raise ValueError(f"알 수 없는 sync source: {source}")
+
+    expire_stale_jobs()
+
+    try:
+        with transaction.atomic():
+            job = SyncJob.objects.create(source=source, params=params)
+    except IntegrityError:
+        # 부분 유니크 제약(source + 대기/실행 중)에 걸림 → 기존 작업 반환
+        job = SyncJob.objects.filter(source=source, status__in=SyncJob.ACTIVE_STATUSES).first()
+        if job is not None:
+            return job, False
+        job = SyncJob.objects.create(source=source, params=params)
+
+    get_executor().submit(run_job, job.pk)
+    return job, True
+
+
+def run_job(job_id):
+    """스레드 풀에서 실행: 상태/진행률/단계별 시간을 SyncJob에 기록"""
+    close_old_connections()
+    try:
+        job = SyncJob.objects.get(pk=job_id)
+        job.status = SyncJob.STATUS_RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "started_at"])
+
+        last = [time.perf_counter()]
+
+        def report(progress, step):
+            now = time.perf_counter()
+            job.timings[step] = round(now - last[0], 4)
+            last[0] = now
+            job.progress = progress
+            job.message = step
+            job.save(update_fields=["progress", "message", "timings"])
+
+        try:
+            job.result = JOB_RUNNERS[job.source](report, **job.params)
+            job.status = SyncJob.STATUS_DONE
+            job.progress = 1.0
+        except Exception as e:
+            job.status = SyncJob.STATUS_FAILED
+            job.error = f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "progress", "result", "error", "finished_at"])
+
+        log_event(
+            "sync_job", job_id=job.pk, source=job.source, status=job.status,
+            duration_ms=round((job.finished_at - job.started_at).total_seconds() * 1000, 2),
+            timings=job.timings,
+        )
+    finally:
+        connection.close()
+
+
+def job_payload(job):
+    """/sync/jobs/<id>/ 응답용 dict"""
+    duration = None
+    if job.started_at:
+        end = job.finished_at or timezone.now()
+        duration = round((end - job.started_at).total_seconds(), 4)
+
+    return {
+        "id": job.pk,
+        "source": job.source,
+        "status": job.status,
+        "progress": job.progress,
+        "message": job.message,
+        "timings": job.timings,
+        "duration": duration,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+        "result": job.result,
+        "error": job.error.splitlines()[0] if job.error else "",
+    }
@@ -1,3 +1,986 @@
-from django.test import TestCase
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+import numpy as np
+import pandas as pd
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from .api_client import sync_cyber_scam, sync_voice_phishing
+from .models import (
+    CYBER_TYPE_FIELDS, AnalysisSnapshot, CountrySet, CyberScamStat, SyncJob, SyncState,
+    TravelStat, TravelTrend, VoicePhishingStat,
+)
+from .utils_csv_import import (
+    compare_country_sets, compute_yearly_totals, crime_countries, load_departures, read_departure_csv,
+)
+from .utils_csv_cache import DepartureFrameCache, file_sha256
+from .sync_jobs import job_payload, run_job, submit_sync_job
+from .utils_departure_store import DepartureStore
+from .utils_metrics import reset_metrics, span
+from .utils_response_cache import bump_data_version, get_data_version, response_cache
+
+
+# -----------------------------
+# ✔ 공공데이터 API 스텁 서버 (고정 JSON 응답)
+# -----------------------------
+# 한 번에 받는 perPage(사이버 100, 보이스피싱 500)보다 많아서 여러 페이지로 나뉨
+CYBER_ROWS = [
+    {
+        "연도": str(1900 + i // 2),
+        "구분": "발생건수" if i % 2 == 0 else "검거건수",
+        "직거래": "1,000",
+        "쇼핑몰": "2",
+        "게임": "3",
+        "이메일 무역": "4",
+        "연예빙자": "5",
+        "사이버투자": "6",
+        "사이버사기_기타": "-",
+    }
+    for i in range(250)
+]
+
+VOICE_ROWS = [
+    {"년": str(1900 + i // 12), "월": str(i % 12 + 1), "전화금융사기 발생건수": str(1000 + i)}
+    for i in range(1200)
+]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    datasets = {"/cyber": CYBER_ROWS, "/voice": VOICE_ROWS}
+    requests = 0   # 받은 요청 수
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        StubHandler.requests += 1
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        page = int(query["page"][0])
+        per_page = int(query["perPage"][0])
+
+        rows = self.datasets[url.path]
+        chunk = rows[(page - 1) * per_page: page * per_page]
+
+        # 보이스피싱 API처럼 일부 행은 문자열로 한 번 더 감싸서 응답
+        if url.path == "/voice":
+            chunk = [json.dumps(r, ensure_ascii=False) if i % 3 == 0 else r for i, r in enumerate(chunk)]
+
+        body = json.dumps({
+            "page": page,
+            "perPage": per_page,
+            "totalCount": len(rows),
+            "matchCount": len(rows),
+            "currentCount": len(chunk),
+            "data": chunk,
+        }, ensure_ascii=False).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class PublicDataSyncTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{cls.server.server_port}"
+        cls.api_settings = override_settings(
+            API_KEY="test",
+            SCAM_BASE_URL=base, SCAM_ENDPOINT="/cyber",
+            VOICE_BASE_URL=base, VOICE_ENDPOINT="/voice",
+        )
+        cls.api_settings.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.api_settings.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def test_sequential_and_concurrent_sync_write_all_pages(self):
+        for concurrency in (1, 4):
+            with self.subTest(concurrency=concurrency):
+                CyberScamStat.objects.all().delete()
+                VoicePhishingStat.objects.all().delete()
+
+                cyber = sync_cyber_scam(concurrency=concurrency, force=True)
+                voice = sync_voice_phishing(concurrency=concurrency, force=True)
+
+                self.assertEqual(cyber["inserted"], len(CYBER_ROWS))
+                self.assertEqual(voice["inserted"], len(VOICE_ROWS))
+                self.assertEqual(VoicePhishingStat.objects.count(), len(VOICE_ROWS))
+                self.assertEqual(CyberScamStat.objects.get(year=1900, category="발생건수").total_cases, 1020)
+
+    def test_resync_reports_unchanged(self):
+        sync_voice_phishing(concurrency=4)
+        result = sync_voice_phishing(concurrency=4)
+
+        self.assertEqual(result, {
+            "inserted": 0, "updated": 0, "unchanged": len(VOICE_ROWS), "skipped": True,
+        })
+
+    def test_changed_payload_writes_only_changed_keys(self):
+        sync_voice_phishing()
+        VoicePhishingStat.objects.filter(year=1900, month=1).update(cases=0)
+        VOICE_ROWS.append({"년": "2000", "월": "1", "전화금융사기 발생건수": "7"})
+        try:
+            result = sync_voice_phishing()
+        finally:
+            VOICE_ROWS.pop()
+
+        # 내용이 바뀌면 신규 키와 DB 값이 달라진 키만 저장
+        self.assertFalse(result["skipped"])
+        self.assertEqual((result["inserted"], result["updated"]), (1, 1))
+        self.assertEqual(SyncState.objects.get(source="voice_phishing").row_count, len(VOICE_ROWS) + 1)
+
+    def test_concurrent_fetch_is_bounded_and_stops_with_consumer(self):
+        from .api_client import voice_phishing_client
+        from .utils_http import iter_pages_concurrent
+
+        StubHandler.requests = 0
+        pages = iter_pages_concurrent(voice_phishing_client(per_page=10), concurrency=2)   # 120페이지
+        next(pages)
+        time.sleep(0.5)   # 소비자가 멈춰 있는 동안 큐(2 × 2)가 차면 조회도 멈춤
+
+        fetched = StubHandler.requests
+        self.assertLess(fetched, 12)
+
+        pages.close()
+        self.assertNotIn("public-data-fetch", [t.name for t in threading.enumerate()])
+        time.sleep(0.2)
+        self.assertEqual(StubHandler.requests, fetched)
+
+    def test_pages_are_written_as_they_arrive(self):
+        from .utils_db_sync import sync_with_ledger
+
+        seen = []
+
+        def pages():
+            yield [{"year": 2001, "month": m, "cases": m} for m in range(1, 7)]
+            seen.append(VoicePhishingStat.objects.count())   # 두 번째 페이지 전에 첫 페이지가 저장됨
+            yield [{"year": 2001, "month": m, "cases": m} for m in range(7, 13)]
+
+        def sync():
+            return sync_with_ledger("stream", VoicePhishingStat, pages(), ("year", "month"), ("cases",))
+
+        sync()
+        self.assertEqual(seen[0], 6)
+
+        # 같은 내용이면 롤백: DB에서 바꾼 값이 그대로 남음
+        VoicePhishingStat.objects.filter(year=2001, month=1).update(cases=0)
+        self.assertTrue(sync()["skipped"])
+        self.assertEqual(VoicePhishingStat.objects.get(year=2001, month=1).cases, 0)
+
+
+# -----------------------------
+# ✔ sync 작업 큐 (중복 방지 / 상태 전이 / 진행률 / 202 응답)
+# -----------------------------
+class SyncJobTests(TestCase):
+
+    def setUp(self):
+        # 스레드 풀 대신 제출된 작업 id만 모아두고 테스트에서 run_job을 직접 실행
+        self.submitted = []
+        executor = mock.Mock()
+        executor.submit.side_effect = lambda fn, job_id: self.submitted.append(job_id)
+        patcher = mock.patch("main.sync_jobs.get_executor", return_value=executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.seen = []
+
+        def stub_runner(report, force=False, fail=False):
+            self.seen.append(SyncJob.objects.values_list("status", flat=True).get(source="cyber"))
+            report(0.5, "fetch")
+            if fail:
+                raise RuntimeError("boom")
+            report(0.9, "write")
+            return {"status": "ok", "force": force}
+
+        runners = mock.patch.dict("main.sync_jobs.JOB_RUNNERS", {"cyber": stub_runner})
+        runners.start()
+        self.addCleanup(runners.stop)
+
+    def test_duplicate_submit_returns_active_job(self):
+        job, created = submit_sync_job("cyber")
+        self.assertTrue(created)
+        self.assertEqual(submit_sync_job("cyber"), (job, False))
+        self.assertEqual(self.submitted, [job.pk])   # 중복 요청은 다시 실행하지 않음
+
+        run_job(job.pk)
+        job.refresh_from_db()
+
+        self.assertEqual(self.seen, [SyncJob.STATUS_RUNNING])
+        self.assertEqual(job.status, SyncJob.STATUS_DONE)
+        self.assertEqual(job.progress, 1.0)
+        self.assertEqual(list(job.timings), ["fetch", "write"])
+        self.assertEqual(job.result, {"status": "ok", "force": False})
+
+        # 끝난 뒤에는 새 작업이 만들어짐
+        self.assertTrue(submit_sync_job("cyber")[1])
+
+    def test_failed_job_releases_lock(self):
+        job, _ = submit_sync_job("cyber", fail=True)
+        run_job(job.pk)
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, SyncJob.STATUS_FAILED)
+        self.assertEqual(job.progress, 0.5)
+        self.assertEqual(job_payload(job)["error"], "RuntimeError: boom")
+        self.assertTrue(submit_sync_job("cyber")[1])
+
+    def test_stale_job_is_expired(self):
+        job, _ = submit_sync_job("cyber")
+        SyncJob.objects.filter(pk=job.pk).update(
+            status=SyncJob.STATUS_RUNNING, created_at=timezone.now() - timedelta(hours=1),
+        )
+
+        with override_settings(SYNC_JOB_TIMEOUT=60):
+            new_job, created = submit_sync_job("cyber")
+
+        job.refresh_from_db()
+        self.assertTrue(created)
+        self.assertNotEqual(new_job.pk, job.pk)
+        self.assertEqual(job.status, SyncJob.STATUS_FAILED)
+        self.assertTrue(job.error.startswith("timeout"))
+
+    def test_view_returns_202_and_job_payload(self):
+        first = self.client.get("/sync/cyber/?force=1")
+        self.assertEqual(first.status_code, 202)
+        data = first.json()
+        self.assertEqual(data["status"], "queued")
+
+        second = self.client.get("/sync/cyber/")
+        self.assertEqual(second.status_code, 202)
+        self.assertEqual(second.json(), {**data, "status": "already_running"})
+
+        queued = self.client.get(data["job_url"]).json()
+        self.assertEqual((queued["status"], queued["progress"], queued["duration"]), ("queued", 0, None))
+
+        run_job(data["job_id"])
+        done = self.client.get(data["job_url"]).json()
+        self.assertEqual(done["status"], "done")
+        self.assertEqual(done["progress"], 1.0)
+        self.assertEqual(set(done["timings"]), {"fetch", "write"})
+        self.assertEqual(done["result"], {"status": "ok", "force": True})
+        self.assertGreaterEqual(done["duration"], 0)
+
+        self.assertEqual(self.client.get("/sync/jobs/999999/").status_code, 404)
+
+
+# -----------------------------
+# ✔ 보이스피싱 SQL 집계 (분기 합계 / 달력 기준 12개월 누적)
+# -----------------------------
+class VoicePhishingQueryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        # 2022년: 월 번호만큼, 2023년: 매월 100 (3월은 누락)
+        VoicePhishingStat.objects.bulk_create(
+            [VoicePhishingStat(year=2022, month=m, cases=m) for m in range(1, 13)]
+            + [VoicePhishingStat(year=2023, month=m, cases=100) for m in range(1, 13) if m != 3]
+        )
+
+    def test_quarterly_totals(self):
+        got = [(r["year"], r["quarter"], r["cases"]) for r in VoicePhishingStat.objects.quarterly_totals()]
+        self.assertEqual(got, [
+            (2022, 1, 6), (2022, 2, 15), (2022, 3, 24), (2022, 4, 33),
+            (2023, 1, 200), (2023, 2, 300), (2023, 3, 300), (2023, 4, 300),
+        ])
+
+    def test_rolling_12m_uses_calendar_months(self):
+        rolling = {(r["year"], r["month"]): r["rolling_12m"] for r in VoicePhishingStat.objects.rolling_12m()}
+
+        self.assertEqual(rolling[(2022, 1)], 1)
+        self.assertEqual(rolling[(2022, 12)], 78)
+        # 2022-05 ~ 2023-04: 5+…+12 + 1·2·4월 300 (행 12개 기준이면 2022-04까지 들어가 372)
+        self.assertEqual(rolling[(2023, 4)], 368)
+        self.assertEqual(rolling[(2023, 12)], 1100)
+        self.assertNotIn((2023, 3), rolling)
+
+
+# -----------------------------
+# ✔ 사이버사기 SQL 집계 (generated column total)
+# -----------------------------
+class CyberScamQueryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        # 유형 값: 1, 2, ..., 7 × scale → total = 28 × scale
+        for year, category, scale in ((2022, "발생건수", 1), (2022, "검거건수", 10), (2023, "발생건수", 100)):
+            CyberScamStat.objects.create(
+                year=year, category=category,
+                **{name: (i + 1) * scale for i, name in enumerate(CYBER_TYPE_FIELDS)},
+            )
+
+    def test_generated_total(self):
+        stat = CyberScamStat.objects.get(year=2022, category="검거건수")
+        self.assertEqual(stat.total, 280)
+
+        stat.etc = 0
+        stat.save()
+        stat.refresh_from_db()
+        self.assertEqual(stat.total, 210)
+        self.assertEqual(stat.total, stat.total_cases)
+
+    def test_yearly_and_category_totals(self):
+        qs = CyberScamStat.objects
+        self.assertEqual(list(qs.yearly_totals()), [
+            {"year": 2022, "total_cases": 308},
+            {"year": 2023, "total_cases": 2800},
+        ])
+        self.assertEqual(qs.yearly_totals_dict("발생건수"), {2022: 28, 2023: 2800})
+        self.assertEqual(qs.occurrences().yearly_totals_dict(), {2022: 28, 2023: 2800})
+        self.assertEqual(list(qs.category_totals()), [
+            {"year": 2022, "category": "검거건수", "total_cases": 280},
+            {"year": 2022, "category": "발생건수", "total_cases": 28},
+            {"year": 2023, "category": "발생건수", "total_cases": 2800},
+        ])
+
+    def test_type_breakdown_keys(self):
+        rows = list(CyberScamStat.objects.type_breakdown())
+        self.assertEqual(set(rows[0]), {"year", *(f"{name}_total" for name in CYBER_TYPE_FIELDS)})
+        self.assertEqual(rows[0]["direct_trade_total"], 11)
+        self.assertEqual(rows[0]["etc_total"], 77)
+
+        occurred = list(CyberScamStat.objects.type_breakdown("발생건수"))
+        self.assertEqual([r["game_total"] for r in occurred], [3, 300])
+
+
+# -----------------------------
+# ✔ TravelStat 주요 쿼리가 인덱스를 타는지 (EXPLAIN QUERY PLAN)
+# -----------------------------
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN은 SQLite 전용")
+class TravelStatQueryPlanTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        TravelStat.objects.bulk_create([
+            TravelStat(region=region, country=f"{region}-{c}", year=year, month=month, departures=1)
+            for region in ("asia", "europe")
+            for c in range(5)
+            for year in range(2016, 2026)
+            for month in range(0, 13)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def query_plan(self, qs):
+        sql, params = qs.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return " | ".join(row[-1] for row in cursor.fetchall())
+
+    def test_recent_listing_uses_index_without_sort(self):
+        plan = self.query_plan(
+            TravelStat.objects.order_by("-year", "-month", "region", "country")[:100]
+        )
+        self.assertIn("travelstat_recent_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_region_counts_use_unique_index(self):
+        plan = self.query_plan(
+            TravelStat.objects.values("region").annotate(count=Count("id")).order_by("region")
+        )
+        self.assertIn("COVERING INDEX", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_country_year_filter_uses_index(self):
+        plan = self.query_plan(
+            TravelStat.objects.filter(country="asia-1", year__gte=2018)
+        )
+        self.assertIn("travelstat_country_year_idx", plan)
+
+    def test_year_month_filter_uses_index(self):
+        plan = self.query_plan(
+            TravelStat.objects.filter(year=2019, month=3).order_by("region", "country")
+        )
+        self.assertIn("travelstat_recent_idx", plan)
+
+
+# -----------------------------
+# ✔ 파싱 결과 캐시 ((경로, 지역) LRU + 디스크 사본)
+# -----------------------------
+class DepartureFrameCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.parser = mock.Mock(side_effect=lambda path, region: pd.DataFrame({
+            "region": [region], "text": [open(path, encoding="utf-8").read()],
+        }))
+
+    def write(self, name, text):
+        path = f"{self.tmp}/{name}"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_hit_touch_and_change(self):
+        cache = DepartureFrameCache()
+        path = self.write("a.csv", "one")
+
+        first = cache.get(path, "asia", self.parser)
+        self.assertIs(cache.get(path, "asia", self.parser), first)
+
+        # mtime만 바뀜 → 해시가 같으므로 다시 파싱하지 않고 새 mtime 기록
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertIs(cache.get(path, "asia", self.parser), first)
+        with mock.patch("main.utils_csv_cache.file_sha256") as sha:
+            cache.get(path, "asia", self.parser)
+        sha.assert_not_called()
+
+        # 내용이 바뀜 → 다시 파싱
+        self.write("a.csv", "three")
+        self.assertEqual(cache.get(path, "asia", self.parser)["text"][0], "three")
+
+        self.assertEqual(self.parser.call_count, 2)
+        self.assertEqual(cache.stats, {"hits": 3, "disk_hits": 0, "misses": 2})
+
+    def test_same_path_different_region_and_lru(self):
+        cache = DepartureFrameCache(max_entries=2)
+        a, b = self.write("a.csv", "a"), self.write("b.csv", "b")
+
+        cache.get(a, "asia", self.parser)
+        cache.get(a, "europe", self.parser)   # 같은 파일도 지역이 다르면 별도 항목
+        cache.get(a, "asia", self.parser)     # asia를 최근으로
+        cache.get(b, "asia", self.parser)     # 가장 오래된 (a, europe) 제거
+
+        self.assertEqual(self.parser.call_count, 3)
+        cache.get(a, "asia", self.parser)
+        self.assertEqual(self.parser.call_count, 3)
+        cache.get(a, "europe", self.parser)
+        self.assertEqual(self.parser.call_count, 4)
+
+    def test_reload_from_disk_copy(self):
+        path = self.write("a.csv", "disk")
+
+        for disk_format in ("parquet", "feather"):
+            with self.subTest(disk_format=disk_format):
+                cache_dir = f"{self.tmp}/{disk_format}"
+                DepartureFrameCache(cache_dir=cache_dir, disk_format=disk_format).get(path, "asia", self.parser)
+
+                # 워커 재시작 (메모리 캐시 없음) → 디스크 사본에서 읽음
+                cache = DepartureFrameCache(cache_dir=cache_dir, disk_format=disk_format)
+                calls = self.parser.call_count
+                df = cache.get(path, "asia", self.parser)
+
+                self.assertEqual(self.parser.call_count, calls)
+                self.assertEqual(df.to_dict("records"), [{"region": "asia", "text": "disk"}])
+                self.assertEqual(cache.stats, {"hits": 0, "disk_hits": 1, "misses": 0})
+
+
+# -----------------------------
+# ✔ 지역 CSV 동시 로드 (프로세스 풀 결과가 순차 파싱과 같은지)
+# -----------------------------
+class RegionPoolTests(SimpleTestCase):
+
+    def test_pool_matches_serial_and_reports_bad_region(self):
+        from .utils_csv_import import load_and_aggregate_csv
+        from .utils_region_pool import load_regions
+
+        files = {"asia": settings.ASIA_CSV, "mars": "/nonexistent/Mars.csv", "europe": settings.EUROPE_CSV}
+        expected = {region: load_and_aggregate_csv(files[region], region) for region in ("asia", "europe")}
+
+        for workers in (1, 3):
+            with self.subTest(workers=workers):
+                result = load_regions(files, workers=workers)
+
+                self.assertEqual(result["workers"], workers)
+                self.assertEqual(list(result["frames"]), ["asia", "europe"])
+                self.assertEqual(list(result["errors"]), ["mars"])
+                self.assertEqual(set(result["timings"]), {"asia", "europe"})
+                for region, df in expected.items():
+                    pd.testing.assert_frame_equal(result["frames"][region], df)
+
+
+# -----------------------------
+# ✔ 출국 Parquet 저장소 (조건 조회 결과가 CSV 파싱과 같은지)
+# -----------------------------
+class DepartureStoreTests(SimpleTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp, ignore_errors=True)
+        self.files = {"asia": settings.ASIA_CSV, "europe": settings.EUROPE_CSV}
+        self.store = DepartureStore(f"{self.tmp}/store")
+        self.store.build(self.files, read_departure_csv)
+
+    def test_filtered_read_matches_csv(self):
+        with override_settings(DEPARTURE_STORE_DIR=self.store.root):
+            got = load_departures(years=[2019, 2020], countries=["중국", "영국"])
+
+        expected = pd.concat([read_departure_csv(p, r) for r, p in self.files.items()])
+        expected = expected[expected["year"].isin([2019, 2020]) & expected["country"].isin(["중국", "영국"])]
+
+        key = ["region", "country", "year", "month"]
+        self.assertEqual(
+            got.sort_values(key).to_dict("records"),
+            expected.sort_values(key).to_dict("records"),
+        )
+
+    def test_column_pruning(self):
+        got = self.store.read(countries=["중국"], columns=["year", "departures"])
+        self.assertEqual(list(got.columns), ["year", "departures"])
+
+    def test_memmap_cube_totals_match_frame(self):
+        cube = self.store.cube()
+        self.assertIsInstance(cube.values, np.memmap)
+
+        df = pd.concat([read_departure_csv(p, r) for r, p in self.files.items()], ignore_index=True)
+        expected = compute_yearly_totals(df)
+        got = compute_yearly_totals(cube)
+
+        for key in ("total_by_year", "crime_total_by_year", "crime_ratio_by_year", "country_yearly"):
+            pd.testing.assert_frame_equal(got[key], expected[key])
+        self.assertEqual(got["total_2018_2024"], expected["total_2018_2024"])
+
+    def test_schema_version_mismatch_is_stale(self):
+        self.assertTrue(self.store.is_current(self.files))
+
+        meta = self.store.meta()
+        meta["schema_version"] = 0
+        (self.store.root / "_store.json").write_text(json.dumps(meta), encoding="utf-8")
+        self.assertFalse(self.store.is_current(self.files))
+
+    def test_touched_source_is_rehashed_once(self):
+        files = {"asia": shutil.copy(settings.ASIA_CSV, f"{self.tmp}/Asia.csv")}
+        store = DepartureStore(f"{self.tmp}/touched")
+        store.build(files, read_departure_csv)
+
+        st = os.stat(files["asia"])
+        os.utime(files["asia"], ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        with mock.patch("main.utils_departure_store.file_sha256", wraps=file_sha256) as sha:
+            self.assertTrue(store.is_current(files))
+            self.assertTrue(store.is_current(files))   # 메타에 새 mtime이 기록돼서 해시 생략
+        self.assertEqual(sha.call_count, 1)
+
+
+# -----------------------------
+# ✔ ingest_departures 명령 (청크 스트리밍 / dry-run / 필터)
+# -----------------------------
+class IngestDeparturesCommandTests(TestCase):
+
+    KEY = ("region", "country", "year", "month", "departures")
+
+    def ingest(self, *args):
+        out = io.StringIO()
+        call_command("ingest_departures", *args, stdout=out)
+        return out.getvalue()
+
+    def expected(self, region, path):
+        df = read_departure_csv(path, region)
+        return set(df[list(self.KEY)].itertuples(index=False, name=None))
+
+    def test_small_chunks_match_full_parse(self):
+        self.ingest("--region", "asia", "--chunk-size", "7")
+
+        stored = set(TravelStat.objects.values_list(*self.KEY))
+        self.assertEqual(stored, self.expected("asia", settings.ASIA_CSV))
+
+        # 청크 크기가 달라도 같은 행 → 전부 변경없음
+        out = self.ingest("--region", "asia")
+        self.assertIn(f"신규 0 / 갱신 0 / 변경없음 {len(stored)}", out)
+
+    def test_dry_run_writes_nothing(self):
+        out = self.ingest("--region", "asia", "--dry-run", "--trends")
+        self.assertIn("dry-run", out)
+        self.assertFalse(TravelStat.objects.exists())
+        self.assertFalse(TravelTrend.objects.exists())
+
+    def test_region_and_year_filters(self):
+        self.ingest("--region", "europe", "--start-year", "2019", "--end-year", "2020", "--chunk-size", "50")
+
+        expected = {row for row in self.expected("europe", settings.EUROPE_CSV) if 2019 <= row[2] <= 2020}
+        self.assertEqual(set(TravelStat.objects.values_list(*self.KEY)), expected)
+
+    def test_trends_are_opt_in_and_skipped_when_unchanged(self):
+        self.ingest("--region", "asia")
+        self.assertFalse(TravelTrend.objects.exists())
+
+        self.assertIn("[asia] 추세 지표", self.ingest("--region", "asia", "--trends"))
+        self.assertTrue(TravelTrend.objects.filter(region="asia").exists())
+        self.assertNotIn("추세 지표", self.ingest("--region", "asia", "--trends"))
+
+
+# -----------------------------
+# ✔ 국가 세트 (버전 관리 + 여러 세트 한 번에 계산)
+# -----------------------------
+class CountrySetTests(TestCase):
+
+    def test_latest_version_is_used(self):
+        # 마이그레이션으로 crime v1이 들어가 있음
+        self.assertEqual(len(crime_countries()), 10)
+
+        CountrySet.objects.create(name="crime", version=2, countries=["중국", "미국"])
+        self.assertEqual(crime_countries(), ["중국", "미국"])
+        self.assertEqual([row.label for row in CountrySet.objects.current()], ["crime@v2"])
+
+    def test_compare_matches_single_set_totals(self):
+        df = read_departure_csv(settings.ASIA_CSV, "asia")
+        sets = {"a": ["중국", "일본"], "b": ["캄보디아"]}
+
+        result = compare_country_sets(df, sets)
+
+        for name, countries in sets.items():
+            single = compute_yearly_totals(df, countries)["crime_ratio_by_year"]
+            got = result[result["set"] == name]
+            self.assertEqual(got["year"].tolist(), single["year"].tolist())
+            self.assertEqual(got["set_total"].tolist(), single["crime_country_total"].tolist())
+            self.assertEqual(got["ratio_percent"].tolist(), single["crime_ratio_percent"].tolist())
+
+
+# -----------------------------
+# ✔ 분석 JSON 응답 캐시 (ETag / 304 / 버전 무효화)
+# -----------------------------
+class AnalysisResponseCacheTests(TestCase):
+
+    def setUp(self):
+        response_cache().clear()
+        AnalysisSnapshot.objects.create(year=2024, crime_ratio=1.5, cyber_scam_cases=3, voice_phishing_cases=4)
+
+    def test_etag_revalidation_and_invalidation(self):
+        first = self.client.get("/analysis/data/")
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("must-revalidate", first["Cache-Control"])
+        etag = first["ETag"]
+
+        # 같은 버전 → 304, 본문 없음
+        second = self.client.get("/analysis/data/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+
+        # 버전이 같으면 DB가 바뀌어도 캐시된 본문을 그대로 반환
+        AnalysisSnapshot.objects.filter(year=2024).update(cyber_scam_cases=30)
+        with self.assertNumQueries(1):   # 버전 조회만
+            cached = self.client.get("/analysis/data/")
+        self.assertEqual(cached.json()["cyber_scam_cases"], [3])
+
+        # sync로 버전이 오르면 ETag가 바뀌고 새로 계산
+        bump_data_version()
+        fresh = self.client.get("/analysis/data/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh["ETag"], etag)
+        self.assertEqual(fresh.json()["cyber_scam_cases"], [30])
+
+
+# -----------------------------
+# ✔ /analysis/data/ 조건 조회 (검증 + 정규화된 조건별 캐시)
+# -----------------------------
+class AnalysisParamsTests(TestCase):
+
+    def setUp(self):
+        response_cache().clear()
+
+    def test_invalid_params_return_400(self):
+        for query in ("start=abc", "start=2020&end=2019", "regions=mars", "granularity=week"):
+            with self.subTest(query=query):
+                res = self.client.get(f"/analysis/data/?{query}", HTTP_IF_NONE_MATCH=f'"v{get_data_version()}"')
+                self.assertEqual(res.status_code, 400)
+                self.assertIn("error", res.json())
+                # 오류 응답에는 ETag / 캐시 헤더를 붙이지 않음 (304로 재사용되지 않도록)
+                self.assertFalse(res.has_header("ETag"))
+                self.assertNotIn("max-age", res.get("Cache-Control", ""))
+
+    def test_equivalent_params_share_one_computation(self):
+        from . import utils_analysis
+
+        with mock.patch.object(
+            utils_analysis, "build_filtered_analysis", wraps=utils_analysis.build_filtered_analysis,
+        ) as build:
+            a = self.client.get("/analysis/data/?start=2019&end=2020&countries=중국,일본&regions=asia").json()
+            b = self.client.get("/analysis/data/?regions=asia&countries=일본&countries=중국&end=2020&start=2019").json()
+
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(a, b)
+        self.assertEqual(a["years"], [2019, 2020])
+        self.assertEqual(a["params"]["countries"], ["일본", "중국"])
+
+    def test_unrelated_params_use_snapshot(self):
+        from . import utils_analysis
+
+        AnalysisSnapshot.objects.create(year=2024, crime_ratio=1.5, cyber_scam_cases=3, voice_phishing_cases=4)
+        with mock.patch.object(utils_analysis, "build_filtered_analysis") as build:
+            for query in ("utm=1", "_=123&granularity=year", "start=2018&end=2025&countries="):
+                with self.subTest(query=query):
+                    res = self.client.get(f"/analysis/data/?{query}")
+                    self.assertEqual(res.json()["cyber_scam_cases"], [3])
+
+        build.assert_not_called()
+
+    def test_month_granularity(self):
+        data = self.client.get("/analysis/data/?start=2019&end=2019&regions=asia&granularity=month").json()
+        self.assertEqual(data["months"], list(range(1, 13)))
+        self.assertEqual(len(data["crime_ratio"]), 12)
+
+
+# -----------------------------
+# ✔ /export/travel/ 스트리밍 내보내기
+# -----------------------------
+class TravelExportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        TravelStat.objects.bulk_create([
+            TravelStat(region=region, country=f"{region}-{c}", year=year, month=month, departures=year + month)
+            for region in ("asia", "europe")
+            for c in range(3)
+            for year in (2019, 2020)
+            for month in range(0, 13)
+        ])
+
+    def test_ndjson_with_filters(self):
+        res = self.client.get("/export/travel/?regions=asia&start=2020&month=0")
+        self.assertTrue(res.streaming)
+        rows = [json.loads(line) for line in b"".join(res.streaming_content).decode().splitlines()]
+
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0], {
+            "region": "asia", "country": "asia-0", "year": 2020, "month": 0, "departures": 2020, "ratio": None,
+        })
+
+    def test_gzip_csv_contains_all_rows(self):
+        res = self.client.get("/export/travel/?format=csv&gzip=1")
+        self.assertEqual(res["Content-Type"], "application/gzip")
+
+        text = gzip.decompress(b"".join(res.streaming_content)).decode("utf-8")
+        rows = list(csv.reader(text.splitlines()))
+        self.assertEqual(rows[0], ["region", "country", "year", "month", "departures", "ratio"])
+        self.assertEqual(len(rows) - 1, TravelStat.objects.count())
+
+    def test_invalid_format(self):
+        self.assertEqual(self.client.get("/export/travel/?format=xml").status_code, 400)
+
+
+# -----------------------------
+# ✔ /debug/travel/ keyset 페이지
+# -----------------------------
+class TravelBrowseTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        TravelStat.objects.bulk_create([
+            TravelStat(region=region, country=f"{region}-{c}", year=year, month=month, departures=1)
+            for region in ("asia", "europe")
+            for c in range(4)
+            for year in (2019, 2020, 2021)
+            for month in range(0, 13)
+        ])
+
+    def setUp(self):
+        response_cache().clear()
+
+    def walk(self, query):
+        keys, url = [], f"/debug/travel/rows/?{query}"
+        while True:
+            data = self.client.get(url).json()
+            keys += [(r["year"], r["month"], r["region"], r["country"]) for r in data["rows"]]
+            if not data["next"]:
+                return keys, data
+            url = f"/debug/travel/rows/?{query}&after={data['next']}"
+
+    def test_pages_cover_table_in_order(self):
+        keys, data = self.walk("limit=37")
+        expected = list(
+            TravelStat.objects.order_by("-year", "-month", "region", "country")
+            .values_list("year", "month", "region", "country")
+        )
+        self.assertEqual(keys, expected)
+        self.assertEqual(data["approx_total"], len(expected))
+
+    def test_filters(self):
+        keys, data = self.walk("region=europe&country=europe-2&limit=10")
+        self.assertEqual(len(keys), 3 * 13)
+        self.assertEqual({k[3] for k in keys}, {"europe-2"})
+        self.assertEqual(data["approx_total"], 3 * 13)
+
+    def test_html_page_and_bad_cursor(self):
+        res = self.client.get("/debug/travel/?limit=5")
+        self.assertContains(res, "다음 페이지")
+        self.assertEqual(len(res.context["stats"]), 5)
+
+        self.assertEqual(self.client.get("/debug/travel/?after=@@").status_code, 400)
+
+
+# -----------------------------
+# ✔ /metrics (요청 지표 + 파이프라인 단계 span)
+# -----------------------------
+class MetricsTests(TestCase):
+
+    def setUp(self):
+        reset_metrics()
+
+    def test_request_and_span_metrics_exported(self):
+        self.client.get("/debug/travel/rows/")
+        with span("csv_read", region="test"):
+            pass
+        with self.assertRaises(ValueError), span("db_write"):
+            raise ValueError("boom")
+
+        res = self.client.get("/metrics")
+        self.assertTrue(res["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = res.content.decode()
+
+        self.assertIn(
+            'crime_http_request_duration_seconds_count{view="travel_browse",method="GET",status="200"} 1',
+            body,
+        )
+        self.assertRegex(body, r'crime_http_request_db_queries_total\{view="travel_browse",method="GET"\} [1-9]')
+        self.assertIn('crime_pipeline_stage_duration_seconds_bucket{stage="csv_read",le="+Inf"} 1', body)
+        self.assertIn('crime_pipeline_stage_errors_total{stage="db_write"} 1', body)
+
+
+# -----------------------------
+# ✔ 요청 경로 import에 pandas 등 무거운 모듈이 끌려오지 않는지
+# -----------------------------
+class ImportFootprintTests(SimpleTestCase):
+
+    def test_request_path_does_not_load_heavy_modules(self):
+        from benchmarks.import_time import measure
+
+        result = measure(runs=1)
+        self.assertEqual(result["heavy_loaded"], [])
+
+
+# -----------------------------
+# ✔ 합성 KTO 데이터 생성기 → 파서 / API 동기화 왕복
+# -----------------------------
+class SyntheticDataTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from benchmarks.generate_kto import generate
+
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.expected = generate(cls.tmp_dir, range(2015, 2021), countries=15, noise=0.2, seed=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
+        super().tearDownClass()
+
+    def test_csv_parses_to_expected_totals(self):
+        for region, info in self.expected["regions"].items():
+            with self.subTest(region=region):
+                df = read_departure_csv(f"{self.tmp_dir}/{info['file']}", region)
+                self.assertEqual(len(df), info["monthly_rows"])
+                self.assertEqual(df["country"].nunique(), info["countries"])
+                self.assertEqual(int(df["departures"].sum()), info["departures"])
+
+    def test_stub_api_syncs_expected_rows(self):
+        from benchmarks.generate_kto import stub_server
+
+        server = stub_server(self.tmp_dir)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_port}"
+        try:
+            with override_settings(
+                API_KEY="test",
+                SCAM_BASE_URL=base, SCAM_ENDPOINT="/cyber",
+                VOICE_BASE_URL=base, VOICE_ENDPOINT="/voice",
+            ):
+                sync_cyber_scam(force=True)
+                sync_voice_phishing(force=True)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(CyberScamStat.objects.count(), self.expected["cyber_scam_rows"])
+        self.assertEqual(VoicePhishingStat.objects.count(), self.expected["voice_phishing_rows"])
+
+
+# -----------------------------
+# ✔ 추세 지표 (TravelTrend) 계산 / 저장 / 조회
+# -----------------------------
+def trend_frame():
+    """국가 A: 2023년 매월 100, 2024년 1~6월 110 (7~12월은 미집계 0) / 국가 B: 매월 50"""
+    rows = []
+    for year in (2023, 2024):
+        for month in range(1, 13):
+            a = 100 if year == 2023 else (110 if month <= 6 else 0)
+            rows.append({"year": year, "month": month, "country": "A", "region": "asia", "departures": a})
+            rows.append({"year": year, "month": month, "country": "B", "region": "asia", "departures": 50})
+    return pd.DataFrame(rows)
+
+
+class TravelTrendTests(TestCase):
+
+    def test_compute_trends(self):
+        from .utils_trends import compute_trends
+
+        trends = compute_trends(trend_frame()).set_index(["country", "year", "month"])
+        a = trends.loc["A"]
+
+        self.assertEqual(a.loc[(2024, 1), "yoy_ratio"], 10.0)
+        self.assertTrue(np.isnan(a.loc[(2024, 7), "yoy_ratio"]))       # 미집계 달은 비율 없음
+        self.assertEqual(a.loc[(2024, 0), "yoy_ratio"], 10.0)           # 누계 기준 (1~6월끼리 비교)
+        self.assertTrue(np.isnan(a.loc[(2023, 2), "rolling_3m"]))
+        self.assertEqual(a.loc[(2023, 3), "rolling_3m"], 300)
+        self.assertEqual(a.loc[(2024, 1), "rolling_12m"], 1210)
+        self.assertAlmostEqual(a.loc[(2024, 1), "seasonal_index"], 1.0244)
+        self.assertEqual(trends.loc[("전체", 2024, 1), "departures"], 160)
+
+    def test_rebuild_fills_ratio_and_api_reads_table(self):
+        from .utils_db_sync import sync_travel_stats
+        from .utils_trends import rebuild_travel_trends
+
+        yearly = trend_frame().groupby(["year", "country", "region"], as_index=False)["departures"].sum()
+        sync_travel_stats(yearly)
+        result = rebuild_travel_trends(trend_frame())
+
+        self.assertEqual(result["ratios"], 2)   # 2024년 A, B (2023년은 전년 없음 → None 그대로)
+        self.assertEqual(TravelStat.objects.get(country="A", year=2024, month=0).ratio, 10.0)
+
+        # ratio 없이 다시 저장해도 채운 ratio를 덮어쓰지 않음
+        self.assertEqual(sync_travel_stats(yearly)["unchanged"], len(yearly))
+        self.assertEqual(TravelStat.objects.get(country="B", year=2024, month=0).ratio, 0.0)
+
+        rows = self.client.get("/analysis/trends/?countries=A&granularity=month&start=2024").json()["rows"]
+        self.assertEqual(len(rows), 12)
+        self.assertEqual(rows[0]["yoy_ratio"], 10.0)
+
+        totals = self.client.get("/analysis/trends/").json()["rows"]
+        self.assertEqual([r["country"] for r in totals], ["전체", "전체"])
+        self.assertEqual(self.client.get("/analysis/trends/?granularity=week").status_code, 400)
+
+    def test_month_shift_with_same_yearly_totals_rebuilds(self):
+        from .utils_trends import rebuild_travel_trends_if_changed
+
+        frame = trend_frame()
+        self.assertFalse(rebuild_travel_trends_if_changed(frame)["skipped"])
+        self.assertTrue(rebuild_travel_trends_if_changed(frame.sample(frac=1, random_state=0))["skipped"])
+
+        # 2023년 1월 → 2월로 10명 이동 (연도 합계는 그대로)
+        shifted = frame.copy()
+        a_2023 = (shifted["country"] == "A") & (shifted["year"] == 2023)
+        shifted.loc[a_2023 & (shifted["month"] == 1), "departures"] -= 10
+        shifted.loc[a_2023 & (shifted["month"] == 2), "departures"] += 10
+
+        self.assertFalse(rebuild_travel_trends_if_changed(shifted)["skipped"])
+        self.assertEqual(TravelTrend.objects.get(country="A", year=2024, month=1).yoy_ratio, 22.2)
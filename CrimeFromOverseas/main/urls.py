@@ -24,8 +24,23 @@ urlpatterns = [
 
     path("debug/travel/", views.travel_debug_view, name="travel_debug"),
 
+    # TravelStat 브라우저 JSON (keyset 페이지)
+    path("debug/travel/rows/", views.travel_browse_api, name="travel_browse"),
+
     path("sync/voiceall/", views.sync_voice_yearly_view, name="sync_voiceall"),
 
+    # sync 작업 상태 조회
+    path("sync/jobs/<int:job_id>/", views.sync_job_view, name="sync_job"),
+
     path("analysis/data/", views.get_analysis_data, name="analysis_data"),
 
+    # 출국 추세 지표 (TravelTrend 조회)
+    path("analysis/trends/", views.travel_trends_api, name="analysis_trends"),
+
+    # TravelStat 내보내기 (NDJSON / CSV 스트리밍)
+    path("export/travel/", views.export_travel_view, name="export_travel"),
+
+    # 응답 시간 / DB 쿼리 수 / 파이프라인 단계 시간 (Prometheus)
+    path("metrics", views.metrics_view, name="metrics"),
+
 ]
\ No newline at end of file
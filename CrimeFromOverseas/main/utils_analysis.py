@@ -0,0 +1,300 @@
+import hashlib
+import json
+
+from django.db import transaction
+from django.http import QueryDict
+
+from .models import CyberScamStat, VoicePhishingStat, AnalysisSnapshot, TravelTrend, CYBER_OCCURRENCE, TREND_FIELDS
+from .utils_response_cache import bump_data_version, get_data_version, response_cache
+
+# 분석 공통 연도 구간 (스냅샷 / 조건 조회 기본값)
+ANALYSIS_START_YEAR = 2018
+ANALYSIS_END_YEAR = 2025
+GRANULARITIES = ("year", "month")
+
+
+def build_analysis_data():
+    """
+    그래프용 분석 데이터를 생성하여 JSON 형태로 반환.
+    기간은 공통된 2018~2025로 통일.
+    """
+    from .utils_csv_import import load_all_departure_data   # pandas는 스냅샷을 다시 만들 때만
+
+    # 1) 출입국 CSV 데이터에서 연도별 합계, 범죄국 합계 불러오기
+    df, year_totals, crime_totals, crime_ratio_by_year, total_2018_2024 = load_all_departure_data()
+
+    # 2) 분석 공통 연도 구간 설정
+    valid_years = list(range(ANALYSIS_START_YEAR, ANALYSIS_END_YEAR + 1))  # 2018~2025
+
+    # 3) 출국자 데이터 필터링 (범죄국 합계가 없는 연도는 비율 없음)
+    ratio_filtered = crime_ratio_by_year[crime_ratio_by_year["year"].isin(valid_years)]
+    ratio_dict = dict(zip(
+        ratio_filtered["year"].tolist(),
+        (ratio_filtered["crime_country_total"] / ratio_filtered["year_total"] * 100).tolist(),
+    ))
+
+    years = [int(y) for y in year_totals["year"] if y in valid_years]
+
+    # 4) 범죄국 비율(%)
+    crime_ratio = [ratio_dict.get(y) for y in years]
+
+    # 5) 사이버사기 연도별 합계 (발생건수 기준, DB에서 집계)
+    cyber_yearly = (
+        CyberScamStat.objects
+        .filter(year__in=valid_years)
+        .yearly_totals_dict(category=CYBER_OCCURRENCE)
+    )
+
+    # 6) 보이스피싱 연도별 합계
+    voice_yearly = {
+        row["year"]: row["voice_year_total"]
+        for row in VoicePhishingStat.objects.filter(year__in=valid_years).yearly_totals()
+    }
+
+    # 7) 최종 데이터 반환 (DB 누락 연도는 0으로 보정)
+    return {
+        "years": years,
+        "crime_ratio": crime_ratio,
+        "cyber_scam_cases": [int(cyber_yearly.get(y, 0)) for y in years],
+        "voice_phishing_cases": [int(voice_yearly.get(y, 0)) for y in years],
+    }
+
+
+# -----------------------------
+# ✔ 분석 스냅샷 (사전 계산 테이블)
+# -----------------------------
+def rebuild_analysis_snapshot():
+    """build_analysis_data() 결과로 AnalysisSnapshot 테이블을 통째로 다시 생성"""
+    data = build_analysis_data()
+
+    snapshots = [
+        AnalysisSnapshot(
+            year=year,
+            crime_ratio=ratio,
+            cyber_scam_cases=cyber,
+            voice_phishing_cases=voice,
+        )
+        for year, ratio, cyber, voice in zip(
+            data["years"],
+            data["crime_ratio"],
+            data["cyber_scam_cases"],
+            data["voice_phishing_cases"],
+        )
+    ]
+
+    with transaction.atomic():
+        AnalysisSnapshot.objects.all().delete()
+        AnalysisSnapshot.objects.bulk_create(snapshots)
+
+    # 응답 캐시 / ETag 무효화
+    bump_data_version()
+    return data
+
+
+def rebuild_analysis_snapshot_if_changed(result):
+    """sync 결과(bulk_sync 반환값)에 신규/갱신 행이 있을 때만 스냅샷 재생성"""
+    if result["inserted"] or result["updated"]:
+        rebuild_analysis_snapshot()
+        return True
+    return False
+
+
+def read_analysis_snapshot():
+    """스냅샷 테이블에서 분석 데이터를 읽음. 비어 있으면 한 번 생성."""
+    rows = list(
+        AnalysisSnapshot.objects
+        .order_by("year")
+        .values_list("year", "crime_ratio", "cyber_scam_cases", "voice_phishing_cases")
+    )
+
+    if not rows:
+        return rebuild_analysis_snapshot()
+
+    years, crime_ratio, cyber, voice = (list(col) for col in zip(*rows))
+    return {
+        "years": years,
+        "crime_ratio": crime_ratio,
+        "cyber_scam_cases": cyber,
+        "voice_phishing_cases": voice,
+    }
+
+
+# -----------------------------
+# ✔ 조건별 분석 (/analysis/data/?start=&end=&countries=&regions=&granularity=)
+# -----------------------------
+def query_int(query, name, default, low, high):
+    """QueryDict 정수 파라미터 (없으면 default, 형식/범위가 틀리면 ValueError)"""
+    raw = query.get(name)
+    if raw in (None, ""):
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValueError(f"{name}는 정수여야 합니다: {raw}")
+    if not low <= value <= high:
+        raise ValueError(f"{name} 범위({low}~{high})를 벗어났습니다: {value}")
+    return value
+
+
+def query_names(query, name):
+    """쉼표 구분 또는 여러 번 지정한 이름 목록 (정렬/중복 제거, 없으면 None)"""
+    values = {
+        v.strip()
+        for raw in query.getlist(name)
+        for v in raw.split(",")
+        if v.strip()
+    }
+    return sorted(values) or None
+
+
+def query_year_range(query, default_start, default_end):
+    """start / end 연도 파라미터 → (start, end)"""
+    start = query_int(query, "start", default_start, 1900, 2100)
+    end = query_int(query, "end", default_end, 1900, 2100)
+    if start is not None and end is not None and start > end:
+        raise ValueError(f"start({start})가 end({end})보다 큽니다.")
+    return start, end
+
+
+def query_regions(query):
+    """regions 파라미터 (출국 CSV 지역명만 허용)"""
+    regions = query_names(query, "regions")
+    if not regions:
+        return None
+
+    from .utils_csv_import import departure_files   # 지역을 지정했을 때만 (pandas 포함)
+
+    unknown = set(regions) - set(departure_files())
+    if unknown:
+        raise ValueError(f"알 수 없는 지역: {', '.join(sorted(unknown))}")
+    return regions
+
+
+def query_granularity(query):
+    """granularity 파라미터: year(기본) / month"""
+    granularity = query.get("granularity") or "year"
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity는 {' / '.join(GRANULARITIES)} 중 하나여야 합니다: {granularity}")
+    return granularity
+
+
+def parse_analysis_params(query):
+    """
+    QueryDict → 정규화된 조건 dict (잘못된 값이면 ValueError)
+    - start, end: 연도 (기본 2018~2025)
+    - countries, regions: 쉼표 구분 또는 여러 번 지정 (정렬/중복 제거, 없으면 None)
+    - granularity: year(기본) / month
+    """
+    start, end = query_year_range(query, ANALYSIS_START_YEAR, ANALYSIS_END_YEAR)
+
+    return {
+        "start": start,
+        "end": end,
+        "countries": query_names(query, "countries"),
+        "regions": query_regions(query),
+        "granularity": query_granularity(query),
+    }
+
+
+def is_default_analysis_params(params):
+    """조건이 모두 기본값인지 (스냅샷과 같은 구간 → 사전 계산 결과를 그대로 사용)"""
+    return params == parse_analysis_params(QueryDict())
+
+
+def build_filtered_analysis(params):
+    """
+    parse_analysis_params() 조건에 해당하는 연도/지역만 읽어서 계산.
+    - 비율: 선택 국가(기본: 범죄국 세트) 출국자 / 선택 지역 전체 출국자 (%)
+    - month 단위일 때 사이버사기는 연도 자료만 있으므로 None
+    """
+    from .utils_csv_import import crime_countries, load_departures
+
+    years = list(range(params["start"], params["end"] + 1))
+    monthly = params["granularity"] == "month"
+    keys = ["year", "month"] if monthly else ["year"]
+
+    # 1) 출국자: 연도/지역은 저장소에서 걸러 읽고, 필요한 컬럼만
+    df = load_departures(years=years, regions=params["regions"], columns=[*keys, "country", "departures"])
+    if monthly:
+        df = df[df["month"] > 0]
+
+    countries = params["countries"] or crime_countries()
+    total = df.groupby(keys)["departures"].sum()
+    selected = df[df["country"].isin(countries)].groupby(keys)["departures"].sum()
+    ratio = selected.reindex(total.index, fill_value=0) / total.where(total > 0) * 100
+
+    periods = list(total.index)
+    crime_ratio = [None if r != r else float(r) for r in ratio.tolist()]   # NaN → None
+
+    # 2) 사이버사기 / 보이스피싱: 같은 연도 구간만 DB에서 집계
+    voice_qs = VoicePhishingStat.objects.filter(year__in=years)
+
+    if monthly:
+        voice = dict(((y, m), c) for y, m, c in voice_qs.values_list("year", "month", "cases"))
+        return {
+            "granularity": "month",
+            "years": [int(y) for y, _ in periods],
+            "months": [int(m) for _, m in periods],
+            "crime_ratio": crime_ratio,
+            "cyber_scam_cases": [None] * len(periods),
+            "voice_phishing_cases": [int(voice.get((int(y), int(m)), 0)) for y, m in periods],
+            "params": params,
+        }
+
+    cyber = CyberScamStat.objects.filter(year__in=years).yearly_totals_dict(category=CYBER_OCCURRENCE)
+    voice = {row["year"]: row["voice_year_total"] for row in voice_qs.yearly_totals()}
+    return {
+        "granularity": "year",
+        "years": [int(y) for y in periods],
+        "crime_ratio": crime_ratio,
+        "cyber_scam_cases": [int(cyber.get(int(y), 0)) for y in periods],
+        "voice_phishing_cases": [int(voice.get(int(y), 0)) for y in periods],
+        "params": params,
+    }
+
+
+def analysis_for_params(params):
+    """조건별 결과를 (정규화된 조건, 데이터 버전) 키로 캐시"""
+    normalized = json.dumps(params, sort_keys=True, ensure_ascii=False)
+    key = "analysis:" + hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+    version = get_data_version()
+    cache = response_cache()
+
+    data = cache.get(key, version=version)
+    if data is None:
+        data = build_filtered_analysis(params)
+        cache.set(key, data, version=version)
+    return data
+
+
+# -----------------------------
+# ✔ 추세 지표 조회 (/analysis/trends/?countries=&regions=&start=&end=&granularity=)
+# -----------------------------
+def parse_trend_params(query):
+    """
+    QueryDict → 추세 조회 조건 (잘못된 값이면 ValueError)
+    - countries 없음: 지역 합계 시리즈 / start, end 없음: 전체 기간
+    """
+    start, end = query_year_range(query, None, None)
+
+    return {
+        "start": start,
+        "end": end,
+        "countries": query_names(query, "countries"),
+        "regions": query_regions(query),
+        "granularity": query_granularity(query),
+    }
+
+
+def read_travel_trends(params):
+    """TravelTrend에서 조건에 맞는 행만 읽음 (계산 없음)"""
+    qs = TravelTrend.objects.series(
+        countries=params["countries"], regions=params["regions"], start=params["start"], end=params["end"],
+    )
+    qs = qs.yearly() if params["granularity"] == "year" else qs.monthly()
+
+    return {
+        "granularity": params["granularity"],
+        "rows": list(qs.values(*TREND_FIELDS)),
+        "params": params,
+    }
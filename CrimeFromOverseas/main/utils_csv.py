@@ -1,6 +1,6 @@
 import pandas as pd
 from django.conf import settings
-from .models import TravelStat
+from .utils_db_sync import sync_travel_stats
 
 def clean_num(x):
     if pd.isna(x):
@@ -116,15 +116,6 @@ def load_all_departure_data():
     return pd.concat(outputs, ignore_index=True)
 
 def save_to_db(df):
-    count = 0
-    for _, row in df.iterrows():
-        TravelStat.objects.update_or_create(
-            year=row["year"],
-            month=row["month"],
-            country=row["country"],
-            region=row["region"],
-            defaults={"departures": row["departures"]},
-        )
-        count += 1
-    return count
-
+    """월별 DataFrame을 TravelStat에 일괄 upsert. 반환: 처리한 행 수"""
+    result = sync_travel_stats(df)
+    return sum(result.values())
@@ -0,0 +1,142 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+from django.conf import settings
+
+# 파서 결과 형식이 바뀌면 올려서 디스크 캐시를 무효화
+PARSER_VERSION = 1
+
+DISK_FORMATS = {
+    "parquet": (".parquet", pd.read_parquet, "to_parquet"),
+    "feather": (".feather", pd.read_feather, "to_feather"),
+}
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """파일 내용의 SHA-256 (청크 단위로 읽음)"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class DepartureFrameCache:
+    """
+    파싱된 출국 long-form DataFrame 캐시 (프로세스 전역).
+    - 메모리: (경로, 지역) → (mtime, size, sha256, df), LRU로 개수 제한
+    - 디스크(선택): sha256 기준 Parquet/Feather 파일 → 워커 재시작 후에도 재사용
+
+    mtime/size가 그대로면 해시 계산 없이 바로 반환하고,
+    mtime만 바뀐 경우에는 SHA-256이 같으면 다시 파싱하지 않는다.
+    반환된 DataFrame은 캐시와 공유되므로 수정하지 말 것.
+    """
+
+    def __init__(self, max_entries=16, cache_dir=None, disk_format="parquet"):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.disk_format = disk_format if disk_format in DISK_FORMATS else None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+    # -----------------------------
+    # ✔ 조회 / 저장
+    # -----------------------------
+    def get(self, path, region_name, parser):
+        """
+        캐시된 DataFrame을 반환. 없으면 parser(path, region_name)로 만든 뒤 저장.
+        """
+        path = str(path)
+        key = (path, region_name)
+        st = os.stat(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[3]
+
+        sha = file_sha256(path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[2] == sha:
+                # 내용은 그대로 (touch 등) → mtime만 갱신
+                self._entries[key] = (st.st_mtime_ns, st.st_size, sha, entry[3])
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[3]
+
+        df = self._read_disk(sha, region_name)
+        if df is not None:
+            counter = "disk_hits"
+        else:
+            df = parser(path, region_name)
+            counter = "misses"
+            self._write_disk(sha, region_name, df)
+
+        self._put(key, (st.st_mtime_ns, st.st_size, sha, df), counter)
+        return df
+
+    def _put(self, key, entry, counter):
+        with self._lock:
+            self.stats[counter] += 1   # 통계도 항목과 같은 잠금 안에서 갱신
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    # -----------------------------
+    # ✔ 디스크 캐시 (Parquet / Feather)
+    # -----------------------------
+    def _disk_path(self, sha, region_name):
+        suffix = DISK_FORMATS[self.disk_format][0]
+        return self.cache_dir / f"{region_name}-{sha}-v{PARSER_VERSION}{suffix}"
+
+    def _read_disk(self, sha, region_name):
+        if self.cache_dir is None or self.disk_format is None:
+            return None
+
+        path = self._disk_path(sha, region_name)
+        if not path.exists():
+            return None
+
+        reader = DISK_FORMATS[self.disk_format][1]
+        try:
+            return reader(path)
+        except Exception as e:
+            print(f"⚠ 캐시 파일 읽기 실패 ({path.name}) → {e}")
+            return None
+
+    def _write_disk(self, sha, region_name, df):
+        if self.cache_dir is None or self.disk_format is None:
+            return
+
+        path = self._disk_path(sha, region_name)
+        tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+        writer = DISK_FORMATS[self.disk_format][2]
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            getattr(df, writer)(tmp_path)
+            os.replace(tmp_path, path)   # 다른 워커와 동시에 써도 안전하게
+        except Exception as e:
+            # pyarrow 미설치 등 → 메모리 캐시만 사용
+            print(f"⚠ 캐시 파일 저장 실패 ({path.name}) → {e}")
+            tmp_path.unlink(missing_ok=True)
+
+
+departure_cache = DepartureFrameCache(
+    max_entries=getattr(settings, "DEPARTURE_CACHE_SIZE", 16),
+    cache_dir=getattr(settings, "DEPARTURE_CACHE_DIR", None),
+    disk_format=getattr(settings, "DEPARTURE_CACHE_FORMAT", "parquet"),
+)
@@ -1,6 +1,13 @@
+import numpy as np
 import pandas as pd
 from django.conf import settings
-from .models import TravelStat
+from .models import CountrySet
+from .utils_db_sync import sync_travel_stats
+from .utils_csv_cache import departure_cache
+from .utils_departure_cube import DepartureCube
+from .utils_departure_store import departure_store
+from .utils_metrics import span
+from .utils_region_pool import load_regions
 
 # -----------------------------
 # ✔ 숫자 변환 함수
@@ -15,120 +22,223 @@ def clean_num(x):
         return 0
 
 
+def clean_num_column(col):
+    """clean_num()의 컬럼 단위(벡터화) 버전. 쉼표 제거, "-" → 0, 변환 실패/결측 → 0"""
+    s = (
+        col.astype("string")
+        .str.replace(",", "", regex=False)
+        .str.replace("-", "0", regex=False)
+        .str.strip()
+    )
+    return pd.to_numeric(s, errors="coerce").fillna(0).astype("int64")
+
+
 # -----------------------------
-# ✔ CSV 월별 파싱 → 연도/국가별 집계
+# ✔ KTO 원본 표 → 월별 long-form (벡터화 파싱)
 # -----------------------------
-def load_and_aggregate_csv(path, region_name):
+HEADER_ROWS = 3   # 0행: 제목, 1행: 국가명, 2행: 명수/전년대비
+
+
+def departure_columns(header):
+    """
+    헤더 3행에서 명수 열 번호와 국가명을 한 번에 선택.
+    (전년대비 제외, 0~2열은 연도/월/전체합계)
+    """
+    header_country = header.iloc[1].astype("string").str.strip()
+    header_type = header.iloc[2].astype("string").str.strip()
+
+    col_mask = (header_type == "명수") & header_country.fillna("").ne("")
+    col_mask.iloc[:3] = False
+    value_cols = col_mask[col_mask].index
+    countries = header_country[value_cols].to_numpy(dtype=object)
+    return value_cols, countries
+
+
+def parse_departure_rows(body, value_cols, countries, region_name, start_year=None):
+    """
+    데이터 행(헤더 제외)을 월별 long-form으로 변환.
+    - "YYYY년" 연도 표시는 아래 월 행들로 forward-fill (start_year: 앞 청크의 마지막 연도)
+    - "M월" 행만 남김 (누계 등 제외)
+
+    반환: (DataFrame[year, month, country, region, departures], 마지막 연도)
+    """
+    year_cell = body[0].astype("string").str.strip()
+    month_cell = body[1].astype("string").str.strip()
+
+    years = pd.to_numeric(
+        year_cell.str.extract(r"^\D*(\d+)\D*년$", expand=False), errors="coerce"
+    )
+    if start_year is not None and len(years) and pd.isna(years.iloc[0]):
+        years.iloc[0] = start_year
+    years = years.ffill()
+
+    months = pd.to_numeric(
+        month_cell.str.extract(r"^\D*(\d+)\D*월$", expand=False), errors="coerce"
+    )
 
-    df = pd.read_csv(path, header=None, encoding="utf-8-sig")
+    row_mask = years.notna() & months.notna()
 
-    # 1행: 국가명, 2행: 명수/전년대비
-    header_country = df.iloc[1]
-    header_type = df.iloc[2]
-    n_cols = df.shape[1]
+    values = body.loc[row_mask, value_cols].apply(clean_num_column)
 
-    # (col_index, country_name)
-    country_cols = []
-    for col in range(3, n_cols):
-        if str(header_type[col]).strip() != "명수":
-            continue
-        country_name = str(header_country[col]).strip()
-        if country_name.lower() == "nan" or country_name == "":
-            continue
-        country_cols.append((col, country_name))
+    # wide → long (행 우선 순서로 한 번에 펼침)
+    n_rows, n_countries = values.shape
+    df = pd.DataFrame({
+        "year": np.repeat(years[row_mask].to_numpy(dtype="int64"), n_countries),
+        "month": np.repeat(months[row_mask].to_numpy(dtype="int64"), n_countries),
+        "country": np.tile(countries, n_rows),
+        "region": region_name,
+        "departures": values.to_numpy(dtype="int64").ravel(),
+    })
 
-    print(f"[{region_name}] 감지된 국가 수:", len(country_cols))
+    last_year = years.dropna().iloc[-1] if years.notna().any() else start_year
+    return df, (int(last_year) if last_year is not None else None)
+
+
+def parse_departure_table(raw, region_name):
+    """
+    read_csv(header=None)로 읽은 KTO 지역별 원본 표 전체를 월 단위 long-form으로 변환.
+    반환 columns: [year, month, country, region, departures]
+    """
+    value_cols, countries = departure_columns(raw.iloc[:HEADER_ROWS])
+
+    print(f"[{region_name}] 감지된 국가 수:", len(countries))
+
+    df, _ = parse_departure_rows(raw.iloc[HEADER_ROWS:], value_cols, countries, region_name)
+    return df
+
+
+def iter_departure_chunks(path, region_name, chunksize=5000):
+    """
+    CSV를 chunksize 행씩 스트리밍으로 읽어 월별 long-form DataFrame을 차례로 yield.
+    파일 전체를 메모리에 올리지 않으므로 대용량 과거 추출본에도 사용 가능.
+    """
+    header = pd.read_csv(path, header=None, encoding="utf-8-sig", dtype=str, nrows=HEADER_ROWS)
+    value_cols, countries = departure_columns(header)
+
+    reader = pd.read_csv(
+        path,
+        header=None,
+        names=range(header.shape[1]),
+        encoding="utf-8-sig",
+        dtype=str,
+        skiprows=HEADER_ROWS,
+        chunksize=chunksize,
+    )
 
-    output_rows = []
     current_year = None
+    with reader:
+        for body in reader:
+            with span("csv_parse", region=region_name, rows=len(body)):
+                df, current_year = parse_departure_rows(body, value_cols, countries, region_name, current_year)
+            if len(df):
+                yield df
 
-    # -----------------------------
-    # ✔ 월별 데이터 파싱
-    # -----------------------------
-    for idx, row in df.iloc[3:].iterrows():
 
-        year_cell = str(row.iloc[0]).strip()
-        month_cell = str(row.iloc[1]).strip()
+# -----------------------------
+# ✔ CSV 월별 파싱 → 연도/국가별 집계
+# -----------------------------
+def read_departure_csv(path, region_name):
+    """CSV 파일을 읽어 월별 long-form으로 파싱 (캐시 없이)"""
+    with span("csv_read", region=region_name):
+        raw = pd.read_csv(path, header=None, encoding="utf-8-sig", dtype=str)
+    with span("csv_parse", region=region_name, rows=len(raw)):
+        return parse_departure_table(raw, region_name)
 
-        # 연도 감지
-        if year_cell.endswith("년"):
-            digits = "".join([c for c in year_cell if c.isdigit()])
-            if digits:
-                current_year = int(digits)
-            continue
 
-        if current_year is None:
-            continue
+def load_monthly_csv(path, region_name):
+    """월별 long-form DataFrame (경로/mtime/SHA-256 기준 캐시 사용)"""
+    return departure_cache.get(path, region_name, read_departure_csv)
 
-        # 월 감지
-        if not month_cell.endswith("월"):
-            continue
 
-        # 국가별 숫자 저장
-        for col, country_name in country_cols:
-            departures = clean_num(row.iloc[col])
-            output_rows.append({
-                "year": current_year,
-                "country": country_name,
-                "region": region_name,
-                "departures": departures,
-            })
+def load_and_aggregate_csv(path, region_name):
 
-    monthly_df = pd.DataFrame(output_rows)
+    monthly_df = load_monthly_csv(path, region_name)
 
     # -----------------------------
     # ✔ 월별 → 연도별 합계 변환
     # -----------------------------
     yearly_df = (
-        monthly_df.groupby(["year", "country"])
+        monthly_df.groupby(["year", "country", "region"], as_index=False)["departures"]
         .sum()
-        .reset_index()
     )
 
     return yearly_df
 
 
 # -----------------------------
-# ✔ 주요 범죄국 리스트
+# ✔ 주요 범죄국 리스트 (DB에 "crime" 국가 세트가 없을 때 기본값)
 # -----------------------------
 CRIME_COUNTRIES = [
     "중국", "미국", "영국", "인도", "독일",
     "캄보디아", "이스라엘", "몰디브", "미얀마", "필리핀"
 ]
 
-def compute_yearly_totals(df):
+
+def crime_countries():
+    """CountrySet("crime") 최신 버전의 국가 목록 (없으면 CRIME_COUNTRIES)"""
+    return CountrySet.objects.resolve(CountrySet.DEFAULT_NAME, default=CRIME_COUNTRIES)
+
+
+def compare_country_sets(data, country_sets=None):
     """
-    df: load_all_departure_data()로 만들어진 월 단위 long-form 데이터
-        columns: [year, month, country, region, departures]
+    여러 국가 세트의 연도별 합계/비율을 한 번에 계산.
+    data: long-form DataFrame 또는 DepartureCube
+    country_sets: {이름: 국가 목록} (기본: DB의 모든 CountrySet, "이름@v버전")
+
+    반환 DataFrame[set, year, set_total, year_total, ratio_percent]
+    """
+    if country_sets is None:
+        country_sets = {row.label: row.countries for row in CountrySet.objects.all()}
+
+    cube = data if isinstance(data, DepartureCube) else DepartureCube.from_frame(data)
+    totals, observed = cube.set_year_totals(country_sets)
+    year_totals = cube.yearly().sum(axis=0)
+
+    si, yi = np.nonzero(observed)
+    result = pd.DataFrame({
+        "set": np.asarray(list(country_sets), dtype=object)[si],
+        "year": cube.years[yi],
+        "set_total": totals[si, yi],
+        "year_total": year_totals[yi],
+    })
+    result["ratio_percent"] = (result["set_total"] / result["year_total"] * 100).round(3)
+    return result
+
+def compute_yearly_totals(data, countries=None):
+    """
+    data: 월 단위/연도 단위 long-form DataFrame
+          (columns: [year, (month), country, region, departures]) 또는 DepartureCube
+    countries: 범죄국 목록 (기본: CRIME_COUNTRIES, DB 설정은 crime_countries()로 넘김)
 
     반환:
       1) 전체 국가 연도별 합계
       2) 주요 범죄국 연도별 합계
       3) 특정 국가 연도별 합계를 뽑아낼 수 있는 dict
       4) 2018~2024 전체 합계
+
+    DataFrame이면 (국가, 연도, 월) 큐브로 한 번 변환한 뒤, 모든 합계를 배열 축소로 계산.
     """
+    cube = data if isinstance(data, DepartureCube) else DepartureCube.from_frame(data)
+    years = cube.years
+    yearly = cube.yearly()   # (국가, 연도)
 
     # ------------------------------
-    # ① 전체 국가 연도별 합계
+    # ① 전체 국가 연도별 합계 (원본에 행이 있는 연도만)
     # ------------------------------
-    total_by_year = (
-        df.groupby("year")["departures"]
-        .sum()
-        .reset_index()
-        .rename(columns={"departures": "year_total"})
-    )
+    seen = cube.observed.any(axis=0)
+    total_by_year = pd.DataFrame({
+        "year": years[seen],
+        "year_total": yearly.sum(axis=0)[seen],
+    })
 
     # ------------------------------
     # ② 주요 범죄국 연도별 합계
     # ------------------------------
-    crime_df = df[df["country"].isin(CRIME_COUNTRIES)]
-
-    crime_total_by_year = (
-        crime_df.groupby("year")["departures"]
-        .sum()
-        .reset_index()
-        .rename(columns={"departures": "crime_country_total"})
-    )
+    crime_totals, crime_seen = cube.set_year_totals({"crime": countries or CRIME_COUNTRIES})
+    crime_total_by_year = pd.DataFrame({
+        "year": years[crime_seen[0]],
+        "crime_country_total": crime_totals[0][crime_seen[0]],
+    })
 
     crime_ratio_by_year = crime_total_by_year.merge(total_by_year, on="year")
     crime_ratio_by_year["crime_ratio_percent"] = (
@@ -137,13 +247,15 @@ def compute_yearly_totals(df):
     ).round(3)   # 소수점 3자리까지
 
     # ------------------------------
-    # ③ 국가별 연도별 합계 출력용 dict
+    # ③ 국가별 연도별 합계 출력용 DF (지역 합산)
     # ------------------------------
-    country_group = (
-        df.groupby(["country", "year"])["departures"]
-        .sum()
-        .reset_index()
-    )
+    names, country_totals, country_seen = cube.yearly_by_country()
+    ci, yi = np.nonzero(country_seen)
+    country_group = pd.DataFrame({
+        "country": names[ci],
+        "year": years[yi],
+        "departures": country_totals[ci, yi],
+    })
 
     # 예: 국가별 전체 데이터는 이렇게 접근 가능
     # country_group[country_group["country"] == "중국"]
@@ -172,8 +284,9 @@ def compute_yearly_totals(df):
 # -----------------------------
 # ✔ CSV 전체 로드 & 연도별/범죄국 집계
 # -----------------------------
-def load_all_departure_data():
-    files = {
+def departure_files():
+    """지역명 → CSV 경로"""
+    return {
         "asia": settings.ASIA_CSV,
         "europe": settings.EUROPE_CSV,
         "africa": settings.AFRICA_CSV,
@@ -181,45 +294,105 @@ def load_all_departure_data():
         "oceania": settings.OCEANIA_CSV,
     }
 
-    outputs = []
 
-    for region, path in files.items():
-        print(f"=== {region.upper()} CSV 로드 시작 ===")
-        try:
-            df = load_and_aggregate_csv(path, region)
+def load_departure_regions(workers=None):
+    """
+    5개 지역 CSV를 로드한 결과(지역별 DataFrame/소요 시간/실패 목록)를 반환.
+    workers가 2 이상이면 프로세스 풀로 동시에 파싱 (기본값: settings.DEPARTURE_LOAD_WORKERS)
+    """
+    if workers is None:
+        workers = getattr(settings, "DEPARTURE_LOAD_WORKERS", 1)
 
-            outputs.append(df)
-        except Exception as e:
-            print(f"⚠ {region} CSV 로드 실패 → {e}")
+    return load_regions(departure_files(), workers=workers)
 
-    if not outputs:
-        return None
 
-    df = pd.concat(outputs, ignore_index=True)
+def load_all_departure_data(workers=None):
+    store = departure_store()
+    cube = store.cube() if store is not None and store.is_current(departure_files()) else None
+
+    if cube is not None:
+        # 저장소가 최신이면 CSV 파싱 없이 memmap 큐브에서 바로 집계
+        df = cube.to_frame()
+    else:
+        result = load_departure_regions(workers)
+
+        for region, error in result["errors"].items():
+            print(f"⚠ {region} CSV 로드 실패 → {error}")
+
+        outputs = list(result["frames"].values())
+        if not outputs:
+            return None
+
+        df = pd.concat(outputs, ignore_index=True)
 
     # 🔥 새 분석 기능 추가
-    report = compute_yearly_totals(df)
+    with span("aggregate", source="store" if cube is not None else "csv"):
+        report = compute_yearly_totals(cube if cube is not None else df, crime_countries())
 
     return df, report["total_by_year"], report["crime_total_by_year"], report["crime_ratio_by_year"], report["total_2018_2024"]
 
 
+def load_departure_cube(workers=None):
+    """(국가, 연도, 월) 큐브. 저장소가 최신이면 memmap, 아니면 지역 CSV를 파싱해서 생성 (없으면 None)"""
+    store = departure_store()
+    if store is not None and store.is_current(departure_files()):
+        cube = store.cube()
+        if cube is not None:
+            return cube
+
+    frames = load_departure_regions(workers)["frames"]
+    if not frames:
+        return None
+    return DepartureCube.from_frame(pd.concat(frames.values(), ignore_index=True))
+
+
+# -----------------------------
+# ✔ Parquet 저장소 (필요한 연도/국가만 읽기)
+# -----------------------------
+def load_departures(years=None, countries=None, regions=None, months=None, columns=None):
+    """
+    월별 long-form에서 조건에 맞는 행/컬럼만 반환.
+    - 저장소가 최신이면 해당 파티션/row group만 읽음 (CSV 파싱 없음)
+    - 저장소가 없거나 원본 CSV가 바뀌었으면 CSV를 파싱한 뒤 같은 조건으로 거름
+    """
+    files = departure_files()
+    store = departure_store()
+    if store is not None and store.is_current(files):
+        return store.read(years=years, countries=countries, regions=regions, months=months, columns=columns)
+
+    frames = [
+        load_monthly_csv(path, region)
+        for region, path in files.items()
+        if path and (regions is None or region in regions)
+    ]
+    if not frames:
+        return pd.DataFrame(columns=list(columns or ["year", "month", "country", "region", "departures"]))
+
+    df = pd.concat(frames, ignore_index=True)
+    mask = pd.Series(True, index=df.index)
+    for name, values in (("year", years), ("month", months), ("country", countries)):
+        if values is not None:
+            mask &= df[name].isin(list(values))
+
+    df = df[mask]
+    if columns is not None:
+        df = df.loc[:, list(columns)]
+    return df.reset_index(drop=True)
+
+
 # -----------------------------
 # ✔ DB 저장 (연도별 데이터만 저장)
 # -----------------------------
 def save_yearly_to_db(df):
-    count = 0
-    for _, row in df.iterrows():
-        TravelStat.objects.update_or_create(
-            year=row["year"],
-            month=0,
-            country=row["country"],
-            region=row["region"],     # 🔥 region은 모델에 있으므로 추가
-            defaults={
-                "departures": row["departures"],
-                "ratio": None,
-            }
-        )
-        count += 1
-
-    print(f"\n✔ 연도별 데이터 {count}건 저장 완료!")
-    return count
+    """
+    연도별 DataFrame을 TravelStat(month=0)에 일괄 upsert.
+    반환: {"inserted": n, "updated": n, "unchanged": n}
+    """
+    yearly = df.drop(columns=["month"], errors="ignore")
+    result = sync_travel_stats(yearly)
+
+    print(
+        f"\n✔ 연도별 데이터 저장 완료! "
+        f"(신규 {result['inserted']} / 갱신 {result['updated']} / 변경없음 {result['unchanged']})"
+    )
+    return result
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import math
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import TravelStat, SyncState
+from .utils_metrics import span
+
+# -----------------------------
+# ✔ TravelStat 유니크 키 / 갱신 대상 필드
+# -----------------------------
+TRAVEL_KEY_FIELDS = ("region", "country", "year", "month")
+TRAVEL_VALUE_FIELDS = ("departures", "ratio")
+
+
+def bulk_sync(model, rows, key_fields, value_fields, batch_size=500):
+    """
+    rows(dict 리스트)를 기존 DB 키와 비교한 뒤 한 번에 upsert.
+    - 키가 없으면 insert, 값이 다르면 update, 같으면 건너뜀
+    - bulk_create(update_conflicts=True)를 batch 단위로, 하나의 atomic 블록 안에서 실행
+
+    반환: {"inserted": n, "updated": n, "unchanged": n}
+    """
+    key_fields = list(key_fields)
+    value_fields = list(value_fields)
+
+    # 같은 키가 여러 번 들어오면 마지막 값 사용
+    incoming = {}
+    for row in rows:
+        key = tuple(row[f] for f in key_fields)
+        incoming[key] = row
+
+    result = {"inserted": 0, "updated": 0, "unchanged": 0}
+    if not incoming:
+        return result
+
+    # 들어온 키 필드 값들로 범위를 좁혀서 기존 값 조회
+    # (청크 단위로 호출하면 조회량도 청크 크기에 비례)
+    lookup = {
+        f"{field}__in": {key[i] for key in incoming}
+        for i, field in enumerate(key_fields)
+    }
+    existing = {
+        tuple(values[:len(key_fields)]): tuple(values[len(key_fields):])
+        for values in (
+            model.objects
+            .filter(**lookup)
+            .values_list(*key_fields, *value_fields)
+            .iterator(chunk_size=2000)
+        )
+    }
+
+    to_write = []
+    for key, row in incoming.items():
+        new_values = tuple(row.get(f) for f in value_fields)
+        old_values = existing.get(key)
+
+        if old_values is None:
+            result["inserted"] += 1
+        elif old_values != new_values:
+            result["updated"] += 1
+        else:
+            result["unchanged"] += 1
+            continue
+
+        to_write.append(model(**{f: row.get(f) for f in key_fields + value_fields}))
+
+    with span("db_write", model=model.__name__, rows=len(to_write)), transaction.atomic():
+        model.objects.bulk_create(
+            to_write,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=key_fields,
+            update_fields=value_fields,
+        )
+
+    return result
+
+
+# -----------------------------
+# ✔ 동기화 기록(SyncState) 기반 조건부 저장
+# -----------------------------
+class RecordsDigest:
+    """
+    행 순서와 무관한 내용 해시 (fields 값만 사용)
+    - 행마다 sha256을 구해 2**256 나머지 합으로 누적 → 페이지가 도착할 때마다 update 가능
+    """
+    MODULUS = 1 << 256
+
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self.total = 0
+        self.count = 0
+
+    def update(self, records):
+        for r in records:
+            row = json.dumps([r.get(f) for f in self.fields], ensure_ascii=False)
+            self.total = (self.total + int.from_bytes(hashlib.sha256(row.encode("utf-8")).digest(), "big")) % self.MODULUS
+            self.count += 1
+
+    def hexdigest(self):
+        return f"{self.total:064x}"
+
+
+def records_hash(records, fields):
+    """records 전체의 RecordsDigest 값"""
+    digest = RecordsDigest(fields)
+    digest.update(records)
+    return digest.hexdigest()
+
+
+def sync_with_ledger(source, model, pages, key_fields, value_fields, force=False):
+    """
+    pages(레코드 리스트의 iterable)를 도착하는 대로 bulk_sync로 저장하면서 내용 해시를 누적.
+    - 전체를 하나의 트랜잭션으로 실행
+    - 마지막 해시가 SyncState에 기록된 직전 해시와 같으면 트랜잭션을 롤백하고
+      조회 시각만 갱신 (skipped=True, force=True면 항상 커밋)
+    - 다르면 신규/변경 키만 저장된 상태로 커밋하고 기록 갱신
+    """
+    now = timezone.now()
+    state, _ = SyncState.objects.get_or_create(source=source)
+    digest = RecordsDigest(list(key_fields) + list(value_fields))
+    result = {"inserted": 0, "updated": 0, "unchanged": 0}
+
+    with transaction.atomic():
+        for records in pages:
+            digest.update(records)
+            page_result = bulk_sync(model, records, key_fields, value_fields)
+            for k in result:
+                result[k] += page_result[k]
+
+        skipped = state.content_hash == digest.hexdigest() and not force
+        if skipped:
+            transaction.set_rollback(True)   # 내용이 그대로면 이번 쓰기는 버림
+        else:
+            state.last_fetched_at = now
+            state.row_count = digest.count
+            state.content_hash = digest.hexdigest()
+            if result["inserted"] or result["updated"]:
+                state.last_changed_at = now
+            state.save()
+
+    if skipped:
+        state.last_fetched_at = now
+        state.save(update_fields=["last_fetched_at"])
+        return {"inserted": 0, "updated": 0, "unchanged": digest.count, "skipped": True}
+
+    result["skipped"] = False
+    return result
+
+
+def _clean_ratio(value):
+    """NaN/None → None, 나머지는 float"""
+    if value is None:
+        return None
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def sync_travel_stats(df, batch_size=500):
+    """
+    [year, month, country, region, departures(, ratio)] DataFrame을 TravelStat에 upsert.
+    month 컬럼이 없으면 연도별 합계(month=0)로 저장.
+    ratio 컬럼이 없으면 departures만 비교/갱신 (추세 단계에서 채운 ratio를 덮어쓰지 않음)
+    """
+    has_month = "month" in df.columns
+    has_ratio = "ratio" in df.columns
+
+    rows = [
+        {
+            "region": str(rec["region"]),
+            "country": str(rec["country"]),
+            "year": int(rec["year"]),
+            "month": int(rec["month"]) if has_month else 0,
+            "departures": int(rec["departures"]),
+            "ratio": _clean_ratio(rec["ratio"]) if has_ratio else None,
+        }
+        for rec in df.to_dict(orient="records")
+    ]
+
+    return bulk_sync(
+        TravelStat,
+        rows,
+        key_fields=TRAVEL_KEY_FIELDS,
+        value_fields=TRAVEL_VALUE_FIELDS if has_ratio else ("departures",),
+        batch_size=batch_size,
+    )
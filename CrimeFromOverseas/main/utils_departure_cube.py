@@ -0,0 +1,172 @@
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 파일 이름이 "_"로 시작하면 Parquet 데이터셋 탐색에서 제외됨 (저장소 디렉터리에 같이 둠)
+CUBE_INDEX = "_cube.json"
+CUBE_VALUES = "_cube_values.npy"
+CUBE_OBSERVED = "_cube_observed.npy"
+
+# month 축: 0 = 월 구분 없는 연도 합계 행 (TravelStat.month=0과 같은 규칙), 1~12 = 월
+N_MONTHS = 13
+
+
+class DepartureCube:
+    """
+    출국자 수를 (지역·국가, 연도, 월) int64 배열 하나로 보관.
+    - values:   shape (국가 수, 연도 수, 13)
+    - observed: shape (국가 수, 연도 수), 원본에 행이 있었던 칸 (0명과 "데이터 없음" 구분)
+    - regions / countries: 첫 번째 축의 라벨 (같은 국가명이 여러 지역에 있을 수 있음)
+
+    save()로 .npy에 쓰고 open()으로 읽기 전용 memmap으로 열면
+    여러 워커 프로세스가 OS 페이지 캐시를 그대로 공유한다 (복사 없음).
+    """
+
+    def __init__(self, values, observed, regions, countries, year0):
+        self.values = values
+        self.observed = observed
+        self.regions = np.asarray(regions, dtype=object)
+        self.countries = np.asarray(countries, dtype=object)
+        self.year0 = int(year0)
+
+        # 국가명 → 정수 코드 (지역이 달라도 같은 국가명이면 같은 코드, 이름순)
+        self.country_names, self.country_codes = np.unique(self.countries.astype(str), return_inverse=True)
+
+    # -----------------------------
+    # ✔ 생성 / 저장 / memmap 열기
+    # -----------------------------
+    @classmethod
+    def from_frame(cls, df):
+        """
+        long-form DataFrame[year, (month), country, region, departures] → 큐브.
+        month 컬럼이 없으면(연도별 집계) month=0 칸에 넣는다.
+        """
+        # (지역, 국가) 쌍 → 첫 번째 축 번호 (컬럼별로 factorize 후 정수 쌍을 다시 factorize)
+        region_codes, region_names = pd.factorize(df["region"])
+        country_codes, country_names = pd.factorize(df["country"])
+        codes, pairs = pd.factorize(region_codes * len(country_names) + country_codes)
+
+        years = df["year"].to_numpy(dtype="int64")
+        year0 = int(years.min()) if len(years) else 0
+        n_years = int(years.max()) - year0 + 1 if len(years) else 0
+        year_idx = years - year0
+
+        if "month" in df.columns:
+            month_idx = df["month"].to_numpy(dtype="int64")
+        else:
+            month_idx = np.zeros(len(df), dtype="int64")
+
+        values = np.zeros((len(pairs), n_years, N_MONTHS), dtype="int64")
+        np.add.at(values, (codes, year_idx, month_idx), df["departures"].to_numpy(dtype="int64"))
+
+        observed = np.zeros((len(pairs), n_years), dtype=bool)
+        observed[codes, year_idx] = True
+
+        return cls(
+            values,
+            observed,
+            np.asarray(region_names, dtype=object)[pairs // len(country_names)],
+            np.asarray(country_names, dtype=object)[pairs % len(country_names)],
+            year0,
+        )
+
+    def save(self, root):
+        """root 디렉터리에 index(json) + values/observed(.npy) 저장"""
+        root = Path(root)
+        np.save(root / CUBE_VALUES, self.values)
+        np.save(root / CUBE_OBSERVED, self.observed)
+        index = {
+            "year0": self.year0,
+            "regions": self.regions.tolist(),
+            "countries": self.countries.tolist(),
+        }
+        (root / CUBE_INDEX).write_text(json.dumps(index, ensure_ascii=False), encoding="utf-8")
+
+    @classmethod
+    def open(cls, root):
+        """save()로 만든 큐브를 읽기 전용 memmap으로 열기 (없으면 None)"""
+        root = Path(root)
+        if not all(os.path.exists(root / name) for name in (CUBE_INDEX, CUBE_VALUES, CUBE_OBSERVED)):
+            return None
+
+        index = json.loads((root / CUBE_INDEX).read_text(encoding="utf-8"))
+        return cls(
+            np.load(root / CUBE_VALUES, mmap_mode="r"),
+            np.load(root / CUBE_OBSERVED, mmap_mode="r"),
+            index["regions"],
+            index["countries"],
+            index["year0"],
+        )
+
+    # -----------------------------
+    # ✔ 조회 (모두 배열 축소 연산)
+    # -----------------------------
+    @property
+    def years(self):
+        return np.arange(self.year0, self.year0 + self.values.shape[1], dtype="int64")
+
+    def yearly(self):
+        """(국가, 연도) 연간 합계"""
+        return self.values.sum(axis=2)
+
+    def membership(self, country_sets):
+        """
+        country_sets: {이름: 국가 목록}
+        반환: (세트 수, 첫 번째 축 길이) bool 행렬. 국가명 비교는 세트당 한 번(고유 국가 수만큼)만 하고
+        행 단위 판정은 정수 코드 인덱싱으로 처리.
+        """
+        table = np.zeros((len(country_sets), len(self.country_names)), dtype=bool)
+        for i, countries in enumerate(country_sets.values()):
+            table[i] = np.isin(self.country_names, list(countries))
+        return table[:, self.country_codes]
+
+    def country_mask(self, countries):
+        return self.membership({"_": countries})[0]
+
+    def set_year_totals(self, country_sets):
+        """
+        여러 국가 세트의 연도별 합계를 한 번에 계산 (membership 행렬 × 연간 합계 행렬).
+        반환: ((세트, 연도) 합계, (세트, 연도) observed)
+        """
+        member = self.membership(country_sets)
+        totals = member.astype("int64") @ self.yearly()
+        observed = (member.astype("int64") @ self.observed.astype("int64")) > 0
+        return totals, observed
+
+    def year_totals(self, countries=None):
+        """연도별 합계 (countries를 주면 해당 국가만)"""
+        yearly = self.yearly()
+        if countries is not None:
+            yearly = yearly[self.country_mask(countries)]
+        return yearly.sum(axis=0)
+
+    def country_series(self, country):
+        """한 국가의 (연도, 월) 배열 (여러 지역에 있으면 합산)"""
+        return self.values[self.country_mask([country])].sum(axis=0)
+
+    def yearly_by_country(self):
+        """
+        지역을 합친 국가별 연간 합계.
+        반환: (국가명 배열(정렬), (국가, 연도) 합계, (국가, 연도) observed)
+        """
+        names, codes = self.country_names, self.country_codes
+
+        totals = np.zeros((len(names), self.values.shape[1]), dtype="int64")
+        np.add.at(totals, codes, self.yearly())
+
+        observed = np.zeros(totals.shape, dtype=bool)
+        np.logical_or.at(observed, codes, self.observed)
+        return names, totals, observed
+
+    def to_frame(self):
+        """연도별 long-form DataFrame[year, country, region, departures] (원본에 있던 칸만)"""
+        ci, yi = np.nonzero(self.observed)
+        return pd.DataFrame({
+            "year": self.years[yi],
+            "country": self.countries[ci],
+            "region": self.regions[ci],
+            "departures": self.yearly()[ci, yi],
+        })
@@ -0,0 +1,217 @@
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+from django.conf import settings
+
+from .utils_csv_cache import file_sha256
+from .utils_departure_cube import DepartureCube
+from .utils_metrics import span
+
+# 저장 형식(컬럼/파티션/타입, 큐브 배열)이 바뀌면 올림 → 기존 저장소는 다시 빌드해야 사용
+STORE_SCHEMA_VERSION = 2
+STORE_META = "_store.json"
+
+# 파티션 키 (디렉터리: region=asia/year=2019/part-0.parquet)
+PARTITION_COLUMNS = ("region", "year")
+STORE_COLUMNS = ("year", "month", "country", "region", "departures")
+
+
+def _arrow():
+    """pyarrow는 저장소를 실제로 쓸 때만 import (선택 의존성)"""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    return pa, ds
+
+
+class DepartureStore:
+    """
+    출국자 월별 long-form 데이터를 Parquet 데이터셋으로 저장/조회.
+    - 지역/연도(hive 파티션)로 나누고, 파일 안은 국가/월 순으로 정렬
+      → 연도/지역 조건은 디렉터리 단위로, 국가 조건은 row group 통계로 건너뜀
+    - 같은 디렉터리에 (국가, 연도, 월) 큐브(.npy)도 저장 → cube()로 memmap 조회
+    - _store.json에 스키마 버전과 원본 CSV(mtime, size, SHA-256)를 기록
+      → 원본이 바뀌었거나 버전이 다르면 is_current()가 False
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    # -----------------------------
+    # ✔ 메타 정보
+    # -----------------------------
+    def meta(self):
+        path = self.root / STORE_META
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except ValueError as e:
+            print(f"⚠ 저장소 메타 파일 읽기 실패 ({path}) → {e}")
+            return None
+
+    def _write_meta(self, meta):
+        """_store.json 교체 (임시 파일에 쓴 뒤 os.replace)"""
+        path = self.root / STORE_META
+        tmp = path.with_name(f"{STORE_META}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def is_current(self, files):
+        """
+        files({region: path})가 저장소를 만들 때와 같고 스키마 버전도 같으면 True
+        mtime/size만 바뀌고 내용(SHA-256)이 같으면 새 mtime/size를 메타에 기록 → 다음부터 해시 생략
+        """
+        meta = self.meta()
+        if not meta or meta.get("schema_version") != STORE_SCHEMA_VERSION:
+            return False
+
+        sources = meta.get("sources", {})
+        if set(sources) != {r for r, p in files.items() if p}:
+            return False
+
+        touched = False
+        for region, path in files.items():
+            if not path:
+                continue
+            src = sources[region]
+            try:
+                st = os.stat(path)
+            except OSError:
+                return False
+            if (st.st_mtime_ns, st.st_size) == (src["mtime_ns"], src["size"]):
+                continue
+            # mtime만 바뀐 경우(touch, git checkout 등) → 내용 해시로 다시 확인
+            if file_sha256(path) != src["sha256"]:
+                return False
+            src["mtime_ns"], src["size"] = st.st_mtime_ns, st.st_size
+            touched = True
+
+        if touched:
+            try:
+                self._write_meta(meta)
+            except OSError as e:
+                print(f"⚠ 저장소 메타 갱신 실패 ({self.root}) → {e}")
+        return True
+
+    # -----------------------------
+    # ✔ 빌드 (CSV → Parquet 데이터셋)
+    # -----------------------------
+    def build(self, files, parser):
+        """
+        files: {region: path}, parser(path, region) → 월별 long-form DataFrame
+        임시 디렉터리에 전부 쓴 뒤 한 번에 교체 (읽는 쪽은 이전/새 저장소 중 하나만 봄)
+        """
+        pa, ds = _arrow()
+
+        frames, sources = [], {}
+        for region, path in files.items():
+            if not path:
+                continue
+            st = os.stat(path)
+            sources[region] = {
+                "path": str(path),
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "sha256": file_sha256(path),
+            }
+            frames.append(parser(path, region))
+
+        df = (
+            pd.concat(frames, ignore_index=True)
+            .loc[:, list(STORE_COLUMNS)]
+            .sort_values(["region", "year", "country", "month"], kind="stable")
+        )
+        table = pa.Table.from_pandas(df, schema=self.schema(), preserve_index=False)
+
+        tmp = self.root.with_name(f"{self.root.name}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        ds.write_dataset(
+            table,
+            tmp,
+            format="parquet",
+            partitioning=self.partitioning(),
+            basename_template="part-{i}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+
+        DepartureCube.from_frame(df).save(tmp)
+
+        meta = {
+            "schema_version": STORE_SCHEMA_VERSION,
+            "built_at": datetime.now(timezone.utc).isoformat(),
+            "rows": len(df),
+            "sources": sources,
+        }
+        (tmp / STORE_META).write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        old = self.root.with_name(f"{self.root.name}.{os.getpid()}.old")
+        if self.root.exists():
+            os.replace(self.root, old)
+        os.replace(tmp, self.root)
+        shutil.rmtree(old, ignore_errors=True)
+        return meta
+
+    def cube(self):
+        """저장소에 같이 만든 큐브를 읽기 전용 memmap으로 (없으면 None)"""
+        return DepartureCube.open(self.root)
+
+    # -----------------------------
+    # ✔ 조회 (컬럼 선택 + 조건 pushdown)
+    # -----------------------------
+    @staticmethod
+    def schema():
+        pa, _ = _arrow()
+        return pa.schema([
+            ("year", pa.int64()),
+            ("month", pa.int64()),
+            ("country", pa.string()),
+            ("region", pa.string()),
+            ("departures", pa.int64()),
+        ])
+
+    def partitioning(self):
+        pa, ds = _arrow()
+        schema = self.schema()
+        return ds.partitioning(
+            pa.schema([schema.field(name) for name in PARTITION_COLUMNS]),
+            flavor="hive",
+        )
+
+    def dataset(self):
+        _, ds = _arrow()
+        return ds.dataset(
+            self.root,
+            schema=self.schema(),
+            format="parquet",
+            partitioning=self.partitioning(),   # _store.json은 기본 ignore_prefixes로 제외
+        )
+
+    def read(self, years=None, countries=None, regions=None, months=None, columns=None):
+        """
+        필요한 연도/국가/지역/월과 컬럼만 읽어 DataFrame으로 반환.
+        years/countries/regions/months: 값 목록 (None이면 전체)
+        columns: 읽을 컬럼 목록 (None이면 STORE_COLUMNS 전체)
+        """
+        _, ds = _arrow()
+
+        filt = None
+        for name, values in (("year", years), ("month", months), ("country", countries), ("region", regions)):
+            if values is None:
+                continue
+            expr = ds.field(name).isin(list(values))
+            filt = expr if filt is None else filt & expr
+
+        columns = list(columns or STORE_COLUMNS)
+        with span("store_read", columns=columns, filtered=filt is not None):
+            table = self.dataset().to_table(columns=columns, filter=filt)
+            return table.to_pandas().loc[:, columns].reset_index(drop=True)
+
+
+def departure_store():
+    """settings.DEPARTURE_STORE_DIR 기준 저장소 (설정이 없으면 None)"""
+    root = getattr(settings, "DEPARTURE_STORE_DIR", None)
+    return DepartureStore(root) if root else None
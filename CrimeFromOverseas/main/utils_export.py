@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+import zlib
+
+from .models import TravelStat
+from .utils_analysis import query_int, query_names, query_regions, query_year_range
+
+EXPORT_FIELDS = ("region", "country", "year", "month", "departures", "ratio")
+EXPORT_FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+}
+
+# 한 번에 DB에서 가져올 행 수 / 한 번에 내보낼 행 수
+EXPORT_CHUNK_SIZE = 2000
+
+
+def parse_export_params(query):
+    """
+    /export/travel/ 파라미터 (잘못된 값이면 ValueError)
+    - format: ndjson(기본) / csv
+    - gzip: 1이면 gzip 압축
+    - start, end: 연도 범위 / month: 0(연도 합계)~12
+    - regions, countries: 쉼표 구분 또는 여러 번 지정
+    """
+    fmt = query.get("format") or "ndjson"
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"format은 {' / '.join(EXPORT_FORMATS)} 중 하나여야 합니다: {fmt}")
+
+    start, end = query_year_range(query, None, None)
+    return {
+        "format": fmt,
+        "gzip": query.get("gzip") in ("1", "true"),
+        "start": start,
+        "end": end,
+        "month": query_int(query, "month", None, 0, 12),
+        "regions": query_regions(query),
+        "countries": query_names(query, "countries"),
+    }
+
+
+def export_queryset(params):
+    """조건에 맞는 TravelStat 행 (값 튜플, 유니크 키 순서)"""
+    qs = TravelStat.objects.all()
+    if params["start"] is not None:
+        qs = qs.filter(year__gte=params["start"])
+    if params["end"] is not None:
+        qs = qs.filter(year__lte=params["end"])
+    if params["month"] is not None:
+        qs = qs.filter(month=params["month"])
+    if params["regions"]:
+        qs = qs.filter(region__in=params["regions"])
+    if params["countries"]:
+        qs = qs.filter(country__in=params["countries"])
+
+    return qs.order_by("region", "country", "year", "month").values_list(*EXPORT_FIELDS)
+
+
+def _batched(rows, size=EXPORT_CHUNK_SIZE):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_ndjson(rows):
+    """행 튜플 → NDJSON 텍스트 (EXPORT_CHUNK_SIZE 행씩)"""
+    for batch in _batched(rows):
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False) + "\n"
+            for row in batch
+        )
+
+
+def iter_csv(rows):
+    """행 튜플 → CSV 텍스트 (헤더 포함, EXPORT_CHUNK_SIZE 행씩)"""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    writer.writerow(EXPORT_FIELDS)
+    yield buf.getvalue()
+
+    for batch in _batched(rows):
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(batch)
+        yield buf.getvalue()
+
+
+def iter_gzip(chunks):
+    """텍스트 청크 → gzip 바이트 스트림"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(params):
+    """
+    (본문 이터레이터, content_type, 파일명)
+    queryset.iterator()로 EXPORT_CHUNK_SIZE 행씩 가져오므로 전체 행 수와 관계없이 메모리 일정
+    """
+    rows = export_queryset(params).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    content_type, ext = EXPORT_FORMATS[params["format"]]
+    chunks = iter_ndjson(rows) if params["format"] == "ndjson" else iter_csv(rows)
+
+    filename = f"travel.{ext}"
+    if params["gzip"]:
+        # 압축 파일 그대로 내려받도록 Content-Encoding 대신 application/gzip
+        return iter_gzip(chunks), "application/gzip", filename + ".gz"
+    return chunks, content_type, filename
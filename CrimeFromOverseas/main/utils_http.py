@@ -0,0 +1,260 @@
+import asyncio
+import itertools
+import json
+import math
+import queue
+import threading
+
+from django.conf import settings
+
+from .utils_metrics import span
+
+# requests / urllib3는 Session을 처음 만들 때 import
+# (api_client를 import하는 것만으로 워커 부팅 경로에 끌려오지 않도록)
+
+# 재시도 대상 상태 코드 (요청 과다 / 서버 오류)
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def build_session(max_retries=3, backoff=0.5, pool_size=10):
+    """keep-alive 연결 풀 + 재시도(지수 backoff)가 설정된 requests.Session"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """프로세스 전역 공유 Session (처음 호출 시 생성)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session(
+                    max_retries=getattr(settings, "API_MAX_RETRIES", 3),
+                    backoff=getattr(settings, "API_BACKOFF", 0.5),
+                )
+    return _session
+
+
+def parse_json_response(res):
+    """최상위 JSON 파싱 (Content-Type이 이상해도 본문으로 한 번 더 시도)"""
+    try:
+        return res.json()
+    except ValueError:
+        return json.loads(res.text)
+
+
+class PublicDataClient:
+    """
+    공공데이터포털(odcloud) API 클라이언트
+    - 공유 Session으로 keep-alive / TLS 재사용
+    - 명시적 timeout, 재시도는 Session 어댑터가 처리
+    - totalCount / matchCount 기준으로 모든 페이지 자동 조회
+    """
+
+    def __init__(self, base_url, endpoint, service_key=None, per_page=100, timeout=None, session=None):
+        self.url = f"{base_url}{endpoint}"
+        self.service_key = service_key if service_key is not None else settings.API_KEY
+        self.per_page = per_page
+        self.timeout = timeout or getattr(settings, "API_TIMEOUT", (3.05, 15))
+        self.session = session or get_session()
+
+    def params(self, page):
+        return {
+            "page": page,
+            "perPage": self.per_page,
+            "serviceKey": self.service_key,  # 공통 키
+            "returnType": "JSON",
+        }
+
+    def fetch_page(self, page=1):
+        """한 페이지의 원본 JSON"""
+        with span("api_fetch", url=self.url, page=page):
+            res = self.session.get(self.url, params=self.params(page), timeout=self.timeout)
+            res.raise_for_status()
+            return parse_json_response(res)
+
+    @staticmethod
+    def page_rows(raw):
+        """{"data": [...]} 이거나 그냥 [...] 인 응답에서 행 목록만 꺼냄"""
+        if isinstance(raw, dict):
+            return raw.get("data", [])
+        if isinstance(raw, list):
+            return raw
+        return []
+
+    def page_count(self, raw):
+        """첫 페이지 응답의 matchCount(없으면 totalCount)로 전체 페이지 수 계산"""
+        if not isinstance(raw, dict):
+            return 1
+        total = raw.get("matchCount", raw.get("totalCount"))
+        try:
+            total = int(total)
+        except (TypeError, ValueError):
+            return 1
+        return max(1, math.ceil(total / self.per_page))
+
+    def iter_pages(self):
+        """페이지별 행 목록을 순서대로 yield"""
+        first = self.fetch_page(1)
+        yield self.page_rows(first)
+
+        for page in range(2, self.page_count(first) + 1):
+            rows = self.page_rows(self.fetch_page(page))
+            if not rows:
+                break
+            yield rows
+
+    def fetch_all(self):
+        """모든 페이지의 행을 하나의 리스트로"""
+        rows = []
+        for page_rows in self.iter_pages():
+            rows.extend(page_rows)
+        return rows
+
+
+# -----------------------------
+# ✔ 비동기 동시 페이지 조회 (httpx, 선택 의존성)
+# -----------------------------
+_PAGES_DONE = object()
+
+
+async def _afetch_page(http, client, page, max_retries, backoff):
+    """httpx로 한 페이지 조회. 재시도 대상 상태 코드/연결 오류는 backoff 후 재시도."""
+    import httpx
+
+    for attempt in range(max_retries + 1):
+        try:
+            with span("api_fetch", url=client.url, page=page, attempt=attempt):
+                res = await http.get(client.url, params=client.params(page))
+            if res.status_code not in RETRY_STATUS or attempt == max_retries:
+                res.raise_for_status()
+                return parse_json_response(res)
+        except httpx.TransportError:
+            if attempt == max_retries:
+                raise
+        await asyncio.sleep(backoff * (2 ** attempt))
+
+
+async def _aput(out, item):
+    """큐가 가득 차 있으면 소비자가 꺼낼 때까지 기다림 (이벤트 루프는 막지 않음)"""
+    while True:
+        try:
+            out.put_nowait(item)
+            return
+        except queue.Full:
+            await asyncio.sleep(0.01)
+
+
+async def _afetch_pages(client, concurrency, out):
+    """
+    첫 페이지로 전체 페이지 수를 구한 뒤 나머지를 최대 concurrency개씩 동시에 조회.
+    결과를 큐에 넣은 뒤에야 다음 페이지를 요청하므로 소비자가 느리면 조회도 같이 늦춰짐
+    """
+    import httpx
+
+    max_retries = getattr(settings, "API_MAX_RETRIES", 3)
+    backoff = getattr(settings, "API_BACKOFF", 0.5)
+    connect, read = client.timeout if isinstance(client.timeout, tuple) else (client.timeout,) * 2
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=httpx.Timeout(read, connect=connect), limits=limits) as http:
+        first = await _afetch_page(http, client, 1, max_retries, backoff)
+        await _aput(out, client.page_rows(first))
+
+        pages = iter(range(2, client.page_count(first) + 1))
+        pending = set()
+        try:
+            while True:
+                for page in itertools.islice(pages, concurrency - len(pending)):
+                    pending.add(asyncio.create_task(_afetch_page(http, client, page, max_retries, backoff)))
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    await _aput(out, client.page_rows(task.result()))
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+async def _afetch_pages_until_stopped(client, concurrency, out, stop):
+    """stop이 설정되면 (소비자가 멈춤) 진행 중인 조회를 취소"""
+    fetch = asyncio.create_task(_afetch_pages(client, concurrency, out))
+    while not fetch.done():
+        if stop.is_set():
+            fetch.cancel()
+        await asyncio.wait({fetch}, timeout=0.05)
+    return fetch.result()
+
+
+def iter_pages_concurrent(client, concurrency=4):
+    """
+    페이지별 행 목록을 도착하는 순서대로 yield (페이지 순서는 보장하지 않음).
+    - 이벤트 루프는 별도 스레드에서 돌리고, 결과는 크기 제한 큐(concurrency × 2)로 넘겨받음
+      → 호출한 쪽(동기 스레드)에서 바로 ORM으로 저장할 수 있고, 메모리에 쌓이는 페이지 수도 제한됨
+    - 호출한 쪽이 예외로 멈추거나 generator를 닫으면 남은 조회도 취소
+    - concurrency <= 1 이거나 httpx가 없으면 client.iter_pages()로 순차 조회
+    """
+    if concurrency <= 1:
+        yield from client.iter_pages()
+        return
+
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        print("⚠ httpx가 설치되지 않아 순차 조회로 진행합니다.")
+        yield from client.iter_pages()
+        return
+
+    out = queue.Queue(maxsize=concurrency * 2)
+    stop = threading.Event()
+
+    def run():
+        try:
+            asyncio.run(_afetch_pages_until_stopped(client, concurrency, out, stop))
+            item = _PAGES_DONE
+        except BaseException as e:
+            item = e
+        while not stop.is_set():   # 소비자가 이미 멈췄으면 버림
+            try:
+                out.put(item, timeout=0.05)
+                return
+            except queue.Full:
+                continue
+
+    thread = threading.Thread(target=run, name="public-data-fetch", daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item = out.get()
+            if item is _PAGES_DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
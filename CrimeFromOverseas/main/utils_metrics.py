@@ -0,0 +1,137 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("main.metrics")
+
+# 초 단위 히스토그램 구간 (+Inf는 자동)
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class Histogram:
+    """Prometheus histogram 한 개 (라벨 조합별 구간 카운트 / 합 / 개수)"""
+
+    def __init__(self, name, help_text, label_names, buckets=DURATION_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series["buckets"][i] += 1
+        series["sum"] += value
+        series["count"] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            base = _label_text(self.label_names, labels)
+            for bound, count in zip(self.buckets, series["buckets"]):
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {series["count"]}')
+            lines.append(f"{self.name}_sum{{{base}}} {series['sum']:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {series['count']}")
+        return lines
+
+
+class Counter:
+    """Prometheus counter 한 개 (라벨 조합별 누적 값)"""
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._series = {}
+
+    def inc(self, labels, value=1):
+        self._series[labels] = self._series.get(labels, 0) + value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._series.items()):
+            lines.append(f"{self.name}{{{_label_text(self.label_names, labels)}}} {value}")
+        return lines
+
+
+def _label_text(names, values):
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return ",".join(f'{n}="{v}"' for n, v in zip(names, escaped))
+
+
+# -----------------------------
+# ✔ 프로세스 전역 지표 (워커 프로세스마다 따로 집계)
+# -----------------------------
+_lock = threading.Lock()
+
+REQUEST_DURATION = Histogram(
+    "crime_http_request_duration_seconds", "뷰별 응답 시간", ("view", "method", "status"),
+)
+REQUEST_QUERIES = Counter(
+    "crime_http_request_db_queries_total", "뷰별 누적 DB 쿼리 수", ("view", "method"),
+)
+STAGE_DURATION = Histogram(
+    "crime_pipeline_stage_duration_seconds", "파이프라인 단계별 소요 시간", ("stage",),
+)
+STAGE_ERRORS = Counter(
+    "crime_pipeline_stage_errors_total", "파이프라인 단계별 실패 횟수", ("stage",),
+)
+
+METRICS = (REQUEST_DURATION, REQUEST_QUERIES, STAGE_DURATION, STAGE_ERRORS)
+
+
+def log_event(event, **fields):
+    """한 줄짜리 JSON 구조화 로그"""
+    logger.info(json.dumps({"event": event, **fields}, ensure_ascii=False, default=str))
+
+
+def observe_request(view, method, status, seconds, queries):
+    with _lock:
+        REQUEST_DURATION.observe((view, method, str(status)), seconds)
+        REQUEST_QUERIES.inc((view, method), queries)
+    log_event(
+        "request", view=view, method=method, status=status,
+        duration_ms=round(seconds * 1000, 2), db_queries=queries,
+    )
+
+
+@contextmanager
+def span(stage, **fields):
+    """
+    파이프라인 단계 시간 측정 (csv_read / csv_parse / aggregate / api_fetch / db_write 등)
+    with span("csv_read", region="asia"): ...
+    """
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+        with _lock:
+            STAGE_DURATION.observe((stage,), seconds)
+            if error:
+                STAGE_ERRORS.inc((stage,))
+        log_event("span", stage=stage, duration_ms=round(seconds * 1000, 2), error=error, **fields)
+
+
+def render_metrics():
+    """Prometheus text format (0.0.4)"""
+    with _lock:
+        lines = [line for metric in METRICS for line in metric.render()]
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics():
+    with _lock:
+        for metric in METRICS:
+            metric._series.clear()
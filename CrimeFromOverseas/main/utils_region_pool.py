@@ -0,0 +1,73 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# 이 모듈은 import 시점에 Django 모델을 불러오지 않는다.
+# (spawn 방식 자식 프로세스에서도 워커 함수를 안전하게 찾을 수 있도록)
+
+
+def _ensure_django():
+    """자식 프로세스에서 Django 앱 레지스트리가 준비되지 않았으면 setup"""
+    from django.apps import apps
+
+    if not apps.ready:
+        import django
+        django.setup()
+
+
+def load_region_timed(region, path):
+    """지역 CSV 하나를 로드하고 (DataFrame, 소요 시간) 반환. 프로세스 풀 워커."""
+    _ensure_django()
+    from .utils_csv_import import load_and_aggregate_csv
+
+    start = time.perf_counter()
+    df = load_and_aggregate_csv(path, region)
+    return df, time.perf_counter() - start
+
+
+def load_regions(files, workers=1):
+    """
+    files: {region: path}
+    workers <= 1 이면 순차 로드, 그 이상이면 ProcessPoolExecutor로 동시 로드.
+
+    반환:
+      {
+        "frames":  {region: DataFrame},     # 성공한 지역 (files 순서)
+        "timings": {region: 초},            # 지역별 파싱 시간
+        "errors":  {region: "에러 메시지"},  # 실패한 지역
+        "elapsed": 초,                      # 전체 소요 시간
+        "workers": 실제 사용한 워커 수,
+      }
+    """
+    start = time.perf_counter()
+    frames, timings, errors = {}, {}, {}
+
+    def collect(region, call):
+        try:
+            df, seconds = call()
+        except Exception as e:
+            errors[region] = f"{type(e).__name__}: {e}"
+            return
+        frames[region] = df
+        timings[region] = round(seconds, 4)
+
+    workers = max(1, min(int(workers or 1), len(files) or 1))
+
+    if workers == 1:
+        for region, path in files.items():
+            collect(region, lambda: load_region_timed(region, path))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                region: pool.submit(load_region_timed, region, path)
+                for region, path in files.items()
+            }
+            for region, future in futures.items():
+                collect(region, future.result)
+
+    return {
+        "frames": frames,
+        "timings": timings,
+        "errors": errors,
+        "elapsed": round(time.perf_counter() - start, 4),
+        "workers": workers,
+    }
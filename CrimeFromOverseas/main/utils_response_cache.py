@@ -0,0 +1,100 @@
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from .models import DataVersion
+
+DATA_VERSION_NAME = "analysis"
+
+
+# -----------------------------
+# ✔ 데이터 버전 카운터 (sync로 데이터가 바뀌면 +1)
+# -----------------------------
+def get_data_version():
+    row = DataVersion.objects.filter(name=DATA_VERSION_NAME).values_list("version", flat=True).first()
+    return row or 0
+
+
+def bump_data_version():
+    """
+    데이터 버전을 올리고 이 프로세스의 응답 캐시를 비움.
+    (다른 프로세스의 캐시는 키에 버전이 들어가 있어서 자연히 무효)
+    """
+    updated = DataVersion.objects.filter(name=DATA_VERSION_NAME).update(version=F("version") + 1)
+    if not updated:
+        DataVersion.objects.get_or_create(name=DATA_VERSION_NAME, defaults={"version": 1})
+
+    response_cache().clear()
+    return get_data_version()
+
+
+# -----------------------------
+# ✔ 응답 캐시 (ETag / 304 / Cache-Control + 서버 측 본문 캐시)
+# -----------------------------
+def response_cache():
+    return caches[getattr(settings, "RESPONSE_CACHE_ALIAS", "default")]
+
+
+def _request_data_version(request):
+    """요청마다 한 번만 조회 (ETag와 본문 캐시 키가 같은 버전을 쓰도록)"""
+    if not hasattr(request, "_data_version"):
+        request._data_version = get_data_version()
+    return request._data_version
+
+
+def _data_etag(request):
+    # 같은 URL이면 데이터 버전이 같을 때 응답도 같음
+    return quote_etag(f"v{_request_data_version(request)}")
+
+
+def cached_data_view(view):
+    """
+    sync 때만 바뀌는 데이터를 돌려주는 GET 뷰용 데코레이터
+    - ETag = 데이터 버전 → If-None-Match가 같으면 304
+    - 렌더링된 본문은 (전체 경로, 데이터 버전) 키로 Django 캐시에 저장
+    - Cache-Control: max-age=RESPONSE_CACHE_MAX_AGE, must-revalidate
+    ETag / 본문 캐시 / Cache-Control은 200 응답에만 적용 (400 오류 본문이 304로 재사용되지 않도록)
+    """
+    @wraps(view)
+    def cached(request, *args, **kwargs):
+        version = _request_data_version(request)
+        path = hashlib.sha1(request.get_full_path().encode("utf-8")).hexdigest()
+        key = f"response:{view.__module__}.{view.__name__}:{path}"
+        cache = response_cache()
+
+        hit = cache.get(key, version=version)
+        if hit is not None:
+            content, content_type = hit
+            return HttpResponse(content, content_type=content_type)
+
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+            cache.set(key, (response.content, response["Content-Type"]), version=version)
+        return response
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return view(request, *args, **kwargs)
+
+        # 본문 캐시가 있으면 뷰를 다시 실행하지 않으므로 304도 버전 조회 + 캐시 조회만으로 응답
+        response = cached(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+
+        etag = _data_etag(request)
+        response.headers.setdefault("ETag", etag)
+        patch_cache_control(
+            response,
+            max_age=getattr(settings, "RESPONSE_CACHE_MAX_AGE", 0),
+            must_revalidate=True,
+        )
+        return get_conditional_response(request, etag=etag, response=response)
+
+    return wrapper
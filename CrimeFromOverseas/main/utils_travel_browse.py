@@ -0,0 +1,109 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Count, Q
+
+from .models import TravelStat
+from .utils_analysis import query_int
+from .utils_response_cache import get_data_version, response_cache
+
+# debug/travel 정렬 (travelstat_recent_idx와 같은 순서)
+BROWSE_ORDER = ("-year", "-month", "region", "country")
+BROWSE_FIELDS = ("year", "month", "region", "country", "departures", "ratio")
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+# -----------------------------
+# ✔ 커서 (마지막 행의 정렬 키를 그대로 인코딩)
+# -----------------------------
+def encode_cursor(row):
+    key = [row["year"], row["month"], row["region"], row["country"]]
+    raw = json.dumps(key, ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        year, month, region, country = json.loads(raw)
+        return int(year), int(month), str(region), str(country)
+    except (ValueError, TypeError):
+        raise ValueError(f"잘못된 커서입니다: {cursor}")
+
+
+def after_cursor(qs, cursor):
+    """
+    (-year, -month, region, country) 순서에서 커서 다음 행부터.
+    year <= y 범위 조건을 바깥에 둬서 인덱스를 해당 연도부터 탐색 (OFFSET처럼 앞쪽 행을 다시 읽지 않음)
+    """
+    year, month, region, country = cursor
+    return qs.filter(year__lte=year).filter(
+        Q(year__lt=year)
+        | Q(month__lt=month)
+        | Q(month=month, region__gt=region)
+        | Q(month=month, region=region, country__gt=country)
+    )
+
+
+# -----------------------------
+# ✔ 조회 파라미터 / 페이지
+# -----------------------------
+def parse_browse_params(query):
+    """region, country(정확히 일치), after(커서), limit"""
+    after = query.get("after") or None
+    return {
+        "region": query.get("region") or None,
+        "country": query.get("country") or None,
+        "after": decode_cursor(after) if after else None,
+        "limit": query_int(query, "limit", DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE),
+    }
+
+
+def filtered_queryset(params):
+    qs = TravelStat.objects.all()
+    if params["region"]:
+        qs = qs.filter(region=params["region"])
+    if params["country"]:
+        qs = qs.filter(country=params["country"])
+    return qs
+
+
+def approximate_counts(params):
+    """
+    필터별 전체 행 수 + 지역별 행 수 (데이터 버전 기준 캐시).
+    sync로 버전이 바뀌거나 TRAVEL_COUNT_CACHE_TIMEOUT이 지나야 다시 COUNT 하므로 "대략적인" 값.
+    """
+    key = f"travel_counts:{params['region'] or ''}:{params['country'] or ''}"
+    version = get_data_version()
+    cache = response_cache()
+
+    counts = cache.get(key, version=version)
+    if counts is None:
+        qs = filtered_queryset(params)
+        counts = {
+            "total": qs.count(),
+            "regions": list(qs.values("region").annotate(count=Count("id")).order_by("region")),
+        }
+        cache.set(key, counts, timeout=getattr(settings, "TRAVEL_COUNT_CACHE_TIMEOUT", 300), version=version)
+    return counts
+
+
+def travel_page(params):
+    """
+    한 페이지(limit행) + 다음 페이지 커서.
+    limit + 1행을 읽어서 다음 페이지가 있는지 판단 (COUNT 없이)
+    """
+    qs = filtered_queryset(params)
+    if params["after"]:
+        qs = after_cursor(qs, params["after"])
+
+    rows = list(qs.order_by(*BROWSE_ORDER).values(*BROWSE_FIELDS)[: params["limit"] + 1])
+    has_next = len(rows) > params["limit"]
+    rows = rows[: params["limit"]]
+
+    return {
+        "rows": rows,
+        "next": encode_cursor(rows[-1]) if has_next else None,
+    }
@@ -0,0 +1,260 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+from django.utils import timezone
+
+from .models import TREND_FIELDS, SyncState, TravelStat, TravelTrend
+from .utils_metrics import span
+
+TRENDS_SOURCE = "travel_trends"   # SyncState 기록 이름 (월별 원본 내용 해시)
+
+
+# -----------------------------
+# ✔ 시리즈 × 달력 월 격자 (벡터화 계산용)
+# -----------------------------
+def _trend_grid(monthly):
+    """
+    월별 long-form → (시리즈 키 DataFrame[region, country], 값 배열 (S, Y, 12), 원본 행 마스크, 시작 연도)
+    지역 합계 시리즈(country="전체")를 함께 추가
+    """
+    df = monthly.loc[monthly["month"].between(1, 12), ["region", "country", "year", "month", "departures"]]
+    region_total = (
+        df.groupby(["region", "year", "month"], as_index=False)["departures"].sum()
+        .assign(country=TravelTrend.REGION_TOTAL)
+    )
+    df = pd.concat([df, region_total], ignore_index=True)
+
+    # (region, country) → 시리즈 번호 (컬럼별 factorize 후 조합, MultiIndex보다 빠름)
+    region_codes, regions = pd.factorize(df["region"])
+    country_codes, countries = pd.factorize(df["country"])
+    series_codes, series_keys = pd.factorize(region_codes.astype("int64") * len(countries) + country_codes)
+    keys = pd.DataFrame({
+        "region": regions.to_numpy(dtype=object)[series_keys // len(countries)],
+        "country": countries.to_numpy(dtype=object)[series_keys % len(countries)],
+    })
+
+    years = df["year"].to_numpy(dtype="int64")
+    start_year = int(years.min())
+    shape = (len(keys), int(years.max()) - start_year + 1, 12)
+
+    values = np.zeros(shape, dtype="int64")
+    present = np.zeros(shape, dtype=bool)
+    index = (series_codes, years - start_year, df["month"].to_numpy(dtype="int64") - 1)
+    np.add.at(values, index, df["departures"].to_numpy(dtype="int64"))   # 같은 키가 여러 번이면 합산
+    present[index] = True
+    return keys, values, present, start_year
+
+
+def _ratio(current, previous, valid):
+    """(current / previous - 1) × 100, previous가 0이거나 valid가 아니면 NaN"""
+    ok = valid & (previous > 0)
+    out = np.full(current.shape, np.nan)
+    np.divide(current, previous, out=out, where=ok)
+    return np.where(ok, ((out - 1) * 100).round(1), np.nan)
+
+
+def _rolling(flat, first, window):
+    """달력 기준 직전 window개월 합계 (누락 월은 0, 시리즈 첫 집계 월 이전으로 넘어가면 NaN)"""
+    cumsum = np.concatenate([np.zeros((flat.shape[0], 1), dtype="int64"), flat.cumsum(axis=1)], axis=1)
+    t = np.arange(flat.shape[1])
+    out = np.full(flat.shape, np.nan)
+    out[:, window - 1:] = cumsum[:, window:] - cumsum[:, :-window]
+    out[t[None, :] - first[:, None] < window - 1] = np.nan
+    return out
+
+
+# -----------------------------
+# ✔ 추세 지표 계산 (YoY / 3·12개월 누적 / 계절 지수)
+# -----------------------------
+def compute_trends(monthly):
+    """
+    월별 long-form [year, month, country, region, departures] → 지역/국가 시리즈별 추세 지표
+
+    반환 DataFrame[TREND_FIELDS] (원본에 있는 월 + 연도 합계 행(month=0))
+      - yoy_ratio: 월별은 전년 같은 달 대비(%), 연도는 올해 집계된 달들을 전년 같은 달들과 비교
+                   (KTO 누계 전년대비와 같은 방식)
+      - rolling_3m / rolling_12m: 해당 월 포함 직전 3/12개월 합계 (첫 집계 월부터 이력이 모자라면 NaN)
+      - seasonal_index: 같은 달 평균 / 월 평균 (시리즈 전체 기간, 집계된 달만)
+    CSV의 전년대비 열 대신 명수에서 직접 계산하므로 노이즈/누락 셀과 무관하게 일관됨.
+    """
+    keys, values, present, start_year = _trend_grid(monthly)
+    n_series, n_years, _ = values.shape
+
+    # 0은 빈칸/"-"(미집계)와 구분되지 않으므로 비율·평균 계산에서는 집계되지 않은 달로 취급
+    observed = present & (values > 0)
+
+    # ① 월별 YoY
+    monthly_yoy = np.full(values.shape, np.nan)
+    monthly_yoy[:, 1:] = _ratio(values[:, 1:], values[:, :-1], observed[:, 1:] & observed[:, :-1])
+
+    # ② 3 / 12개월 누적 (연·월을 한 축으로 펼쳐서 누적합 차분)
+    flat = values.reshape(n_series, -1)
+    first = observed.reshape(n_series, -1).argmax(axis=1)
+    rolling_3m = _rolling(flat, first, 3).reshape(values.shape)
+    rolling_12m = _rolling(flat, first, 12).reshape(values.shape)
+
+    # ③ 계절 지수 (집계된 해들의 같은 달 평균 / 그 12개 평균)
+    month_count = observed.sum(axis=1)
+    month_mean = np.divide(
+        values.sum(axis=1), month_count,
+        out=np.full(month_count.shape, np.nan), where=month_count > 0,
+    )
+    has_month = month_count > 0
+    overall = np.divide(
+        np.where(has_month, month_mean, 0).sum(axis=1), has_month.sum(axis=1),
+        out=np.zeros(n_series), where=has_month.any(axis=1),
+    )
+    seasonal = np.divide(
+        month_mean, overall[:, None],
+        out=np.full(month_mean.shape, np.nan), where=overall[:, None] > 0,
+    ).round(4)
+
+    # ④ 연도 합계와 누계 기준 YoY (전년에도 같은 달이 모두 있을 때만)
+    yearly = values.sum(axis=2)
+    year_seen = present.any(axis=2)
+    yearly_yoy = np.full(yearly.shape, np.nan)
+    if n_years > 1:
+        same_months = (values[:, :-1] * observed[:, 1:]).sum(axis=2)
+        comparable = (~observed[:, 1:] | observed[:, :-1]).all(axis=2) & observed[:, 1:].any(axis=2)
+        yearly_yoy[:, 1:] = _ratio(yearly[:, 1:], same_months, comparable)
+
+    si, yi, mi = np.nonzero(present)
+    months = pd.DataFrame({
+        "region": keys["region"].to_numpy()[si],
+        "country": keys["country"].to_numpy()[si],
+        "year": start_year + yi,
+        "month": mi + 1,
+        "departures": values[si, yi, mi],
+        "yoy_ratio": monthly_yoy[si, yi, mi],
+        "rolling_3m": rolling_3m[si, yi, mi],
+        "rolling_12m": rolling_12m[si, yi, mi],
+        "seasonal_index": seasonal[si, mi],
+    })
+
+    si, yi = np.nonzero(year_seen)
+    years = pd.DataFrame({
+        "region": keys["region"].to_numpy()[si],
+        "country": keys["country"].to_numpy()[si],
+        "year": start_year + yi,
+        "month": 0,
+        "departures": yearly[si, yi],
+        "yoy_ratio": yearly_yoy[si, yi],
+        "rolling_3m": np.nan,
+        "rolling_12m": np.nan,
+        "seasonal_index": np.nan,
+    })
+
+    return (
+        pd.concat([years, months], ignore_index=True)[list(TREND_FIELDS)]
+        .sort_values(["region", "country", "year", "month"], ignore_index=True)
+    )
+
+
+# -----------------------------
+# ✔ 저장 (TravelTrend 교체 + TravelStat 연도 행 ratio)
+# -----------------------------
+def _records(trends):
+    """NaN → None, numpy 정수/실수 → 파이썬 값"""
+    columns = {
+        "region": trends["region"].tolist(),
+        "country": trends["country"].tolist(),
+        "year": trends["year"].astype(int).tolist(),
+        "month": trends["month"].astype(int).tolist(),
+        "departures": trends["departures"].astype(int).tolist(),
+    }
+    for name, cast in (("yoy_ratio", float), ("rolling_3m", int), ("rolling_12m", int), ("seasonal_index", float)):
+        columns[name] = [None if v != v else cast(v) for v in trends[name].tolist()]   # NaN → None
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def update_yearly_ratios(trends):
+    """TravelStat 연도 행(month=0)의 ratio를 추세 표의 연도 YoY로 갱신. 반환: 갱신한 행 수"""
+    yearly = trends[(trends["month"] == 0) & (trends["country"] != TravelTrend.REGION_TOTAL)]
+    ratios = {
+        (r["region"], r["country"], r["year"]): r["yoy_ratio"]
+        for r in _records(yearly)
+    }
+
+    changed = []
+    rows = TravelStat.objects.filter(month=0, region__in=yearly["region"].unique().tolist())
+    for stat in rows.only("id", "region", "country", "year", "ratio").iterator(chunk_size=2000):
+        key = (stat.region, stat.country, stat.year)
+        if key in ratios and stat.ratio != ratios[key]:
+            stat.ratio = ratios[key]
+            changed.append(stat)
+
+    TravelStat.objects.bulk_update(changed, ["ratio"], batch_size=500)
+    return len(changed)
+
+
+def monthly_frame_from_db(regions=None):
+    """TravelStat 월별 행(month 1~12) → 월별 long-form (ingest_departures로 저장한 데이터용)"""
+    qs = TravelStat.objects.filter(month__gte=1)
+    if regions:
+        qs = qs.filter(region__in=regions)
+    columns = ["region", "country", "year", "month", "departures"]
+    return pd.DataFrame.from_records(qs.values_list(*columns).iterator(chunk_size=5000), columns=columns)
+
+
+def rebuild_travel_trends(monthly, batch_size=1000):
+    """
+    월별 long-form으로 추세 지표를 계산해서 해당 지역의 TravelTrend 행을 통째로 교체하고,
+    TravelStat 연도 행의 ratio(전년 대비)를 채움.
+    반환: {"rows": TravelTrend 행 수, "ratios": 갱신한 TravelStat 행 수}
+    """
+    if monthly is None or monthly.empty:
+        return {"rows": 0, "ratios": 0}
+
+    with span("trends", rows=len(monthly)):
+        trends = compute_trends(monthly)
+
+    objs = [TravelTrend(**rec) for rec in _records(trends)]
+    regions = trends["region"].unique().tolist()
+
+    with span("db_write", model="TravelTrend", rows=len(objs)), transaction.atomic():
+        TravelTrend.objects.filter(region__in=regions).delete()
+        TravelTrend.objects.bulk_create(objs, batch_size=batch_size)
+        ratios = update_yearly_ratios(trends)
+
+    return {"rows": len(objs), "ratios": ratios}
+
+
+def monthly_frame_hash(monthly):
+    """월별 long-form의 내용 해시 (행 순서 / 컬럼 dtype과 무관)"""
+    columns = ["region", "country", "year", "month", "departures"]
+    df = (
+        monthly[columns]
+        .astype({"region": object, "country": object, "year": "int64", "month": "int64", "departures": "int64"})
+        .sort_values(columns[:4], ignore_index=True)
+    )
+    return hashlib.sha256(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes()).hexdigest()
+
+
+def rebuild_travel_trends_if_changed(monthly, force=False, source=TRENDS_SOURCE):
+    """
+    월별 원본 내용 해시가 SyncState(source) 기록과 다를 때만 rebuild_travel_trends 실행.
+    연도 합계가 같아도 달 사이에서 값이 옮겨지면 다시 계산됨.
+    (해당 지역의 TravelTrend가 비어 있거나 force=True면 항상 실행)
+    지역별로 나눠서 부를 때는 source를 지역마다 다르게 지정 (예: "travel_trends:asia")
+    반환: {"rows", "ratios", "skipped"}
+    """
+    if monthly is None or monthly.empty:
+        return {"rows": 0, "ratios": 0, "skipped": True}
+
+    digest = monthly_frame_hash(monthly)
+    state, _ = SyncState.objects.get_or_create(source=source)
+    regions = monthly["region"].unique().tolist()
+    if not force and state.content_hash == digest and TravelTrend.objects.filter(region__in=regions).exists():
+        return {"rows": 0, "ratios": 0, "skipped": True}
+
+    result = rebuild_travel_trends(monthly)
+
+    now = timezone.now()
+    state.content_hash = digest
+    state.row_count = len(monthly)
+    state.last_fetched_at = now
+    state.last_changed_at = now
+    state.save()
+    return {**result, "skipped": False}
@@ -1,16 +1,28 @@
-from django.shortcuts import render
-from django.http import JsonResponse
-from django.conf import settings 
-from .utils_csv_import import load_all_departure_data
-from .models import TravelStat
-from django.db.models import Count
-from django.http import JsonResponse
-from .api_client import get_voice_phishing_yearly
-from .models import CyberScamStat
+from django.shortcuts import render, get_object_or_404
+from django.urls import reverse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.conf import settings
+
+from .models import SyncJob
+from .sync_jobs import submit_sync_job, job_payload
+from .utils_analysis import (
+    analysis_for_params, is_default_analysis_params, parse_analysis_params, parse_trend_params,
+    read_analysis_snapshot, read_travel_trends,
+)
+from .utils_response_cache import cached_data_view
+from .utils_export import export_stream, parse_export_params
+from .utils_travel_browse import approximate_counts, parse_browse_params, travel_page
+from .utils_metrics import render_metrics
+
+# pandas / 외부 API 모듈은 무거우므로 분석·동기화 경로에서만 함수 안에서 import
+# (index, test_keys 같은 가벼운 뷰와 워커 부팅 시간에 영향 없도록)
+
 
+@cached_data_view
 def test_departure_csv(request):
-    df, year_totals, crime_totals, total_all_years = load_all_departure_data()
+    from .utils_csv_import import load_all_departure_data
 
+    df, year_totals, crime_totals, crime_ratio, total_all_years = load_all_departure_data()
 
     return JsonResponse({
         "rows": len(df),
@@ -19,14 +31,7 @@ def test_departure_csv(request):
     }, safe=False)
 
 
-from .api_client import (
-    sync_cyber_scam,
-    sync_voice_phishing,
-    sync_travel_stats_from_csv,
-    fetch_cyber_scam,
-)
-
-
+@cached_data_view
 def test_voice(request):
     from .api_client import fetch_voice_phishing
     return JsonResponse(fetch_voice_phishing(), safe=False)
@@ -45,242 +50,149 @@ def test_keys(request):
         "VOICE_BASE_URL": settings.VOICE_BASE_URL,
     })
 
-from .utils_csv_import import load_all_departure_data, save_yearly_to_db
+def enqueue_sync(request, source):
+    """sync 작업을 백그라운드 큐에 넣고 작업 id를 바로 반환 (202)"""
+    job, created = submit_sync_job(source, force=request.GET.get("force") == "1")
 
-def sync_travel_view(request):
-    df, year_totals, crime_totals, crime_ratio, total_all_years = load_all_departure_data()
+    return JsonResponse({
+        "status": "queued" if created else "already_running",
+        "job_id": job.pk,
+        "job_url": reverse("sync_job", args=[job.pk]),
+    }, status=202)
 
-    saved = save_yearly_to_db(df)
 
-    return JsonResponse({
-        "status": "ok",
-        "saved_rows": saved,
-        "total_rows": len(df),
-        "year_totals": year_totals.to_dict(),          # 연도별 출국자 합계
-        "crime_totals": crime_totals.to_dict(),        # 범죄국 연도별 합계
-        "crime_ratio": crime_ratio.to_dict(orient="records"),
-        "total_all_years": int(total_all_years),       # 전체 합계
-    })
+# 출입국 통계(CSV) 동기화
+def sync_travel_view(request):
+    return enqueue_sync(request, "travel")
 
 
 # 사이버사기 API 동기화
 def sync_cyber_view(request):
-    sync_cyber_scam()
-    return JsonResponse({"status": "cyber_scam_sync_ok"})
+    return enqueue_sync(request, "cyber")
 
 
 # 보이스피싱 API 동기화
 def sync_voice_view(request):
-    sync_voice_phishing()
-    return JsonResponse({"status": "voice_phishing_sync_ok"})
-
-
-from .api_client import sync_voice_phishing, get_voice_phishing_yearly
+    return enqueue_sync(request, "voice")
 
 
 def sync_voice_yearly_view(request):
     """
     보이스피싱 월별 데이터를 DB로 저장하고,
-    연도별 합계(yearly)를 JSON으로 반환한다.
+    연도별 합계(yearly)는 작업 결과(result)로 반환한다.
     """
-    # 월별 데이터 저장
-    sync_voice_phishing()
+    return enqueue_sync(request, "voice_yearly")
 
-    # 연도별 합계 계산
-    yearly_df = get_voice_phishing_yearly()
 
-    if yearly_df is None:
-        return JsonResponse({"status": "no_voice_data"})
-
-    return JsonResponse({
-        "status": "ok",
-        "yearly_voice_stats": yearly_df.to_dict(orient="records"),
-    })
+def sync_job_view(request, job_id):
+    """sync 작업 상태 / 진행률 / 단계별 시간 / 결과 조회"""
+    job = get_object_or_404(SyncJob, pk=job_id)
+    return JsonResponse(job_payload(job))
 
 
 # 사이버사기 원본 데이터 테스트 조회
+@cached_data_view
 def test_cyber(request):
+    from .api_client import fetch_cyber_scam
+
     data = fetch_cyber_scam()
     return JsonResponse(data, safe=False)
 
 
+@cached_data_view
 def travel_debug_view(request):
-    stats_limit = 100
-
-    total = TravelStat.objects.count()
-
-    if total == 0:
-        return render(request, "main/travel_debug.html", {
-            "total_count": 0,
-            "regions": [],
-            "stats": [],
-            "stats_limit": stats_limit,
-            "empty": True,
-        })
-
-    stats = (
-        TravelStat.objects
-        .order_by("-year", "-month", "region", "country")[:stats_limit]
-    )
-
-    regions = (
-        TravelStat.objects
-        .values("region")
-        .annotate(count=Count("id"))
-        .order_by("region")
-    )
-
-    context = {
-        "total_count": TravelStat.objects.count(),
-        "regions": regions,
-        "stats": stats,
-        "stats_limit": stats_limit,
-    }
-    return render(request, "main/travel_debug.html", context)
-
-
-def get_analysis_data(request):
     """
-    범죄국 비율, 사이버 사기 yearly, 보이스피싱 yearly
-    모두 JSON으로 반환
+    TravelStat 브라우저 (최신순, keyset 페이지)
+    ?region=&country=&limit=&after=<커서>
     """
+    try:
+        params = parse_browse_params(request.GET)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-    # 👉 1) 출국자 통계 (CSV 기반)
-    df, total_by_year, crime_by_year, total2018_2024 = load_all_departure_data()
+    counts = approximate_counts(params)
+    page = travel_page(params)
 
-    # 연도: 2018~2024 슬라이싱
-    target_years = list(range(2018, 2025))
+    next_query = request.GET.copy()
+    next_query["after"] = page["next"] or ""
 
-    # 전체 출국자
-    total_year_dict = total_by_year.set_index("year")["year_total"].to_dict()
+    context = {
+        "total_count": counts["total"],
+        "regions": counts["regions"],
+        "stats": page["rows"],
+        "stats_limit": params["limit"],
+        "filters": {"region": params["region"] or "", "country": params["country"] or ""},
+        "is_first_page": params["after"] is None,
+        "next_query": next_query.urlencode() if page["next"] else None,
+        "empty": counts["total"] == 0,
+    }
+    return render(request, "main/travel_debug.html", context)
 
-    # 범죄국 출국자
-    crime_year_dict = crime_by_year.set_index("year")["crime_country_total"].to_dict()
 
-    # 👉 1-1) 범죄국 출국자 비율 (%) 계산
-    crime_ratio = []
-    for y in target_years:
-        if y in total_year_dict and y in crime_year_dict:
-            ratio = (crime_year_dict[y] / total_year_dict[y]) * 100
-            crime_ratio.append(round(ratio, 3))
-        else:
-            crime_ratio.append(None)
+@cached_data_view
+def travel_browse_api(request):
+    """travel_debug_view와 같은 조회를 JSON으로 (rows / next 커서 / 대략적인 전체 수)"""
+    try:
+        params = parse_browse_params(request.GET)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-    # 👉 2) 보이스피싱 연도별 합계
-    vp_df = get_voice_phishing_yearly()
-    vp_dict = vp_df.set_index("year")["voice_year_total"].to_dict()
-    voice_cases = [vp_dict.get(y, None) for y in target_years]
+    page = travel_page(params)
+    return JsonResponse({
+        "rows": page["rows"],
+        "next": page["next"],
+        "approx_total": approximate_counts(params)["total"],
+    })
 
-    # 👉 3) 사이버사기 연도별 total_cases 계산
-    scam_qs = CyberScamStat.objects.all()
-    scam_yearly = {}
 
-    for obj in scam_qs:
-        scam_yearly.setdefault(obj.year, 0)
-        scam_yearly[obj.year] += obj.total_cases
+@cached_data_view
+def get_analysis_data(request):
+    """
+    HTML에서 호출하는 /analysis/data/ API
+    - 조건이 기본값 (파라미터 없음 / utm 같은 관계없는 파라미터만): 사전 계산된 스냅샷 조회
+    - start / end / countries / regions / granularity: 조건에 맞는 구간만 계산 (조건별 캐시)
+    """
+    try:
+        params = parse_analysis_params(request.GET)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-    cyber_scam_cases = [scam_yearly.get(y, None) for y in target_years]
+    if is_default_analysis_params(params):
+        return JsonResponse(read_analysis_snapshot())
 
-    return JsonResponse({
-        "years": target_years,
-        "crime_ratio": crime_ratio,
-        "cyber_scam_cases": cyber_scam_cases,
-        "voice_phishing_cases": voice_cases
-    })
+    return JsonResponse(analysis_for_params(params))
 
-from django.http import JsonResponse
-from .utils_csv_import import load_all_departure_data
-from .api_client import get_voice_phishing_yearly, fetch_cyber_scam
 
-import pandas as pd
-from django.http import JsonResponse
+@cached_data_view
+def travel_trends_api(request):
+    """
+    사전 계산된 출국 추세 지표 (전년대비 / 3·12개월 누적 / 계절 지수)
+    ?countries=&regions=&start=&end=&granularity=year|month
+    """
+    try:
+        params = parse_trend_params(request.GET)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-from .utils_csv_import import load_all_departure_data
-from .api_client import get_voice_phishing_yearly
-from .models import CyberScamStat
+    return JsonResponse(read_travel_trends(params))
 
 
-def build_analysis_data():
+def export_travel_view(request):
     """
-    그래프용 분석 데이터를 생성하여 JSON 형태로 반환.
-    기간은 공통된 2018~2025로 통일.
+    TravelStat 전체/조건별 내보내기 (스트리밍)
+    ?format=ndjson|csv&gzip=1&start=&end=&month=&regions=&countries=
     """
+    try:
+        params = parse_export_params(request.GET)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
 
-    # 1) 출입국 CSV 데이터에서 연도별 합계, 범죄국 합계 불러오기
-    df, year_totals, crime_totals, country_yearly, total_2018_2024 = load_all_departure_data()
-
-
-    # 2) 분석 공통 연도 구간 설정
-    valid_years = list(range(2018, 2026))  # 2018~2025
-
-    # 3) 출국자 데이터 필터링
-    year_totals_filtered = year_totals[year_totals["year"].isin(valid_years)]
-    crime_totals_filtered = crime_totals[crime_totals["year"].isin(valid_years)]
-
-    years = year_totals_filtered["year"].tolist()
-
-    # 4) 범죄국 비율(%)
-    crime_ratio = (
-        crime_totals_filtered["crime_country_total"].values /
-        year_totals_filtered["year_total"].values * 100
-    ).tolist()
-
-    # 5) 사이버사기 연도별 합계 (이미 연도별 total 필드 있다고 가정)
-    cyber_rows = CyberScamStat.objects.filter(year__in=valid_years).values(
-        "year",
-        "direct_trade",
-        "shopping_mall",
-        "game",
-        "email_trade",
-        "romance",
-        "investment",
-        "etc",
-    )
-
-    # 연도별 total 계산
-    cyber_yearly = {}
-    for row in cyber_rows:
-        year = row["year"]
-        total = (
-            row["direct_trade"] +
-            row["shopping_mall"] +
-            row["game"] +
-            row["email_trade"] +
-            row["romance"] +
-            row["investment"] +
-            row["etc"]
-        )
-        cyber_yearly[year] = total
-
-    cyber_scam_cases = [cyber_yearly.get(y, 0) for y in years]
-
-    # 6) 보이스피싱 연도별 합계
-    voice_df = get_voice_phishing_yearly()
-    voice_df = voice_df[voice_df["year"].isin(valid_years)].sort_values("year")
-    voice_phishing_cases = voice_df["voice_year_total"].tolist()
-
-    # 7) 길이 확인 후 패딩/정렬 (혹시 DB 누락된 연도가 있어도 안전)
-    def align_to_years(values, years_list):
-        """values 길이가 years_list와 다르면 빈 값(0)으로 보정"""
-        data = []
-        year_to_value = dict(zip(years_list, values))
-        for y in years_list:
-            data.append(year_to_value.get(y, 0))
-        return data
-
-    cyber_scam_cases = align_to_years(cyber_scam_cases, years)
-    voice_phishing_cases = align_to_years(voice_phishing_cases, years)
-
-    # 8) 최종 JSON 데이터 반환
-    return {
-        "years": years,
-        "crime_ratio": crime_ratio,
-        "cyber_scam_cases": [cyber_yearly.get(y, 0) for y in valid_years],
-        "voice_phishing_cases": voice_phishing_cases,
-    }
+    content, content_type, filename = export_stream(params)
+    response = StreamingHttpResponse(content, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
 
 
-def get_analysis_data(request):
-    """HTML에서 호출하는 /analysis/data/ API"""
-    data = build_analysis_data()
-    return JsonResponse(data)
+def metrics_view(request):
+    """요청/파이프라인 지표 (Prometheus text format, 이 워커 프로세스 기준)"""
+    return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")